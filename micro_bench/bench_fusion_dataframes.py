@@ -0,0 +1,97 @@
+"""Benchmark MdxEngine.fusion_dataframes (single concatenation) against the old pairwise
+concatenation, with many member tuples on an axis.
+
+usage::
+
+    python -m micro_bench.bench_fusion_dataframes
+"""
+
+from collections import OrderedDict
+from timeit import Timer
+
+import numpy as np
+import pandas as pd
+
+from olapy.core.mdx.executor import MdxEngine
+from olapy.core.mdx.executor.utils import inject_dataframes
+
+CUBE_NAME = "fusion_bench"
+FACTS_ROWS = 500000
+COUNTRIES = 100
+CITIES_PER_COUNTRY = 5
+
+
+def generate_dataframes():
+    countries = ["Country {}".format(idx) for idx in range(COUNTRIES)]
+    geography = pd.DataFrame(
+        {
+            "Continent": ["Continent {}".format(idx % 5) for idx in range(COUNTRIES)]
+            * CITIES_PER_COUNTRY,
+            "Country": countries * CITIES_PER_COUNTRY,
+            "City": [
+                "City {}".format(idx) for idx in range(COUNTRIES * CITIES_PER_COUNTRY)
+            ],
+        }
+    )
+    facts = pd.DataFrame(
+        {
+            "City": np.random.choice(geography["City"], FACTS_ROWS),
+            "Amount": np.random.randint(1, 1000, FACTS_ROWS),
+        }
+    )
+    return {"Facts": facts, "Geography": geography}
+
+
+def legacy_fusion_dataframes(executor, df_to_fusion):
+    """fusion_dataframes before the single concatenation."""
+    df = df_to_fusion[0]
+    for next_df in df_to_fusion[1:]:
+        df = pd.concat(executor.add_missed_column(df, next_df), sort=False)
+    return df
+
+
+def get_chunks(executor, members_number):
+    """Execute member tuples one by one, mixing countries and cities (so chunks have
+    different columns), like an axis with members_number members."""
+    tuples = []
+    for idx in range(members_number):
+        # City idx is in Country idx (idx < COUNTRIES), which is in Continent idx % 5
+        country_tuple = [
+            "Geography",
+            "Geography",
+            "Continent",
+            "Continent {}".format(idx % 5),
+            "Country {}".format(idx),
+        ]
+        if idx % 2:
+            country_tuple.append("City {}".format(idx))
+        tuples.append(country_tuple)
+    columns_to_keep = OrderedDict(
+        [("Geography", ["Continent", "Country", "City"])]
+    )
+    executor.parser.mdx_query = ""
+    return executor.tuples_to_dataframes(tuples, columns_to_keep)
+
+
+def main(number=3):
+    executor = MdxEngine()
+    inject_dataframes(executor, generate_dataframes(), cube_name=CUBE_NAME)
+
+    print("members | pairwise concat (s) | single concat (s)")
+    for members_number in (10, 50, 100):
+        chunks = get_chunks(executor, members_number)
+        legacy = Timer(lambda: legacy_fusion_dataframes(executor, chunks)).timeit(
+            number=number
+        )
+        single = Timer(lambda: executor.fusion_dataframes(chunks)).timeit(
+            number=number
+        )
+        print(
+            "{:>7} | {:>19.4f} | {:>17.4f}".format(
+                members_number, legacy / number, single / number
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Benchmark Execute response axes serialization, xmlwitch tuple by tuple
+(XmlaExecuteReqHandler.tuples_2_xs0) against the column by column serializer
+(xmla_axis_serializer), for an axis with many members.
+
+usage::
+
+    python -m micro_bench.bench_xmla_axis
+"""
+
+from timeit import Timer
+
+import numpy as np
+import pandas as pd
+
+from olapy.core.mdx.executor import MdxEngine
+from olapy.core.mdx.executor.utils import inject_dataframes
+from olapy.core.services.xmla_execute_request_handler import XmlaExecuteReqHandler
+
+CUBE_NAME = "axis_bench"
+FACTS_ROWS = 200000
+QUERY = """SELECT
+    NON EMPTY Hierarchize({{[Geography].[Geography].[City].Members}})
+    DIMENSION PROPERTIES PARENT_UNIQUE_NAME, HIERARCHY_UNIQUE_NAME ON COLUMNS
+    FROM [axis_bench]
+    WHERE ([Measures].[Amount])"""
+
+
+def generate_dataframes(cities):
+    # City is the first level, so the axis has one member by city
+    # (no spaces in names, facts columns are cleaned like measures)
+    geography = pd.DataFrame(
+        {
+            "City": ["City{}".format(idx) for idx in range(cities)],
+            "Country": ["Country{}".format(idx % 100) for idx in range(cities)],
+        }
+    )
+    facts = pd.DataFrame(
+        {
+            "City": np.random.choice(geography["City"], FACTS_ROWS),
+            "Amount": np.random.randint(1, 1000, FACTS_ROWS),
+        }
+    )
+    return {"Facts": facts, "Geography": geography}
+
+
+def main(number=3):
+    print("members | tuples_2_xs0 (s) | column serializer (s)")
+    for cities in (1000, 10000, 50000):
+        executor = MdxEngine()
+        inject_dataframes(executor, generate_dataframes(cities), cube_name=CUBE_NAME)
+        handler = XmlaExecuteReqHandler(executor, QUERY)
+        split_df = handler.split_dataframe()
+        tuples_number = len(split_df["Geography"])
+
+        def legacy():
+            tuples, first_att = handler._generate_tuples_xs0(split_df, "columns")
+            return str(handler.tuples_2_xs0(tuples, split_df, first_att, "Axis0"))
+
+        def columns():
+            return handler._serialize_axis(split_df, "columns", "Axis0")
+
+        assert legacy() == columns()
+        print(
+            "{:>7} | {:>16.4f} | {:>21.4f}".format(
+                tuples_number,
+                Timer(legacy).timeit(number=number) / number,
+                Timer(columns).timeit(number=number) / number,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
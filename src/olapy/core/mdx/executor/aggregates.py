@@ -0,0 +1,90 @@
+"""Pre-aggregated measures (materialized aggregates) of a cube.
+
+Building a query result means filtering the star schema and summing measures by the used
+levels. When the query only uses some levels (for instance Continent and Year), the same result
+can be computed from a much smaller DataFrame which already contains the measures summed by
+(Continent, Year), so :class:`AggregateStore` precomputes those DataFrames at
+:func:`load_cube <olapy.core.mdx.executor.execute.MdxEngine.load_cube>` time for the levels
+combinations chosen with MdxEngine(aggregate_levels=...) or in the cubes-config.yml file::
+
+    aggregates:
+      - [Continent, Year]
+      - [Continent, Country, Company]
+"""
+
+import logging
+from typing import List, Optional
+
+import pandas as pd
+from attrs import define, field
+
+
+@define
+class Aggregate:
+    """Measures summed by some levels.
+
+    :param levels: star schema columns used to group rows
+    :param dataframe: DataFrame with levels and measures columns
+    """
+
+    levels: tuple
+    dataframe: pd.DataFrame
+
+    def __len__(self):
+        return len(self.dataframe)
+
+
+@define
+class AggregateStore:
+    """All aggregates of a cube, sorted by size."""
+
+    aggregates: List[Aggregate] = field(factory=list)
+
+    @classmethod
+    def build(cls, star_schema_df, measures, levels_combinations):
+        """Precompute aggregates.
+
+        :param star_schema_df: star schema DataFrame
+        :param measures: measures columns to sum
+        :param levels_combinations: list of levels lists, like [['Continent', 'Year'], ...]
+        :return: AggregateStore instance
+        """
+        store = cls()
+        for levels in levels_combinations:
+            missing_columns = [col for col in levels if col not in star_schema_df]
+            if missing_columns:
+                logging.warning("Aggregate ignored, unknown columns %s", missing_columns)
+                continue
+            store.aggregates.append(
+                Aggregate(
+                    levels=tuple(levels),
+                    # keep the star schema order of groups (sort=False) and rows with
+                    # empty levels (dropna=False), filtering and grouping an aggregate must
+                    # give exactly the same result as with the star schema
+                    dataframe=star_schema_df.groupby(
+                        list(levels), sort=False, observed=True, dropna=False
+                    )[list(measures)]
+                    .sum()
+                    .reset_index(),
+                )
+            )
+        store.aggregates.sort(key=len)
+        return store
+
+    def __len__(self):
+        return len(self.aggregates)
+
+    def find(self, columns, measures):
+        # type: (set, List[str]) -> Optional[pd.DataFrame]
+        """Get the smallest aggregate containing columns and measures.
+
+        :param columns: star schema columns needed by a query
+        :param measures: measures needed by a query
+        :return: aggregate DataFrame, or None if no aggregate can be used
+        """
+        for aggregate in self.aggregates:
+            if all(col in aggregate.dataframe for col in columns) and all(
+                measure in aggregate.dataframe for measure in measures
+            ):
+                return aggregate.dataframe
+        return None
@@ -1,28 +1,87 @@
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 import pandas as pd
 from pandas.errors import MergeError
 
 
 class CubeLoader:
-    def __init__(self, cube_path=None, sep=";"):
+    """Load csv cubes, every csv file is parsed only once, for both
+    :func:`load_tables` and :func:`construct_star_schema`.
+
+    :param cube_path: cube folder path
+    :param sep: csv files separator
+    :param dtypes: explicit columns types, as dict of { Table_name : {column : dtype} }
+        example: {'Facts': {'Amount': 'float64', 'City': 'category'}}
+    :param workers: number of tables loaded concurrently (threads), Default 1 (one after another)
+    """
+
+    def __init__(self, cube_path=None, sep=";", dtypes=None, workers=1):
         self.cube_path = cube_path
         self.sep = sep
+        self.dtypes = dtypes or {}
+        self.workers = workers or 1
+        self.parse_timings = {}
+        self._tables = None
+
+    def map_tables(self, load_table, tables_names):
+        """Call load_table for every table, with a pool of workers threads if workers > 1
+        (csv parsing and database drivers release the GIL while reading data).
+
+        :param load_table: function with table name as parameter
+        :param tables_names: tables to load
+        :return: list of load_table results, in tables_names order
+        """
+        tables_names = list(tables_names)
+        if self.workers > 1 and len(tables_names) > 1:
+            with ThreadPoolExecutor(
+                max_workers=min(self.workers, len(tables_names))
+            ) as executor:
+                return list(executor.map(load_table, tables_names))
+        return [load_table(table_name) for table_name in tables_names]
+
+    def _read_file(self, file):
+        # to remove file extension ".csv"
+        table_name = os.path.splitext(file)[0]
+        start = time.perf_counter()
+        table = pd.read_csv(
+            os.path.join(self.cube_path, file),
+            sep=self.sep,
+            dtype=self.dtypes.get(table_name),
+            # infer types from whole columns, not chunk by chunk
+            low_memory=False,
+        )
+        return table_name, table, time.perf_counter() - start
+
+    def read_tables(self) -> dict[str, pd.DataFrame]:
+        """Parse all csv files (only the first time).
+
+        Parsing time of every file is saved in parse_timings.
+
+        :return: tables dict with table name as key and dataframe (with all columns) as value
+        """
+        if self._tables is None:
+            files = os.listdir(self.cube_path)
+            self._tables = {}
+            for file, (table_name, table, timing) in zip(
+                files, self.map_tables(self._read_file, files)
+            ):
+                self._tables[table_name] = table
+                self.parse_timings[file] = timing
+        return self._tables
 
     def load_tables(self) -> dict[str, pd.DataFrame]:
         """Load tables from csv files.
 
         :return: tables dict with table name as key and dataframe as value
         """
-        tables = {}
-        for file in os.listdir(self.cube_path):
-            # to remove file extension ".csv"
-            table_name = os.path.splitext(file)[0]
-            value = pd.read_csv(os.path.join(self.cube_path, file), sep=self.sep)
-            tables[table_name] = value[
+        return {
+            table_name: value[
                 [col for col in value.columns if col.lower()[-3:] != "_id"]
             ]
-        return tables
+            for table_name, value in self.read_tables().items()
+        }
 
     def construct_star_schema(self, facts):
         """Construct star schema DataFrame from csv files.
@@ -30,13 +89,14 @@ class CubeLoader:
         :param facts: Facts table name
         :return: star schema DataFrame
         """
+        tables = self.read_tables()
         # loading facts table
-        df = pd.read_csv(os.path.join(self.cube_path, facts + ".csv"), sep=self.sep)
-        for file_name in os.listdir(self.cube_path):
+        df = tables[facts]
+        for table_name, table in tables.items():
+            if table_name == facts:
+                continue
             try:
-                df = df.merge(
-                    pd.read_csv(os.path.join(self.cube_path, file_name), sep=self.sep)
-                )
+                df = df.merge(table)
             except MergeError:
                 print("No common column")
 
@@ -4,18 +4,23 @@ from typing import Dict
 import pandas as pd
 import pandas.io.sql as psql
 
+from ..tools.connection import is_memory_database
 from .cube_loader import CubeLoader
 
 
 class CubeLoaderCustom(CubeLoader):
     """Load Cube with some configurations."""
 
-    def __init__(self, cube_config, cube_path=None, sqla_engine=None, sep=";"):
-        CubeLoader.__init__(self)
+    def __init__(
+        self, cube_config, cube_path=None, sqla_engine=None, sep=";", workers=1
+    ):
+        CubeLoader.__init__(self, workers=workers)
         self.cube_config = cube_config
         self.cube_path = cube_path
         self.sep = sep
         self.sqla_engine = sqla_engine
+        if sqla_engine is not None and is_memory_database(sqla_engine):
+            self.workers = 1
 
     def load_one_table(self, table_name):
         if self.cube_config["source"].upper() == "CSV":
@@ -36,10 +41,12 @@ class CubeLoaderCustom(CubeLoader):
         """
 
         tables = {}
+        dimensions = self.cube_config["dimensions"]
+        dimensions_tables = self.map_tables(
+            self.load_one_table, [dimension["name"] for dimension in dimensions]
+        )
         # just one facts table right now
-        for dimension in self.cube_config["dimensions"]:
-
-            df = self.load_one_table(dimension["name"])
+        for dimension, df in zip(dimensions, dimensions_tables):
             # change table display name
             if dimension["displayName"]:
                 table_name = dimension["displayName"]
@@ -71,22 +78,13 @@ class CubeLoaderCustom(CubeLoader):
         :param facts:  Facts table name
         :return: star schema DataFrame
         """
-        fusion = self.load_one_table(facts)
-        for fact_key, dimension_and_key in self.cube_config["facts"]["keys"].items():
-            if self.cube_config["source"].upper() == "CSV":
-                file = os.path.join(
-                    self.cube_path, dimension_and_key.split(".")[0] + ".csv"
-                )
-                # with extension or not
-                if not os.path.isfile(file):
-                    file.replace(".csv", "")
-                df = pd.read_csv(file, sep=self.sep)
-            else:
-                df = psql.read_sql_query(
-                    f"SELECT * FROM {dimension_and_key.split('.')[0]}",
-                    self.sqla_engine,
-                )
-
+        keys = self.cube_config["facts"]["keys"]
+        fusion, *dimensions_tables = self.map_tables(
+            self.load_one_table,
+            [facts]
+            + [dimension_and_key.split(".")[0] for dimension_and_key in keys.values()],
+        )
+        for (fact_key, dimension_and_key), df in zip(keys.items(), dimensions_tables):
             for dimension in self.cube_config["dimensions"]:
                 if dimension_and_key.split(".")[0] == dimension["name"]:
                     df.rename(columns=dimension["columns"], inplace=True)
@@ -1,11 +1,12 @@
+from collections import Counter
+from itertools import chain
 from typing import Dict, Text
 
 import pandas as pd
-import pandas.io.sql as psql
 from pandas.errors import MergeError
-from sqlalchemy import inspect
+from sqlalchemy import inspect, text
 
-from ..tools.connection import get_dialect_name
+from ..tools.connection import get_dialect_name, is_memory_database
 from . import CubeLoader
 
 
@@ -13,63 +14,282 @@ class CubeLoaderDB(CubeLoader):
     """Part of :mod:`execute.py` module, here olapy constructs a cube from
     the database automatically based on the `start schema model
     <http://datawarehouse4u.info/Data-warehouse-schema-architecture-star-schema.html>`_.
+
+    Every table is read only once, in chunks of chunk_size rows (server side cursor), for both
+    :func:`load_tables` and :func:`construct_star_schema`, without the *_id* columns which
+    are not join keys.
+
+    With join_pushdown, the star schema is joined by the database instead (see
+    :func:`get_star_schema_query`), and tables are loaded without their *_id* columns.
+
+    :param sqla_engine: SqlAlchemy engine instance
+    :param workers: number of tables loaded concurrently (threads), Default 1
+    :param chunk_size: number of rows fetched at once, Default 10000
+    :param join_pushdown: construct the star schema with a single sql join query, Default False
     """
 
-    def __init__(self, sqla_engine):
-        CubeLoader.__init__(self)
+    def __init__(self, sqla_engine, workers=1, chunk_size=10000, join_pushdown=False):
+        CubeLoader.__init__(self, workers=workers)
         self.sqla_engine = sqla_engine
+        self.chunk_size = chunk_size
+        self.join_pushdown = join_pushdown
+        if is_memory_database(sqla_engine):
+            self.workers = 1
 
-    def load_tables(self) -> dict[str, pd.DataFrame]:
-        """Load tables from database.
+    def read_table(self, table_name, columns=None):
+        """Stream a table, chunk by chunk (see :func:`read_query`).
 
-        :return: tables dict with table name as key and dataframe as value
+        :param table_name: database table name
+        :param columns: columns to select, Default all table columns
+        :return: DataFrame
         """
+        quote = self.sqla_engine.dialect.identifier_preparer.quote
+        return self.read_query(
+            "SELECT {} FROM {}".format(
+                ", ".join(quote(column) for column in columns) if columns else "*",
+                table_name,
+            )
+        )
+
+    def read_query(self, query, params=None):
+        """Stream query results, chunk by chunk.
+
+        Every chunk is converted to typed columns, and rows of each chunk are released once
+        converted, so loading a table needs about the memory of the final DataFrame.
+
+        :param query: sql query
+        :param params: query bound parameters (*:name* in query), if any
+        :return: DataFrame
+        """
+        chunks_columns = {}
+        with self.sqla_engine.connect() as connection:
+            connection = connection.execution_options(stream_results=True)
+            if params:
+                results = connection.execute(text(query), params)
+            else:
+                results = connection.execute(query)
+            keys = list(results.keys())
+            while True:
+                rows = results.fetchmany(self.chunk_size)
+                if not rows:
+                    break
+                chunk = pd.DataFrame.from_records(rows, columns=keys, coerce_float=True)
+                del rows
+                for column in keys:
+                    chunks_columns.setdefault(column, []).append(chunk[column])
+                del chunk
+
+        if not chunks_columns:
+            return pd.DataFrame(columns=keys)
+        table = {}
+        for column in keys:
+            column_chunks = chunks_columns.pop(column)
+            values = (
+                pd.concat(column_chunks, ignore_index=True)
+                if len(column_chunks) > 1
+                else column_chunks[0].reset_index(drop=True)
+            )
+            if values.dtype == object:
+                # a chunk with only empty values is not typed like the whole column
+                values = values.infer_objects()
+            table[column] = values
+            del column_chunks
+        return pd.DataFrame(table, columns=keys)
+
+    def get_tables_names(self):
+        """Get database tables names (Oracle *FACTS* table as *Facts*).
 
-        tables = {}
-        print("Connection string = " + str(self.sqla_engine))
+        :return: tables names list
+        """
         inspector = inspect(self.sqla_engine)
         dialect_name = get_dialect_name(str(self.sqla_engine))
+        tables_names = []
         for table_name in inspector.get_table_names():
             if "oracle" in dialect_name and table_name.upper() == "FACTS":
                 table_name = table_name.title()
-            results = self.sqla_engine.execution_options(stream_results=True).execute(
-                f"SELECT * FROM {table_name}"
+            tables_names.append(table_name)
+        return tables_names
+
+    def read_tables(self) -> dict[str, pd.DataFrame]:
+        """Read all tables (only the first time), concurrently with workers > 1.
+
+        *_id* columns are only selected if another table has them too, as they are only
+        used as join keys by :func:`construct_star_schema`.
+
+        :return: tables dict with table name as key and dataframe as value
+        """
+        if self._tables is None:
+            print("Connection string = " + str(self.sqla_engine))
+            tables_columns = self._get_tables_columns()
+            columns_count = Counter(chain.from_iterable(tables_columns.values()))
+            self._tables = self._read_columns(
+                {
+                    table_name: [
+                        col
+                        for col in columns
+                        if col.lower()[-3:] != "_id" or columns_count[col] > 1
+                    ]
+                    for table_name, columns in tables_columns.items()
+                }
             )
-            # Fetch all the results of the query
-            df = pd.DataFrame(
-                iter(results), columns=results.keys()
-            )  # Pass results as an iterator
-            # with string_folding_wrapper we loose response time
-            # value = pd.DataFrame(string_folding_wrapper(results),columns=results.keys())
-            tables[table_name] = df[
-                [col for col in df.columns if col.lower()[-3:] != "_id"]
+        return self._tables
+
+    def get_table_columns(self, table_name, inspector=None):
+        """Get table columns (as returned by the sqlalchemy inspector, with *name* and *type*).
+
+        :param table_name: database table name
+        :param inspector: sqlalchemy inspector, if already created
+        :return: list of columns dicts
+        """
+        if inspector is None:
+            inspector = inspect(self.sqla_engine)
+        # inspector names can be different from tables names used in queries (oracle)
+        inspector_names = {name.lower(): name for name in inspector.get_table_names()}
+        return inspector.get_columns(inspector_names.get(table_name.lower(), table_name))
+
+    def _get_columns(self, inspector, table_name):
+        return [
+            column["name"] for column in self.get_table_columns(table_name, inspector)
+        ]
+
+    def _get_tables_columns(self):
+        inspector = inspect(self.sqla_engine)
+        return {
+            table_name: self._get_columns(inspector, table_name)
+            for table_name in self.get_tables_names()
+        }
+
+    def _read_columns(self, tables_columns):
+        """Read some columns of tables, concurrently with workers > 1.
+
+        :param tables_columns: dict with table name as key and columns to select as value
+        :return: tables dict with table name as key and dataframe as value
+        """
+        tables_names = list(tables_columns)
+        return dict(
+            zip(
+                tables_names,
+                self.map_tables(
+                    lambda table_name: self.read_table(
+                        table_name, tables_columns[table_name]
+                    ),
+                    tables_names,
+                ),
+            )
+        )
+
+    def load_tables(self) -> dict[str, pd.DataFrame]:
+        """Load tables from database, without *_id* columns.
+
+        :return: tables dict with table name as key and dataframe as value
+        """
+        if self.join_pushdown:
+            # tables are not needed by the star schema, *_id columns are not even selected
+            print("Connection string = " + str(self.sqla_engine))
+            return self._read_columns(
+                {
+                    table_name: [col for col in columns if col.lower()[-3:] != "_id"]
+                    for table_name, columns in self._get_tables_columns().items()
+                }
+            )
+
+        return {
+            table_name: table[
+                [col for col in table.columns if col.lower()[-3:] != "_id"]
             ]
+            for table_name, table in self.read_tables().items()
+        }
 
-        return tables
+    def get_star_schema_query(self, facts):
+        # type: (Text) -> Text
+        """Build the star schema sql query, which joins the facts table with every dimension
+        table.
+
+        A dimension is joined with the facts table foreign key which refers to it (found with
+        the sqlalchemy inspector), or else, like :func:`construct_star_schema` without
+        join_pushdown, with the columns it has in common with the already joined tables.
+        Tables without foreign key nor common column are ignored.
+
+        :param facts: Facts table name
+        :return: sql query
+        """
+        inspector = inspect(self.sqla_engine)
+        quote = self.sqla_engine.dialect.identifier_preparer.quote
+        inspector_names = {name.lower(): name for name in inspector.get_table_names()}
+        facts_inspector_name = inspector_names.get(facts.lower(), facts)
+
+        foreign_keys: Dict[str, dict] = {}
+        for foreign_key in inspector.get_foreign_keys(facts_inspector_name):
+            foreign_keys.setdefault(foreign_key["referred_table"].lower(), foreign_key)
+
+        # column name -> selected column, first table which has the column wins
+        selected_columns = {
+            column: f"t0.{quote(column)}"
+            for column in self._get_columns(inspector, facts)
+        }
+        joins = []
+        dimensions = [
+            table_name
+            for table_name in self.get_tables_names()
+            if table_name.lower() != facts.lower()
+        ]
+        for idx, table_name in enumerate(dimensions, 1):
+            alias = f"t{idx}"
+            columns = self._get_columns(inspector, table_name)
+            foreign_key = foreign_keys.get(table_name.lower())
+            if foreign_key:
+                conditions = [
+                    f"t0.{quote(facts_column)} = {alias}.{quote(column)}"
+                    for facts_column, column in zip(
+                        foreign_key["constrained_columns"],
+                        foreign_key["referred_columns"],
+                    )
+                ]
+                # referred columns have the same values as facts foreign keys
+                columns = [
+                    col for col in columns if col not in foreign_key["referred_columns"]
+                ]
+            else:
+                conditions = [
+                    f"{selected_columns[col]} = {alias}.{quote(col)}"
+                    for col in columns
+                    if col in selected_columns
+                ]
+            if not conditions:
+                print(f"No common column between {facts} and {table_name}")
+                continue
+            joins.append(f"JOIN {table_name} {alias} ON " + " AND ".join(conditions))
+            for col in columns:
+                selected_columns.setdefault(col, f"{alias}.{quote(col)}")
+
+        return "SELECT {} FROM {} t0 {}".format(
+            ", ".join(selected_columns.values()), facts, " ".join(joins)
+        ).strip()
 
     def construct_star_schema(self, facts):
         # type: (Text) -> pd.DataFrame
         """Construct star schema DataFrame from database.
 
+        With join_pushdown, the database joins tables (see :func:`get_star_schema_query`),
+        and the result is streamed once. Otherwise, already read tables are merged.
+
         :param facts: Facts table name
         :return: star schema DataFrame
         """
+        if self.join_pushdown:
+            return self.read_query(self.get_star_schema_query(facts))
 
-        df = psql.read_sql_query(f"SELECT * FROM {facts}", self.sqla_engine)
-        inspector = inspect(self.sqla_engine)
+        tables = self.read_tables()
+        if facts in tables:
+            df = tables[facts]
+        else:
+            df = self.read_table(facts)
 
-        for db_table_name in inspector.get_table_names():
-            # try:
-            #     db_table_name = str(db_table_name)
-            # except Exception:
-            #     if isinstance(db_table_name, Iterable):
-            #         db_table_name = db_table_name[0]
+        for db_table_name, db_table in tables.items():
+            if db_table_name == facts:
+                continue
             try:
-                df = df.merge(
-                    psql.read_sql_query(
-                        f"SELECT * FROM {db_table_name}", self.sqla_engine
-                    )
-                )
+                df = df.merge(db_table)
             except MergeError:
                 print(f"No common column between {facts} and {db_table_name}")
 
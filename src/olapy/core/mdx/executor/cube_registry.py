@@ -0,0 +1,198 @@
+"""Many loaded cubes at the same time.
+
+An MdxEngine holds one cube, so a server with one engine loads a cube again every time a
+request uses another cube than the previous one (two Excel users working on two cubes
+reload them back and forth). :class:`CubeRegistry` keeps one engine by loaded cube, and
+evicts the least recently used cubes when loaded cubes use more than a memory budget::
+
+    registry = CubeRegistry(MdxEngine(source_type="csv,db"), max_memory=4 * 1024 ** 3)
+    registry.get("sales").execute(query)
+"""
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+from attrs import define, evolve, field
+
+from .query_cache import QueryCache
+
+try:
+    from sqlalchemy import create_engine
+except ImportError:
+    pass
+
+
+def cube_memory(engine):
+    """Estimate the memory used by the cube loaded by an engine (in bytes).
+
+    :param engine: MdxEngine with a loaded cube
+    :return: memory of the star schema, tables and aggregates DataFrames
+    """
+    dataframes = list((engine.tables_loaded or {}).values())
+    dataframes.append(engine.star_schema_dataframe)
+    if engine.aggregates is not None:
+        dataframes.extend(
+            aggregate.dataframe for aggregate in engine.aggregates.aggregates
+        )
+    memory = 0
+    for df in dataframes:
+        try:
+            memory += int(df.memory_usage(index=True, deep=True).sum())
+        except AttributeError:
+            # None, or not a pandas DataFrame (pyspark for instance)
+            pass
+    return memory
+
+
+@define
+class CubeRegistry:
+    """Loaded cubes, by name.
+
+    :param engine: engine used as model (same options and sources) of the engines loading
+        cubes, if it has already loaded a cube, it is registered as the engine of this
+        cube (and replaced by a copy without cube)
+    :param max_memory: memory (bytes) loaded cubes can use, least recently used cubes are
+        evicted beyond it (the last used cube is always kept), 0 for no limit
+    """
+
+    engine = field()
+    max_memory: int = field(default=0)
+    _cubes: OrderedDict = field(factory=OrderedDict, init=False)
+    _memory: dict = field(factory=dict, init=False)
+    _lock: threading.RLock = field(factory=threading.RLock, init=False)
+    # futures of the cubes being loaded
+    _loading: dict = field(factory=dict, init=False)
+
+    def __attrs_post_init__(self):
+        if self.engine.cube and self.engine.tables_loaded is not None:
+            self.add(self.engine)
+            # the cube memory is released when the cube is evicted
+            self.engine = self.new_engine()
+
+    def __contains__(self, cube_name):
+        return cube_name in self._cubes
+
+    def __len__(self):
+        return len(self._cubes)
+
+    @property
+    def memory(self):
+        """:return: memory used by loaded cubes (bytes)"""
+        return sum(self._memory.values())
+
+    def new_engine(self, sqla_uri=None):
+        """Engine without cube, with the model engine options.
+
+        :param sqla_uri: SQLAlchemy uri of the cube database, Default the model engine one
+        :return: MdxEngine
+        """
+        query_cache = self.engine.query_cache
+        discover_cache = self.engine.discover_cache
+        return evolve(
+            self.engine,
+            cube=None,
+            tables_loaded=None,
+            star_schema_dataframe=None,
+            members_index=None,
+            aggregates=None,
+            cube_loader=None,
+            load_timings={},
+            parser=type(self.engine.parser)(),
+            query_cache=QueryCache(
+                max_size=query_cache.max_size,
+                max_memory=query_cache.max_memory,
+                size_of=query_cache.size_of,
+            ),
+            discover_cache=QueryCache(
+                max_size=discover_cache.max_size,
+                max_memory=discover_cache.max_memory,
+                size_of=discover_cache.size_of,
+            ),
+            sqla_engine=create_engine(sqla_uri)
+            if sqla_uri
+            else self.engine.sqla_engine,
+        )
+
+    def get(self, cube_name, fact_table_name="Facts", sqla_uri=None):
+        """Engine of a cube, the cube is loaded if it isn't.
+
+        The cube is loaded without holding the registry lock: loading a cube doesn't
+        block the requests of other cubes, and requests of a cube being loaded wait for
+        this load (the cube is loaded once).
+
+        :param cube_name: cube name
+        :param fact_table_name: facts table name, if the cube is loaded
+        :param sqla_uri: SQLAlchemy uri of the cube database, if the cube is loaded
+        :return: MdxEngine
+        """
+        with self._lock:
+            engine = self._cubes.get(cube_name)
+            if engine is not None:
+                self._cubes.move_to_end(cube_name)
+                return engine
+            loading = self._loading.get(cube_name)
+            if loading is None:
+                loading = self._loading[cube_name] = Future()
+                engine = self.new_engine(sqla_uri)
+        if engine is None:
+            # loaded by another thread
+            return loading.result()
+
+        try:
+            engine.load_cube(cube_name, fact_table_name=fact_table_name)
+        except BaseException as error:
+            loading.set_exception(error)
+            raise
+        else:
+            self.add(engine)
+            loading.set_result(engine)
+        finally:
+            with self._lock:
+                del self._loading[cube_name]
+        return engine
+
+    def get_loaded(self, cube_name):
+        """Engine of a loaded cube, without loading it, nor marking it as used.
+
+        :param cube_name: cube name
+        :return: MdxEngine, or None if the cube isn't loaded
+        """
+        return self._cubes.get(cube_name)
+
+    def add(self, engine):
+        """Register the loaded cube of an engine (as the most recently used cube).
+
+        :param engine: MdxEngine with a loaded cube
+        """
+        with self._lock:
+            self._cubes[engine.cube] = engine
+            self._cubes.move_to_end(engine.cube)
+            self._memory[engine.cube] = cube_memory(engine)
+            self.evict()
+
+    def evict(self):
+        """Remove least recently used cubes while loaded cubes use more than
+        max_memory."""
+        with self._lock:
+            while (
+                self.max_memory
+                and len(self._cubes) > 1
+                and self.memory > self.max_memory
+            ):
+                cube_name, _ = self._cubes.popitem(last=False)
+                del self._memory[cube_name]
+
+    def remove(self, cube_name):
+        """Remove a cube (it is loaded again by the next :func:`get`).
+
+        :param cube_name: cube name
+        """
+        with self._lock:
+            self._cubes.pop(cube_name, None)
+            self._memory.pop(cube_name, None)
+
+    def stats(self):
+        """:return: dict of loaded cubes memory, from the least recently used"""
+        with self._lock:
+            return {cube_name: self._memory[cube_name] for cube_name in self._cubes}
@@ -0,0 +1,160 @@
+"""Binary snapshots of loaded csv cubes.
+
+Loading a csv cube means parsing every csv file, merging them into the star schema and
+cleaning measures, which can take minutes for big cubes. After the first load, MdxEngine
+(with ``cube_snapshots=True``) saves the loaded cube (tables_loaded, star_schema_dataframe and
+measures) in a snapshot file next to the cube folder (``~/olapy-data/cubes/sales.snapshot``
+for the *sales* cube). The next loads use the snapshot as long as the csv files didn't change.
+
+Snapshot file layout::
+
+    MAGIC | header length | header (pickle) | data buffers (64 bytes aligned)
+
+The header is a pickle (protocol 5) of the cube objects, where numpy data (numerical columns,
+categorical codes ...) is stored out-of-band in the data buffers, so those columns are
+memory-mapped when loading a snapshot instead of being parsed and copied.
+
+.. warning:: snapshots are pickle files, only load snapshots written by OlaPy.
+"""
+
+import hashlib
+import mmap
+import os
+import pickle
+import struct
+
+SNAPSHOT_MAGIC = b"OLAPYSN1"
+SNAPSHOT_EXTENSION = ".snapshot"
+_ALIGNMENT = 64
+_UINT64 = struct.Struct("<Q")
+
+# errors of reading a truncated, corrupted, or incompatible (other pandas version...)
+# snapshot file
+SNAPSHOT_READ_ERRORS = (
+    OSError,
+    EOFError,
+    ValueError,
+    struct.error,
+    pickle.UnpicklingError,
+    AttributeError,
+    ImportError,
+)
+
+
+def get_snapshot_path(cube_path):
+    """Snapshot file of a cube, next to the cube folder.
+
+    :param cube_path: cube folder path
+    :return: snapshot file path
+    """
+    return os.path.normpath(cube_path) + SNAPSHOT_EXTENSION
+
+
+def _file_hash(file_path):
+    sha1 = hashlib.sha1()
+    with open(file_path, "rb") as source_file:
+        for chunk in iter(lambda: source_file.read(1024 ** 2), b""):
+            sha1.update(chunk)
+    return sha1.hexdigest()
+
+
+def get_sources_state(cube_path):
+    """Get size, modification time and hash of every cube file.
+
+    :param cube_path: cube folder path
+    :return: dict of {file name: (size, mtime, sha1)}
+    """
+    sources = {}
+    for file_name in sorted(os.listdir(cube_path)):
+        file_path = os.path.join(cube_path, file_name)
+        if os.path.isfile(file_path):
+            stat = os.stat(file_path)
+            sources[file_name] = (stat.st_size, stat.st_mtime_ns, _file_hash(file_path))
+    return sources
+
+
+def sources_changed(cube_path, sources):
+    """Check if the cube files changed since the snapshot was written.
+
+    Files sizes and modification times are checked first, files are hashed only if their
+    modification time changed (copied or touched files for instance).
+
+    :param cube_path: cube folder path
+    :param sources: :func:`get_sources_state` when the snapshot was written
+    :return: True if the snapshot is obsolete
+    """
+    file_names = sorted(
+        file_name
+        for file_name in os.listdir(cube_path)
+        if os.path.isfile(os.path.join(cube_path, file_name))
+    )
+    if file_names != sorted(sources):
+        return True
+
+    for file_name, (size, mtime, sha1) in sources.items():
+        file_path = os.path.join(cube_path, file_name)
+        stat = os.stat(file_path)
+        if stat.st_size != size:
+            return True
+        if stat.st_mtime_ns != mtime and _file_hash(file_path) != sha1:
+            return True
+    return False
+
+
+def _padding(position):
+    return -position % _ALIGNMENT
+
+
+def write_snapshot(snapshot_path, content):
+    """Write a snapshot file.
+
+    :param snapshot_path: snapshot file path
+    :param content: dict of objects to save
+    """
+    buffers = []
+    header = pickle.dumps(content, protocol=5, buffer_callback=buffers.append)
+    raw_buffers = [buffer.raw() for buffer in buffers]
+
+    tmp_path = snapshot_path + ".tmp"
+    with open(tmp_path, "wb") as snapshot_file:
+        snapshot_file.write(SNAPSHOT_MAGIC)
+        snapshot_file.write(_UINT64.pack(len(header)))
+        snapshot_file.write(_UINT64.pack(len(raw_buffers)))
+        for raw_buffer in raw_buffers:
+            snapshot_file.write(_UINT64.pack(raw_buffer.nbytes))
+        snapshot_file.write(header)
+        for raw_buffer in raw_buffers:
+            snapshot_file.write(b"\0" * _padding(snapshot_file.tell()))
+            snapshot_file.write(raw_buffer)
+    # readers never see a partially written snapshot
+    os.replace(tmp_path, snapshot_path)
+
+
+def read_snapshot(snapshot_path):
+    """Read a snapshot file, data buffers are memory-mapped (copy on write).
+
+    :param snapshot_path: snapshot file path
+    :return: dict of saved objects, or None if the file is not a valid snapshot
+    """
+    with open(snapshot_path, "rb") as snapshot_file:
+        if snapshot_file.read(len(SNAPSHOT_MAGIC)) != SNAPSHOT_MAGIC:
+            return None
+        header_length = _UINT64.unpack(snapshot_file.read(_UINT64.size))[0]
+        buffers_number = _UINT64.unpack(snapshot_file.read(_UINT64.size))[0]
+        buffers_lengths = [
+            _UINT64.unpack(snapshot_file.read(_UINT64.size))[0]
+            for _ in range(buffers_number)
+        ]
+        header = snapshot_file.read(header_length)
+        position = snapshot_file.tell()
+        # ACCESS_COPY: pages are loaded on demand, and DataFrames stay writable
+        # (modifications are private and never written to the file)
+        mapped_file = mmap.mmap(snapshot_file.fileno(), 0, access=mmap.ACCESS_COPY)
+
+    buffers = []
+    mapped_view = memoryview(mapped_file)
+    for buffer_length in buffers_lengths:
+        position += _padding(position)
+        buffers.append(mapped_view[position : position + buffer_length])
+        position += buffer_length
+    return pickle.loads(header, buffers=buffers)
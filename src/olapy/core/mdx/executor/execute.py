@@ -14,9 +14,11 @@ Those two objects are constructed in three ways:
     - automatically from database, also if they respect the start schema model, see :mod:`cube_loader_db`
 """
 
+import copy
 import itertools
+import logging
 import os
-from collections import OrderedDict
+from collections import OrderedDict, deque
 from os.path import expanduser
 from typing import Any, List
 
@@ -26,6 +28,19 @@ from attrs import define, field
 
 from olapy.core.mdx.parser import MdxParser
 
+from .aggregates import AggregateStore
+from .cube_snapshot import (
+    SNAPSHOT_READ_ERRORS,
+    get_snapshot_path,
+    get_sources_state,
+    read_snapshot,
+    sources_changed,
+    write_snapshot,
+)
+from .execution_context import ExecutionContext
+from .members_index import MembersIndex
+from .query_cache import QueryCache
+
 # Needed because SQLAlchemy doesn't work under pyiodide
 # FIXME: find another way
 try:
@@ -36,6 +51,24 @@ except ImportError:
     pass
 
 
+def _reset_cube_caches(instance, attribute, value):
+    """attrs on_setattr hook, cached results and aggregates are obsolete once the cube data is
+    replaced."""
+    instance.query_cache.clear()
+    instance.discover_cache.clear()
+    instance.aggregates = None
+    return value
+
+
+def _discover_cache():
+    """Cache of the serialized Discover responses of the loaded cube, values are
+    (response, selected cube) tuples (see
+    :func:`XmlaDiscoverReqHandler.discover_response`)."""
+    return QueryCache(
+        max_size=1024, max_memory=64 * 1024 ** 2, size_of=lambda value: len(value[0])
+    )
+
+
 @define
 class MdxEngine:
     """The main class for executing a query.
@@ -52,6 +85,29 @@ class MdxEngine:
     :param source_type: source data input, Default csv
     :param parser: mdx query parser
     :param facts:  facts table name, Default **Facts**
+    :param categorical_levels: store every non-measure column of the star schema and of the loaded
+        tables as pandas categoricals, so filters and group-bys work on integer codes, Default False
+    :param members_index: :class:`~olapy.core.mdx.executor.members_index.MembersIndex` of the loaded cube,
+        built by load_cube
+    :param query_cache: :class:`~olapy.core.mdx.executor.query_cache.QueryCache` of execute_mdx results,
+        cleared whenever tables_loaded or star_schema_dataframe are replaced
+    :param discover_cache: :class:`~olapy.core.mdx.executor.query_cache.QueryCache` of
+        serialized Discover responses of the loaded cube, cleared like query_cache
+    :param aggregate_levels: levels combinations to pre-aggregate when loading a cube,
+        example: [['Continent', 'Year'], ['Continent', 'Country', 'Company']]
+        (for the cube of cube_config, the config file *aggregates* section is used too)
+    :param aggregates: :class:`~olapy.core.mdx.executor.aggregates.AggregateStore` of the loaded cube
+    :param cube_snapshots: save loaded csv cubes in binary snapshots (see :mod:`cube_snapshot`),
+        and load them from snapshots while csv files don't change, Default False
+    :param csv_dtypes: explicit columns types of csv cubes tables,
+        example: {'Facts': {'Amount': 'float64'}, 'Geography': {'Country': 'category'}}
+    :param cube_loader: cube loader used while loading a cube
+    :param load_timings: parsing time of every file of the last loaded cube (in seconds)
+    :param load_workers: number of tables loaded concurrently by load_cube, Default 1
+        (for the cube of cube_config, the config file *load_workers* is used if set)
+    :param db_chunk_size: number of rows fetched at once when loading a database cube, Default 10000
+    :param db_join_pushdown: let the database join the star schema of database cubes (with foreign
+        keys, or common columns), instead of merging tables with pandas, Default False
     """
 
     cube = field(default=None)
@@ -67,11 +123,24 @@ class MdxEngine:
         )
     )
     cube_config = field(default=None)
-    tables_loaded = field(default=None)
-    star_schema_dataframe = field(default=None)
+    tables_loaded = field(default=None, on_setattr=_reset_cube_caches)
+    star_schema_dataframe = field(default=None, on_setattr=_reset_cube_caches)
     measures = field(default=None)
     selected_measures = field(default=None)
     cubes_folder: str = field(default="cubes")
+    categorical_levels: bool = field(default=False)
+    members_index: MembersIndex = field(default=None)
+    query_cache: QueryCache = field(factory=QueryCache)
+    discover_cache: QueryCache = field(factory=_discover_cache)
+    aggregate_levels: list = field(factory=list)
+    aggregates: AggregateStore = field(default=None)
+    cube_snapshots: bool = field(default=False)
+    csv_dtypes: dict = field(factory=dict)
+    cube_loader = field(default=None)
+    load_timings: dict = field(factory=dict)
+    load_workers: int = field(default=1)
+    db_chunk_size: int = field(default=10000)
+    db_join_pushdown: bool = field(default=False)
 
     # @olapy_data_location.default
     # def get_default_cubes_directory(self):
@@ -142,66 +211,177 @@ class MdxEngine:
         self.facts = fact_table_name
         # load cubes names
         self.get_cubes_names()  # necessary, it fills csv_files_cubes and db_cubes
-        # load tables
-        self.tables_loaded = self.load_tables(sep=sep)
-        if measures:
-            self.measures = measures
+
+        snapshot_path = self.get_snapshot_path() if self.cube_snapshots else None
+        snapshot_parameters = {
+            "facts": fact_table_name,
+            "sep": sep,
+            "measures": measures,
+            "categorical_levels": self.categorical_levels,
+            "csv_dtypes": self.csv_dtypes,
+        }
+        if snapshot_path and self.load_snapshot(snapshot_path, snapshot_parameters):
+            if self.measures:
+                self.selected_measures = [self.measures[0]]
         else:
-            self.measures = self.get_measures()
-        if self.measures:
-            # default measure is the first one
-            self.selected_measures = [self.measures[0]]
-        # construct star_schema
-        if self.tables_loaded:
-            self.star_schema_dataframe = self.get_star_schema_dataframe(sep=sep)
+            sources = get_sources_state(self.get_cube_path()) if snapshot_path else None
+            # load tables
+            self.cube_loader = None
+            self.tables_loaded = self.load_tables(sep=sep)
+            if measures:
+                self.measures = measures
+            else:
+                self.measures = self.get_measures()
+            if self.measures:
+                # default measure is the first one
+                self.selected_measures = [self.measures[0]]
+            # construct star_schema
+            if self.tables_loaded:
+                self.star_schema_dataframe = self.get_star_schema_dataframe(sep=sep)
+            self.load_timings = dict(getattr(self.cube_loader, "parse_timings", {}))
+            for file_name, timing in self.load_timings.items():
+                logging.info("%s parsed in %.3f s", file_name, timing)
+            # release loaded data
+            self.cube_loader = None
+            if self.categorical_levels:
+                self.encode_categorical_levels()
+            if snapshot_path and self.tables_loaded:
+                self.save_snapshot(snapshot_path, snapshot_parameters, sources)
+
+        self.members_index = MembersIndex.from_tables(
+            self.tables_loaded or {}, facts=self.facts
+        )
+        self.aggregates = self.build_aggregates()
 
-    def load_tables(self, sep: str) -> dict[str, pd.DataFrame]:
+    def get_snapshot_path(self):
+        """Get the snapshot file path of the current cube.
+
+        Only csv cubes (not customized with a cube config file) have snapshots.
+
+        :return: snapshot file path, or None
         """
-        Load all tables as dict of { Table_name : DataFrame } for the current
-        cube instance.
+        cube_path = self.get_cube_path()
+        if (
+            cube_path is None
+            or self.cube not in self.csv_files_cubes
+            or (self.cube_config and self.cube == self.cube_config["name"])
+        ):
+            return None
+        return get_snapshot_path(cube_path)
+
+    def load_snapshot(self, snapshot_path, parameters):
+        """Load the cube from its snapshot, if the snapshot is up to date.
+
+        :param snapshot_path: snapshot file path
+        :param parameters: load_cube parameters, the snapshot must have been saved with the same ones
+        :return: True if the cube is loaded from the snapshot
+        """
+        if not os.path.isfile(snapshot_path):
+            return False
+        try:
+            snapshot = read_snapshot(snapshot_path)
+        except SNAPSHOT_READ_ERRORS:
+            # any unreadable snapshot is just rebuilt
+            return False
+
+        if (
+            snapshot is None
+            or snapshot["parameters"] != parameters
+            or sources_changed(self.get_cube_path(), snapshot["sources"])
+        ):
+            return False
+
+        self.facts = snapshot["facts"]
+        self.measures = snapshot["measures"]
+        self.tables_loaded = snapshot["tables_loaded"]
+        self.star_schema_dataframe = snapshot["star_schema_dataframe"]
+        return True
+
+    def save_snapshot(self, snapshot_path, parameters, sources):
+        """Save the loaded cube in a snapshot file.
+
+        :param snapshot_path: snapshot file path
+        :param parameters: load_cube parameters
+        :param sources: :func:`get_sources_state` of cube files used to load the cube
+        """
+        try:
+            write_snapshot(
+                snapshot_path,
+                {
+                    "parameters": parameters,
+                    "sources": sources,
+                    "facts": self.facts,
+                    "measures": self.measures,
+                    "tables_loaded": self.tables_loaded,
+                    "star_schema_dataframe": self.star_schema_dataframe,
+                },
+            )
+        except OSError as error:
+            logging.warning("Unable to save cube snapshot: %s", error)
+
+    def get_cube_loader(self, sep):
+        """Get the loader of the current cube (customized with cube_config, database or csv
+        files).
 
         :param sep: csv files separator.
-        :return: dict with table names as keys and DataFrames as values.
+        :return: cube loader instance
         """
         cubes_folder_path = self.get_cube_path()
-        cube_loader = None  # type: Any
 
         if (
             self.cube_config
             and self.cube_config["facts"]
             and self.cube == self.cube_config["name"]
         ):
-            cube_loader = CubeLoaderCustom(
+            return CubeLoaderCustom(
                 cube_config=self.cube_config,
                 cube_path=cubes_folder_path,
                 sqla_engine=self.sqla_engine,
                 sep=sep,
+                workers=self.cube_config.get("load_workers") or self.load_workers,
             )
 
         elif self.cube in self.db_cubes:
             dialect_name = get_dialect_name(str(self.sqla_engine))
             if "postgres" in dialect_name:
                 self.facts = self.facts.lower()
-            cube_loader = CubeLoaderDB(self.sqla_engine)
+            return CubeLoaderDB(
+                self.sqla_engine,
+                workers=self.load_workers,
+                chunk_size=self.db_chunk_size,
+                join_pushdown=self.db_join_pushdown,
+            )
         # if not tables:
         #     raise Exception(
         #         'unable to load tables, check that the database is not empty',
         #     )
         # elif self.cube in self.csv_files_cubes:
 
-        else:
-            # force reimport CubeLoader every instance call (MdxEngine or SparkMdxEngine)
-            from . import CubeLoader
+        # force reimport CubeLoader every instance call (MdxEngine or SparkMdxEngine)
+        from . import CubeLoader
+
+        return CubeLoader(
+            cubes_folder_path, sep, dtypes=self.csv_dtypes, workers=self.load_workers
+        )
+
+    def load_tables(self, sep: str) -> dict[str, pd.DataFrame]:
+        """
+        Load all tables as dict of { Table_name : DataFrame } for the current
+        cube instance.
 
-            cube_loader = CubeLoader(cubes_folder_path, sep)
+        The cube loader is kept in cube_loader, so that
+        :func:`get_star_schema_dataframe` reuses already loaded data.
 
-        return cube_loader.load_tables()
+        :param sep: csv files separator.
+        :return: dict with table names as keys and DataFrames as values.
+        """
+        self.cube_loader = self.get_cube_loader(sep)
+        return self.cube_loader.load_tables()
 
     def get_measures(self):
         """:return: all numerical columns in Facts table."""
 
         # from postgres and oracle databases , all tables names are lowercase
-        # col.lower()[-2:] != 'id' to ignore any id column
         if self.facts in list(self.tables_loaded.keys()):
             not_id_columns = [
                 column
@@ -214,9 +394,19 @@ class MdxEngine:
             return [
                 col
                 for col in cleaned_facts.select_dtypes(include=[np.number]).columns
-                if col.lower()[-2:] != "id"
+                if self.is_measure_name(col)
             ]
 
+    @staticmethod
+    def is_measure_name(column):
+        """Facts columns which can be measures (if numerical), any id column is ignored.
+
+        :param column: facts column name
+        :return: True if column is not an id column
+        """
+        # col.lower()[-2:] != 'id' to ignore any id column
+        return "id" not in column and column.lower()[-2:] != "id"
+
     @staticmethod
     def clean_data(star_schema_df, measures):
         """measure like this: 1 349 is not numeric so we try to transform it to
@@ -248,9 +438,6 @@ class MdxEngine:
         :param with_id_columns: start schema dataFrame contains id columns or not
         :return: star schema DataFrame
         """
-        # force reimport CubeLoader every instance call (MdxEngine or SparkMdxEngine)
-        from ..executor import CubeLoader
-
         if (
             self.cube_config
             and self.cube_config["facts"]
@@ -261,22 +448,8 @@ class MdxEngine:
             if self.cube_config["facts"]["measures"]:
                 self.measures = self.cube_config["facts"]["measures"]
 
-            cube_path = self.get_cube_path()
-            cube_loader = CubeLoaderCustom(
-                cube_config=self.cube_config,
-                cube_path=cube_path,
-                sqla_engine=self.sqla_engine,
-                sep=sep,
-            )
-
-        elif self.cube in self.db_cubes:
-            cube_loader = CubeLoaderDB(self.sqla_engine)
-
-        # elif self.cube in self.csv_files_cubes:
-        else:
-            cube_path = self.get_cube_path()
-            cube_loader = CubeLoader(cube_path)
-
+        # loader used by load_tables (with already loaded data)
+        cube_loader = self.cube_loader or self.get_cube_loader(sep)
         fusion = cube_loader.construct_star_schema(self.facts)
         star_schema_df = self.clean_data(fusion, self.measures)
 
@@ -287,6 +460,101 @@ class MdxEngine:
             [col for col in fusion.columns if col.lower()[-3:] != "_id"]
         ]
 
+    def encode_categorical_levels(self):
+        """Convert all non-measure columns of tables_loaded and star_schema_dataframe
+        to the pandas *category* dtype.
+
+        Each level column is then stored once as a small dictionary of distinct members plus
+        an array of integer codes, so equality filters and group-bys compare integers
+        instead of hashing strings.
+        """
+        measures = self.measures or []
+
+        def _encode(df):
+            return df.astype(
+                {column: "category" for column in df.columns if column not in measures}
+            )
+
+        if self.tables_loaded:
+            self.tables_loaded = {
+                table_name: _encode(df) for table_name, df in self.tables_loaded.items()
+            }
+        if self.star_schema_dataframe is not None:
+            self.star_schema_dataframe = _encode(self.star_schema_dataframe)
+
+    def build_aggregates(self):
+        """Pre-aggregate measures of the star schema for aggregate_levels (and cube config
+        *aggregates*) levels combinations.
+
+        :return: AggregateStore, or None if there is nothing to pre-aggregate
+        """
+        levels_combinations = list(self.aggregate_levels)
+        if self.cube_config and self.cube == self.cube_config["name"]:
+            levels_combinations += self.cube_config.get("aggregates", [])
+
+        if not levels_combinations or self.star_schema_dataframe is None:
+            return None
+        return AggregateStore.build(
+            self.star_schema_dataframe, self.measures, levels_combinations
+        )
+
+    def _get_query_columns(self, tuples):
+        """Get all star schema columns used (filtered or grouped) by tuples.
+
+        :param tuples: list of tuples (without measures)
+        :return: set of columns names, None if a member can't be resolved
+        """
+        columns = set()
+        for tupl in tuples:
+            columns.update(self.tables_loaded[tupl[0]].columns[: len(tupl[2:])])
+            for tup_att in tupl[2:]:
+                if tup_att.isdigit():
+                    tup_att = int(tup_att)
+                if tup_att in self.star_schema_dataframe.columns:
+                    columns.add(tup_att)
+                else:
+                    column_from_value = self._get_member_level(tupl[0], tup_att)
+                    if column_from_value is None:
+                        return None
+                    columns.add(column_from_value)
+        return columns
+
+    def get_aggregate(self, tuples):
+        """Get the smallest DataFrame (aggregate or star schema) which can be used to execute
+        tuples with the selected measures.
+
+        :param tuples: list of tuples (without measures)
+        :return: DataFrame
+        """
+        if self.aggregates:
+            columns = self._get_query_columns(tuples)
+            if columns is not None:
+                aggregate = self.aggregates.find(columns, self.selected_measures)
+                if aggregate is not None:
+                    return aggregate
+        return self.star_schema_dataframe
+
+    @staticmethod
+    def _decode_categorical_index(index):
+        """Turn categorical index levels of a (small) group-by result back into plain values,
+        so the execution result is the same with or without categorical_levels.
+
+        :param index: group-by result index (Index or MultiIndex)
+        :return: index without categorical levels
+        """
+
+        def _decode(level):
+            if isinstance(level, pd.CategoricalIndex):
+                return pd.Index(np.asarray(level), name=level.name)
+            return level
+
+        if isinstance(index, pd.MultiIndex):
+            return pd.MultiIndex.from_arrays(
+                [_decode(index.get_level_values(idx)) for idx in range(index.nlevels)],
+                names=index.names,
+            )
+        return _decode(index)
+
     def get_all_tables_names(self, ignore_fact=False):
         """Get list of tables names.
 
@@ -347,6 +615,25 @@ class MdxEngine:
                 return False
         return True
 
+    def _tuple_members_exist(self, tupl):
+        """Same as :func:`_df_column_values_exist`, but using the cube members index.
+
+        :param tupl: tuple as list
+        :return: True if every member exists in its level column
+        """
+        if self.members_index is None or tupl[0] not in self.members_index:
+            return self._df_column_values_exist(tupl, self.tables_loaded[tupl[0]])
+
+        for idx, column_value in enumerate(tupl[2:]):
+            try:
+                column_value = int(column_value)
+            except ValueError:
+                pass
+
+            if not self.members_index.member_exists(tupl[0], idx, column_value):
+                return False
+        return True
+
     def get_tables_and_columns(self, tuple_as_list):
         """Get used dimensions and columns in the MDX Query.
 
@@ -407,6 +694,17 @@ class MdxEngine:
             if column_value in df[column].unique():
                 return column
 
+    def _get_member_level(self, dimension, member):
+        """Get the level (column) of dimension which contains member.
+
+        :param dimension: dimension name
+        :param member: member value
+        :return: column name
+        """
+        if self.members_index is not None and dimension in self.members_index:
+            return self.members_index.get_level(dimension, member)
+        return self._get_column_name_from_value(self.tables_loaded[dimension], member)
+
     def execute_one_tuple(self, tuple_as_list, dataframe_in, columns_to_keep):
         """Filter a DataFrame (Dataframe_in) with one tuple.
 
@@ -441,6 +739,17 @@ class MdxEngine:
             other columns to keep in the execution except the current tuple
         :return: Filtered DataFrame
         """
+        df = self._filter_tuple_members(tuple_as_list, dataframe_in)
+        cols = list(itertools.chain.from_iterable(columns_to_keep))
+        return df[cols + self.selected_measures]
+
+    def _filter_tuple_members(self, tuple_as_list, dataframe_in):
+        """Filter a DataFrame with all members of a tuple.
+
+        :param tuple_as_list: tuple as list
+        :param dataframe_in: DataFrame to filter
+        :return: Filtered DataFrame (with all dataframe_in columns)
+        """
         df = dataframe_in
         #  tuple_as_list like ['Geography','Geography','Continent']
         #  return df with Continent column non empty
@@ -462,13 +771,86 @@ class MdxEngine:
                 df = df[(df[tup_att].notnull())]
             else:
                 # todo check ex time
-                column_from_value = self._get_column_name_from_value(
-                    self.tables_loaded[tuple_as_list[0]], tup_att
-                )
+                column_from_value = self._get_member_level(tuple_as_list[0], tup_att)
                 df = df[(df[column_from_value] == tup_att)]
 
-        cols = list(itertools.chain.from_iterable(columns_to_keep))
-        return df[cols + self.selected_measures]
+        return df
+
+    def _get_siblings_level(self, siblings, columns):
+        """Get the level column of the last member of sibling tuples.
+
+        :param siblings: tuples which only differ by their last member, like
+            [['Geography','Geography','Continent','Europe','France'],
+            ['Geography','Geography','Continent','Europe','Spain']]
+        :param columns: columns of the DataFrame to filter
+        :return: (column, members) or None if last members are not all members of the same level
+        """
+        column = None
+        members = []
+        for tupl in siblings:
+            member = tupl[-1]
+            if member.isdigit():
+                member = int(member)
+            if member in columns:
+                return None
+            level = self._get_member_level(tupl[0], member)
+            if level is None or (column is not None and level != column):
+                return None
+            column = level
+            members.append(member)
+        return column, members
+
+    def execute_sibling_tuples(self, siblings, dataframe_in, columns_to_keep):
+        """Filter a DataFrame with tuples which only differ by their last member (same level).
+
+        The result is the same as calling :func:`execute_one_tuple` (and
+        :func:`update_columns_to_keep`) for every tuple, but members are filtered with one
+        membership mask instead of one mask per member, example::
+
+            [Geography].[Geography].[Country].[France]
+            [Geography].[Geography].[Country].[Spain]
+            [Geography].[Geography].[Country].[Italy]
+
+            -> df[df['Country'].isin(['France', 'Spain', 'Italy'])]
+
+        :param siblings: list of tuples
+        :param dataframe_in: DataFrame to filter
+        :param columns_to_keep: :func:`columns_to_keep`
+        :return: list of filtered DataFrames, one per tuple
+        """
+        siblings_level = None
+        if len(siblings) > 1:
+            siblings_level = self._get_siblings_level(siblings, dataframe_in.columns)
+
+        if siblings_level is None:
+            chunks = []
+            for tupl in siblings:
+                self.update_columns_to_keep(tupl, columns_to_keep)
+                chunks.append(
+                    self.execute_one_tuple(tupl, dataframe_in, columns_to_keep.values())
+                )
+            return chunks
+
+        column, members = siblings_level
+        # common members (all but the last one)
+        df = self._filter_tuple_members(siblings[0][:-1], dataframe_in)
+        df = df[df[column].isin(members)]
+        # group rows by member (keeping rows order), to split them without filtering again
+        members_positions = pd.Index(members).get_indexer(np.asarray(df[column]))
+        rows_order = np.argsort(members_positions, kind="stable")
+        df = df.iloc[rows_order]
+        bounds = np.searchsorted(
+            members_positions[rows_order], np.arange(len(members) + 1)
+        )
+
+        chunks = []
+        for idx, tupl in enumerate(siblings):
+            self.update_columns_to_keep(tupl, columns_to_keep)
+            cols = list(itertools.chain.from_iterable(columns_to_keep.values()))
+            chunks.append(
+                df.iloc[bounds[idx] : bounds[idx + 1]][cols + self.selected_measures]
+            )
+        return chunks
 
     @staticmethod
     def add_missed_column(dataframe1, dataframe2):
@@ -537,17 +919,19 @@ class MdxEngine:
         """
         df_with_less_columns = dataframe1
         df_with_more_columns = dataframe2
-        if len(list(dataframe1.columns)) != len(list(dataframe2.columns)):
-            if len(list(dataframe1.columns)) > len(list(dataframe2.columns)):
+        if len(dataframe1.columns) != len(dataframe2.columns):
+            if len(dataframe1.columns) > len(dataframe2.columns):
                 df_with_more_columns = dataframe1
                 df_with_less_columns = dataframe2
             missed_columns = [
                 col
-                for col in list(df_with_more_columns.columns)
-                if col not in list(df_with_less_columns.columns)
+                for col in df_with_more_columns.columns
+                if col not in df_with_less_columns.columns
             ]
-            for missed_column in missed_columns:
-                df_with_less_columns[missed_column] = -1
+            # assign returns a new DataFrame, inputs are not modified
+            df_with_less_columns = df_with_less_columns.assign(
+                **{missed_column: -1 for missed_column in missed_columns}
+            )
 
         return [df_with_less_columns, df_with_more_columns]
 
@@ -597,8 +981,8 @@ class MdxEngine:
         :return: updated columns_to_keep
         """
         df = self.tables_loaded[tuple_as_list[0]]
-        if self.parser.hierarchized_tuples() or self._df_column_values_exist(
-            tuple_as_list, df
+        if self.parser.hierarchized_tuples() or self._tuple_members_exist(
+            tuple_as_list
         ):
             start_columns_used = 2
         else:
@@ -631,7 +1015,7 @@ class MdxEngine:
 
         return unique_tuples
 
-    def tuples_to_dataframes(self, tuples_on_mdx_query, columns_to_keep):
+    def tuples_to_dataframes(self, tuples_on_mdx_query, columns_to_keep, dataframe=None):
         """Construct DataFrame of many groups mdx query.
 
         many groups mdx query is something like:
@@ -645,49 +1029,103 @@ class MdxEngine:
 
         :param tuples_on_mdx_query: list of string of tuples.
         :param columns_to_keep: (useful for executing many tuples, for instance execute_mdx).
+        :param dataframe: DataFrame to filter, Default star_schema_dataframe
         :return: Pandas DataFrame.
         """
         # get only used columns and dimensions for all query
-        star_df = self.star_schema_dataframe
+        star_df = self.star_schema_dataframe if dataframe is None else dataframe
         df_to_fusion = []
         table_name = tuples_on_mdx_query[0][0]
-        # in every tuple
-        for tupl in tuples_on_mdx_query:
-            # if we have measures in columns or rows axes like :
-            # SELECT {[Measures].[Amount],[Measures].[Count], [Customers].[Geography].[All Regions]} ON COLUMNS
-            # we use only used columns for dimension in that tuple and keep
-            # other dimension's columns
-            self.update_columns_to_keep(tupl, columns_to_keep)
+        # in every group of consecutive tuples which only differ by their last member
+        for siblings in self._group_sibling_tuples(tuples_on_mdx_query):
             # a tuple with new dimension
-            if tupl[0] != table_name:
+            if siblings[0][0] != table_name:
                 # if we change dimension , we have to work on the
                 # exection's result on previous DataFrames
 
-                df = df_to_fusion[0]
-                for next_df in df_to_fusion[1:]:
-                    df = pd.concat(self.add_missed_column(df, next_df))
-
-                table_name = tupl[0]
+                table_name = siblings[0][0]
+                star_df = self.fusion_dataframes(df_to_fusion)
                 df_to_fusion = []
-                star_df = df
 
-            df_to_fusion.append(
-                self.execute_one_tuple(tupl, star_df, columns_to_keep.values())
+            # if we have measures in columns or rows axes like :
+            # SELECT {[Measures].[Amount],[Measures].[Count], [Customers].[Geography].[All Regions]} ON COLUMNS
+            # we use only used columns for dimension in that tuple and keep
+            # other dimension's columns (update_columns_to_keep)
+            df_to_fusion.extend(
+                self.execute_sibling_tuples(siblings, star_df, columns_to_keep)
             )
 
         return df_to_fusion
 
+    @staticmethod
+    def _group_sibling_tuples(tuples):
+        """Group consecutive tuples which only differ by their last member.
+
+        :param tuples: list of tuples
+        :return: generator of lists of tuples
+        """
+        siblings = []
+        for tupl in tuples:
+            if siblings and tupl[:-1] != siblings[0][:-1]:
+                yield siblings
+                siblings = []
+            siblings.append(tupl)
+        if siblings:
+            yield siblings
+
     def fusion_dataframes(self, df_to_fusion):
         # type: (List[pd.DataFrame]) -> pd.DataFrame
         """Concat chunks of DataFrames.
 
+        Gives the same result as concatenating chunks one by one with
+        :func:`add_missed_column` (missing columns filled with -1, and the chunk with
+        less columns first), but all chunks are concatenated once, instead of copying
+        the growing DataFrame for every chunk.
+
         :param df_to_fusion: List of Pandas DataFrame.
         :return: a Pandas DataFrame.
         """
-
-        df = df_to_fusion[0]
+        if len(df_to_fusion) == 1:
+            return df_to_fusion[0]
+
+        # [DataFrame, {missed column: -1}] in concatenation order
+        first_chunk = [df_to_fusion[0], {}]
+        chunks = deque([first_chunk])
+        # columns of the chunks concatenated so far, in their order (ordered set)
+        columns = dict.fromkeys(df_to_fusion[0].columns)
         for next_df in df_to_fusion[1:]:
-            df = pd.concat(self.add_missed_column(df, next_df), sort=False)
+            next_chunk = [next_df, {}]
+            next_columns = dict.fromkeys(next_df.columns)
+            if len(columns) > len(next_columns):
+                missed_columns = [col for col in columns if col not in next_columns]
+                next_chunk[1].update(
+                    (missed_column, -1) for missed_column in missed_columns
+                )
+                chunks.appendleft(next_chunk)
+                # like pd.concat([less columns df, more columns df])
+                columns = dict.fromkeys([*next_columns, *missed_columns, *columns])
+            else:
+                if len(columns) < len(next_columns):
+                    missed_columns = [
+                        col for col in next_columns if col not in columns
+                    ]
+                    for chunk in chunks:
+                        chunk[1].update(
+                            (missed_column, -1) for missed_column in missed_columns
+                        )
+                    columns.update(dict.fromkeys(missed_columns))
+                chunks.append(next_chunk)
+                columns.update(next_columns)
+
+        df = pd.concat(
+            [
+                df.assign(**missed_columns) if missed_columns else df
+                for df, missed_columns in chunks
+            ],
+            sort=False,
+        )
+        if list(df.columns) != list(columns):
+            df = df[list(columns)]
         return df
 
     def check_nested_select(self):
@@ -734,6 +1172,81 @@ class MdxEngine:
         self.parser.mdx_query = clean_query
         return clean_query
 
+    def group_measures(self, df, columns, sort):
+        """Sum selected measures of the filtered DataFrame by columns.
+
+        :param df: :func:`fusion_dataframes` result
+        :param columns: columns to group by
+        :param sort: sort groups by columns values, or keep them in df order
+        :return: DataFrame with columns as index and selected measures as columns
+        """
+        # margins=True for columns total !!!!!
+        # observed=True: with categorical levels, only group members that exist in df
+        result = df.groupby(columns, sort=sort, observed=True).sum()[
+            self.selected_measures
+        ]
+        if self.categorical_levels:
+            if sort:
+                # categorical groupers ignore sort when observed=True
+                result = result.sort_index()
+            result.index = self._decode_categorical_index(result.index)
+        return result
+
+    def sum_measures(self):
+        """Sum selected measures over the whole cube (query without tuples).
+
+        :return: DataFrame with one row
+        """
+        return self.get_aggregate([])[self.selected_measures].sum().to_frame().T
+
+    def query_executor(self, selected_measures=None):
+        """Shallow copy of the engine, to execute one query without changing the engine
+        state: the loaded cube (tables, star schema, members index, aggregates, query
+        cache) is shared, the parser and selected measures are the copy ones.
+
+        :param selected_measures: measures used by queries without measures, Default the
+            engine selected measures
+        :return: engine copy
+        """
+        executor = copy.copy(self)
+        if getattr(self, "__dict__", None):
+            # attributes of subclasses which are not attrs classes
+            executor.__dict__.update(self.__dict__)
+        executor.parser = type(self.parser)()
+        if selected_measures is None:
+            selected_measures = self.selected_measures
+        executor.selected_measures = (
+            list(selected_measures) if selected_measures is not None else None
+        )
+        return executor
+
+    def execute(self, mdx_query, selected_measures=None):
+        """Execute an MDX Query, like :func:`execute_mdx`, but without changing the
+        engine: the query state is kept by the returned :class:`ExecutionContext`, so
+        many threads can execute queries with the same engine (and the same loaded
+        cube) at the same time.
+
+        Usage ::
+
+            executor = MdxEngine()
+            executor.load_cube('sales')
+            context = executor.execute(query)
+            context.result
+
+        :param mdx_query: Mdx Query
+        :param selected_measures: measures used if the query has no measures, Default the
+            engine selected measures (the first measure of the cube)
+        :return: :class:`ExecutionContext`
+        """
+        executor = self.query_executor(selected_measures)
+        execution_result = executor.execute_mdx(mdx_query)
+        return ExecutionContext(
+            mdx_query=executor.parser.mdx_query,
+            selected_measures=tuple(executor.selected_measures or ()),
+            execution_result=execution_result,
+            executor=executor,
+        )
+
     def execute_mdx(self, mdx_query):
         """Execute an MDX Query.
 
@@ -744,6 +1257,11 @@ class MdxEngine:
             query = "SELECT FROM [sales] WHERE ([Measures].[Amount])"
             executor.execute_mdx(query)
 
+        Results are kept in :attr:`query_cache`, so executing the same query again
+        (with the same selected measures) returns the cached result. Every call returns a
+        new dict, but its DataFrame and columns_desc are shared with the cache, callers
+        must not modify them.
+
         :param mdx_query: Mdx Query
 
         :return: dict with DataFrame execution result and (dimension and columns used as dict)
@@ -756,6 +1274,14 @@ class MdxEngine:
             }
         """
         query = self.clean_mdx_query(mdx_query)
+        # without measures in the query, selected_measures (from previous queries) are used
+        cache_key = (self.cube, query, tuple(self.selected_measures or ()))
+        cached = self.query_cache.get(cache_key)
+        if cached is not None:
+            execution_result, selected_measures = cached
+            self.selected_measures = list(selected_measures)
+            return dict(execution_result)
+
         # use measures that exists on where or insides axes
         query_axes = self.parser.decorticate_query(query)
         if self.change_measures(query_axes["all"]):
@@ -785,18 +1311,23 @@ class MdxEngine:
                 df_to_fusion = self.nested_tuples_to_dataframes(columns_to_keep)
             else:
                 df_to_fusion = self.tuples_to_dataframes(
-                    tuples_on_mdx_query, columns_to_keep
+                    tuples_on_mdx_query,
+                    columns_to_keep,
+                    dataframe=self.get_aggregate(tuples_on_mdx_query),
                 )
             df = self.fusion_dataframes(df_to_fusion)
 
             cols = list(itertools.chain.from_iterable(columns_to_keep.values()))
-            sort = self.parser.hierarchized_tuples()
-            # margins=True for columns total !!!!!
-            result = df.groupby(cols, sort=sort).sum()[self.selected_measures]
+            result = self.group_measures(
+                df, cols, sort=self.parser.hierarchized_tuples()
+            )
 
         else:
-            result = (
-                self.star_schema_dataframe[self.selected_measures].sum().to_frame().T
-            )
+            result = self.sum_measures()
 
-        return {"result": result, "columns_desc": tables_n_columns}
+        execution_result = {"result": result, "columns_desc": tables_n_columns}
+        # cubes without measures have no selected measures
+        self.query_cache.put(
+            cache_key, (execution_result, list(self.selected_measures or []))
+        )
+        return dict(execution_result)
@@ -0,0 +1,42 @@
+"""Result and state of one MDX query execution.
+
+:func:`MdxEngine.execute_mdx <olapy.core.mdx.executor.execute.MdxEngine.execute_mdx>` keeps
+the state of the executed query on the engine (``parser.mdx_query``, ``selected_measures``),
+so one engine can't execute queries of many threads.
+:func:`MdxEngine.execute <olapy.core.mdx.executor.execute.MdxEngine.execute>` executes the
+query with a shallow copy of the engine (sharing the loaded cube data, which is only read),
+and returns the query state as an :class:`ExecutionContext`.
+"""
+
+from typing import Any
+
+from attrs import frozen
+
+
+@frozen
+class ExecutionContext:
+    """Executed query, its result, and the engine state of the query.
+
+    :param mdx_query: executed (cleaned) mdx query
+    :param selected_measures: measures of the query (or selected measures given to execute
+        if the query has no measures)
+    :param execution_result: execute_mdx dict (result DataFrame and columns_desc), must not
+        be modified, it may be cached
+    :param executor: engine which executed the query, the loaded cube is shared with the
+        engine, its parser and selected measures are the ones of the query
+    """
+
+    mdx_query: str
+    selected_measures: tuple
+    execution_result: dict
+    executor: Any
+
+    @property
+    def result(self):
+        """:return: execution result DataFrame"""
+        return self.execution_result["result"]
+
+    @property
+    def columns_desc(self):
+        """:return: dimensions and columns used by the query axes"""
+        return self.execution_result["columns_desc"]
@@ -0,0 +1,174 @@
+"""Inverted index of dimension members, built once when a cube is loaded.
+
+Resolving a tuple member like *[Geography].[Geography].[Country].[France]* means finding the
+level (column) of the *Geography* table which contains *France*. Instead of scanning
+``df[column].unique()`` for every column each time a member is resolved, MdxEngine builds a
+:class:`MembersIndex` at :func:`load_cube <olapy.core.mdx.executor.execute.MdxEngine.load_cube>`
+time and answers those questions with dict/set lookups.
+
+The index also keeps levels cardinalities and the members tree of every dimension (children
+of every member), so that Discover requests (MDSCHEMA_LEVELS, MDSCHEMA_MEMBERS with TREE_OP)
+are answered without scanning tables.
+"""
+
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import pandas as pd
+from attrs import define, field
+
+
+@define
+class MembersIndex:
+    """Map (dimension, member) to the level column containing the member.
+
+    :param columns: ordered level columns of every dimension
+    :param levels: distinct members of every (dimension, level column)
+    :param members: first level column (in dimension columns order) of every (dimension, member)
+    :param children: names of the children members of every (dimension, member path), a member
+        path is the tuple of members names from the first level, for instance
+        ('Europe', 'France'), () is the parent of the first level members
+    """
+
+    columns: Dict[str, List[str]] = field(factory=dict)
+    levels: Dict[str, Dict[str, Set[Any]]] = field(factory=dict)
+    members: Dict[str, Dict[Any, str]] = field(factory=dict)
+    children: Dict[str, Dict[Tuple[str, ...], List[str]]] = field(factory=dict)
+
+    @classmethod
+    def from_tables(cls, tables, facts=None):
+        """Index all dimension members.
+
+        :param tables: dict of { Table_name : DataFrame } (MdxEngine.tables_loaded)
+        :param facts: facts table name, its members tree is not built
+        :return: MembersIndex instance
+        """
+        index = cls()
+        for table_name, df in tables.items():
+            # only pandas DataFrames can be indexed (not Spark DataFrames for instance)
+            if isinstance(df, pd.DataFrame):
+                index.add_dimension(table_name, df, members_tree=table_name != facts)
+        return index
+
+    def add_dimension(self, dimension, df, members_tree=True):
+        """Index members of one dimension table.
+
+        :param dimension: dimension (table) name
+        :param df: dimension DataFrame
+        :param members_tree: build the members tree of the dimension
+        """
+        self.columns[dimension] = list(df.columns)
+        self.levels[dimension] = {}
+        self.members[dimension] = {}
+        for column in df.columns:
+            values = set(df[column].dropna().unique())
+            self.levels[dimension][column] = values
+            for value in values:
+                # keep the first column containing the member
+                self.members[dimension].setdefault(value, column)
+        if members_tree:
+            self.children[dimension] = self._members_tree(df)
+
+    @staticmethod
+    def _members_tree(df):
+        """Children names of every member path of a dimension table.
+
+        :param df: dimension DataFrame
+        :return: dict of { member path : [children names] }, in table order
+        """
+        children = {(): []}
+        for depth in range(len(df.columns)):
+            # rows with an empty level value have no members beyond this level
+            paths = df.iloc[:, : depth + 1].dropna().drop_duplicates()
+            for path in paths.astype(str).itertuples(index=False, name=None):
+                children.setdefault(path[:-1], []).append(path[-1])
+        return children
+
+    def __contains__(self, dimension):
+        return dimension in self.columns
+
+    def get_level(self, dimension, member):
+        # type: (str, Any) -> Optional[str]
+        """Get the first level column of dimension which contains member.
+
+        :param dimension: dimension name
+        :param member: member value, for instance 'France' or 2010
+        :return: column name, or None if member does not exist
+        """
+        try:
+            return self.members[dimension].get(member)
+        except TypeError:
+            # unhashable member
+            return None
+
+    def member_exists(self, dimension, level_position, member):
+        # type: (str, int, Any) -> bool
+        """Check if member exists in the level_position-th column of dimension.
+
+        :param dimension: dimension name
+        :param level_position: column position in the dimension table
+        :param member: member value
+        :return: True if member exists in that column
+        """
+        column = self.columns[dimension][level_position]
+        try:
+            return member in self.levels[dimension][column]
+        except TypeError:
+            return False
+
+    def level_cardinality(self, dimension, column):
+        # type: (str, str) -> int
+        """Number of distinct members of a level.
+
+        :param dimension: dimension name
+        :param column: level column
+        :return: members count, 0 if the level is not indexed
+        """
+        return len(self.levels.get(dimension, {}).get(column, ()))
+
+    def member_path(self, dimension, names):
+        # type: (str, List[str]) -> Optional[Tuple[str, ...]]
+        """Path of a member of the members tree.
+
+        :param dimension: dimension name
+        :param names: members names from the first level, optionally preceded by the
+            member level, for instance ['Country', 'Europe', 'France'] or ['Europe', 'France']
+        :return: member path, or None if the member does not exist
+        """
+        tree = self.children.get(dimension)
+        if tree is None:
+            return None
+        candidates = [tuple(names)]
+        if len(names) > 1 and names[0] in self.columns[dimension]:
+            # member level, the path is valid if it is at that level
+            if self.columns[dimension].index(names[0]) == len(names) - 2:
+                candidates.insert(0, tuple(names[1:]))
+        for path in candidates:
+            if path and path[-1] in tree.get(path[:-1], ()):
+                return path
+        return None
+
+    def get_children(self, dimension, path):
+        # type: (str, Tuple[str, ...]) -> List[Tuple[str, ...]]
+        """Paths of the children of a member (of the first level members for ()).
+
+        :param dimension: dimension name
+        :param path: member path
+        :return: list of members paths
+        """
+        return [path + (name,) for name in self.children[dimension].get(path, ())]
+
+    def get_descendants(self, dimension, path):
+        # type: (str, Tuple[str, ...]) -> List[Tuple[str, ...]]
+        """Paths of all the descendants of a member, depth first.
+
+        :param dimension: dimension name
+        :param path: member path
+        :return: list of members paths
+        """
+        descendants = []
+        stack = list(reversed(self.get_children(dimension, path)))
+        while stack:
+            child = stack.pop()
+            descendants.append(child)
+            stack.extend(reversed(self.get_children(dimension, child)))
+        return descendants
@@ -0,0 +1,100 @@
+"""Bounded LRU cache of MDX execution results.
+
+XMLA clients (Excel pivot tables for instance) send the same queries again and again,
+:class:`QueryCache` keeps the latest results of
+:func:`execute_mdx <olapy.core.mdx.executor.execute.MdxEngine.execute_mdx>` so that they are
+not filtered and grouped again, it is bounded by a number of entries and by an (estimated)
+memory size.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+from attrs import define, field
+
+
+def _result_size(value):
+    # type: (Any) -> int
+    """Estimate the memory used by a cached execution result (in bytes)."""
+    result = value[0]["result"]
+    try:
+        return int(result.memory_usage(index=True, deep=True).sum())
+    except AttributeError:
+        # not a pandas DataFrame (pyspark for instance)
+        return 0
+
+
+@define
+class QueryCache:
+    """LRU cache of execution results.
+
+    :param max_size: maximum number of cached results, 0 to disable the cache
+    :param max_memory: maximum memory (bytes) used by cached results, Default 256 MB
+    :param size_of: function estimating the memory used by a cached value, Default the
+        size of execution results
+    """
+
+    max_size: int = field(default=128)
+    max_memory: int = field(default=256 * 1024 ** 2)
+    size_of: Callable = field(default=_result_size)
+    hits: int = field(default=0, init=False)
+    misses: int = field(default=0, init=False)
+    memory: int = field(default=0, init=False)
+    _entries: OrderedDict = field(factory=OrderedDict, init=False)
+    # engines executing queries in many threads share the cache
+    _lock: threading.Lock = field(factory=threading.Lock, init=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        # type: (Hashable) -> Optional[Any]
+        """Get cached value of key, and mark it as the most recently used.
+
+        :param key: cache key
+        :return: cached value or None
+        """
+        with self._lock:
+            try:
+                value, size = self._entries[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        """Cache value, and evict least recently used values if the cache is full.
+
+        :param key: cache key
+        :param value: (execution result, selected measures) tuple
+        """
+        if self.max_size <= 0:
+            return
+        size = self.size_of(value)
+        if size > self.max_memory:
+            return
+        with self._lock:
+            if key in self._entries:
+                self.memory -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size)
+            self.memory += size
+            while len(self._entries) > self.max_size or self.memory > self.max_memory:
+                self.memory -= self._entries.popitem(last=False)[1][1]
+
+    def clear(self):
+        """Remove all cached results (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self.memory = 0
+
+    def stats(self):
+        """:return: dict with cache counters."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._entries),
+            "memory": self.memory,
+        }
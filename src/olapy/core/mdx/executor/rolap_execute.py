@@ -0,0 +1,483 @@
+"""Do the same thing as MdxEngine, but keep the cube data in the database (ROLAP).
+
+MdxEngine loads the whole star schema in a DataFrame, which is not possible with very big
+databases. RolapMdxEngine only loads dimension tables (to explore members), and translates
+every MDX query into one SQL query, executed by the database::
+
+    WITH star AS (SELECT ... FROM facts JOIN geography ... )
+    SELECT Continent, Country, SUM(Amount) AS Amount FROM (
+        SELECT star.Continent AS Continent, NULL AS Country, star.Amount AS Amount
+        FROM star WHERE star.Continent = 'Europe'
+        UNION ALL
+        SELECT star.Continent AS Continent, star.Country AS Country, ...
+        FROM star WHERE star.Country IN ('France', 'Spain')
+    ) rolap GROUP BY Continent, Country
+
+Every UNION ALL branch is a chunk of :func:`MdxEngine.tuples_to_dataframes` (sibling
+tuples, which only differ by their last member, are executed together with one *IN*
+condition, other tuples one after another, and with many dimensions, for every
+combination of tuples), so execution results are the same as MdxEngine ones.
+
+usage::
+
+    executor = RolapMdxEngine(sqla_engine=sqla_engine, source_type="db")
+    executor.load_cube("main")
+    executor.execute_mdx(query)
+"""
+
+import itertools
+
+import pandas as pd
+from attrs import define, evolve, field
+from sqlalchemy import inspect
+from sqlalchemy.sql import sqltypes
+
+from ..tools.connection import get_dialect_name
+from .cube_loader_db import CubeLoaderDB
+from .execute import MdxEngine
+from .members_index import MembersIndex
+
+
+@define
+class SqlChunk:
+    """Star schema rows filtered by some tuples, the sql counterpart of MdxEngine
+    DataFrames chunks.
+
+    :param conditions: list of (column, member) filters, member None for *column IS NOT
+        NULL* and a list of members for *column IN (members)*
+    :param columns: star schema columns of the chunk, other grouped columns are filled with -1
+    :param order: position of the chunk in tuples order, one item per executed dimension
+        (the last one first): the tuple position, or (column, {member: tuple position})
+        for sibling tuples
+    """
+
+    conditions: list = field(factory=list)
+    columns: list = field(factory=list)
+    order: list = field(factory=list)
+
+
+class PositionedTuple(list):
+    """Tuple as list, with its position in the executed tuples (see :class:`SqlChunk`).
+
+    :param members: tuple as list
+    :param position: tuple position
+    """
+
+    def __init__(self, members, position):
+        super().__init__(members)
+        self.position = position
+
+
+@define
+class RolapMdxEngine(MdxEngine):
+    """Execute MDX queries with SQL queries on database cubes (see :mod:`rolap_execute`).
+
+    :param star_schema_query: sql query of the star schema (facts joined with dimensions)
+    :param star_schema_columns: star schema columns (without *_id* columns)
+    :param integer_columns: star schema integer columns
+    """
+
+    star_schema_query: str = field(default=None)
+    star_schema_columns: list = field(factory=list)
+    integer_columns: list = field(factory=list)
+
+    def load_cube(
+        self, cube_name, fact_table_name="Facts", sep=";", measures=None, **kwargs
+    ):
+        """Load dimension tables of a database cube, facts stay in the database.
+
+        :param cube_name: cube (database) name
+        :param fact_table_name:  facts table name, Default **Facts**
+        :param sep: not used, there is no csv file
+        :param measures: if you want to explicitly specify measures
+        """
+        self.cube = cube_name
+        self.facts = fact_table_name
+        # load cubes names
+        self.get_cubes_names()  # necessary, it fills csv_files_cubes and db_cubes
+        if self.cube not in self.db_cubes:
+            raise ValueError(f"{cube_name} is not a database cube")
+        if "postgres" in get_dialect_name(str(self.sqla_engine)):
+            self.facts = self.facts.lower()
+
+        # kept to execute queries
+        self.cube_loader = CubeLoaderDB(
+            self.sqla_engine,
+            workers=self.load_workers,
+            chunk_size=self.db_chunk_size,
+            join_pushdown=True,
+        )
+        inspector = inspect(self.sqla_engine)
+        tables_columns = {
+            table_name: self.cube_loader.get_table_columns(table_name, inspector)
+            for table_name in self.cube_loader.get_tables_names()
+        }
+        facts_name = next(
+            table_name
+            for table_name in tables_columns
+            if table_name.lower() == self.facts.lower()
+        )
+        dimensions = [
+            table_name for table_name in tables_columns if table_name != facts_name
+        ]
+
+        def _load_dimension(table_name):
+            return self.cube_loader.read_table(
+                table_name,
+                [
+                    column["name"]
+                    for column in tables_columns[table_name]
+                    if column["name"].lower()[-3:] != "_id"
+                ],
+            )
+
+        dimensions_tables = dict(
+            zip(dimensions, self.cube_loader.map_tables(_load_dimension, dimensions))
+        )
+        # facts table is never loaded, only its columns are known
+        self.tables_loaded = {
+            (self.facts if table_name == facts_name else table_name): (
+                pd.DataFrame(
+                    columns=[
+                        column["name"]
+                        for column in tables_columns[facts_name]
+                        if column["name"].lower()[-3:] != "_id"
+                    ]
+                )
+                if table_name == facts_name
+                else dimensions_tables[table_name]
+            )
+            for table_name in tables_columns
+        }
+
+        if measures:
+            self.measures = measures
+        else:
+            # like MdxEngine.get_measures, with database types instead of DataFrame ones
+            self.measures = [
+                column["name"]
+                for column in tables_columns[facts_name]
+                if self.is_measure_name(column["name"])
+                and isinstance(column["type"], (sqltypes.Integer, sqltypes.Numeric))
+            ]
+        if self.measures:
+            # default measure is the first one
+            self.selected_measures = [self.measures[0]]
+
+        self.star_schema_query = self.cube_loader.get_star_schema_query(self.facts)
+        self.star_schema_columns = [
+            column
+            for column in self.cube_loader.read_query(
+                f"SELECT * FROM ({self.star_schema_query}) star WHERE 1 = 0"
+            ).columns
+            if column.lower()[-3:] != "_id"
+        ]
+        # like star schema columns, the first table which has the column wins
+        columns_types = {}
+        for table_name in [facts_name] + dimensions:
+            for column in tables_columns[table_name]:
+                columns_types.setdefault(column["name"], column["type"])
+        self.integer_columns = [
+            column
+            for column in self.star_schema_columns
+            if isinstance(columns_types.get(column), sqltypes.Integer)
+        ]
+
+        self.members_index = MembersIndex.from_tables(self.tables_loaded, facts=self.facts)
+
+    def get_aggregate(self, tuples):
+        """The whole star schema, as sql chunk.
+
+        :param tuples: list of tuples (without measures)
+        :return: list with one :class:`SqlChunk`
+        """
+        return [SqlChunk(columns=list(self.star_schema_columns))]
+
+    def tuples_to_dataframes(self, tuples_on_mdx_query, columns_to_keep, dataframe=None):
+        """Same as :func:`MdxEngine.tuples_to_dataframes`, with sql chunks.
+
+        :param tuples_on_mdx_query: list of string of tuples.
+        :param columns_to_keep: (useful for executing many tuples, for instance execute_mdx).
+        :param dataframe: list of sql chunks to filter, Default the whole star schema
+        :return: list of :class:`SqlChunk`
+        """
+        if dataframe is None:
+            dataframe = self.get_aggregate(tuples_on_mdx_query)
+        return MdxEngine.tuples_to_dataframes(
+            self,
+            [
+                PositionedTuple(tupl, position)
+                for position, tupl in enumerate(tuples_on_mdx_query)
+            ],
+            columns_to_keep,
+            dataframe=dataframe,
+        )
+
+    def nested_tuples_to_dataframes(self, columns_to_keep):
+        """Same as :func:`MdxEngine.nested_tuples_to_dataframes`, with sql chunks.
+
+        :param columns_to_keep: :func:`columns_to_keep`
+        :return: list of :class:`SqlChunk`, one per nested select
+        """
+        # chunks of a nested select are ordered after the previous ones
+        return [
+            evolve(chunk, order=[idx] + chunk.order)
+            for idx, chunk in enumerate(
+                MdxEngine.nested_tuples_to_dataframes(self, columns_to_keep)
+            )
+        ]
+
+    def execute_sibling_tuples(self, siblings, dataframe_in, columns_to_keep):
+        """Filter sql chunks with tuples which only differ by their last member, like
+        :func:`MdxEngine.execute_sibling_tuples`: members of the same level are filtered
+        with one *IN* condition, so there is one chunk for all tuples instead of one per
+        tuple.
+
+        :param siblings: list of tuples
+        :param dataframe_in: list of sql chunks to filter
+        :param columns_to_keep: :func:`columns_to_keep`
+        :return: list of :class:`SqlChunk`
+        """
+        siblings_level = None
+        if len(siblings) > 1:
+            siblings_level = self._get_siblings_level(
+                siblings, self.star_schema_columns
+            )
+
+        if siblings_level is None:
+            chunks = []
+            for tupl in siblings:
+                self.update_columns_to_keep(tupl, columns_to_keep)
+                chunks.extend(
+                    self.execute_one_tuple(tupl, dataframe_in, columns_to_keep.values())
+                )
+            return chunks
+
+        column, members = siblings_level
+        if column not in self.star_schema_columns:
+            raise KeyError(column)
+        for tupl in siblings:
+            # sibling tuples have the same length, so they keep the same columns
+            self.update_columns_to_keep(tupl, columns_to_keep)
+        # common members (all but the last one)
+        conditions = self._get_tuple_conditions(siblings[0][:-1])
+        conditions.append((column, members))
+        order = (
+            column,
+            {member: tupl.position for member, tupl in zip(members, siblings)},
+        )
+        return self._filter_chunks(
+            dataframe_in, conditions, columns_to_keep.values(), order
+        )
+
+    def execute_one_tuple(self, tuple_as_list, dataframe_in, columns_to_keep):
+        """Filter sql chunks with one tuple, like :func:`MdxEngine.execute_one_tuple`
+        filters a DataFrame.
+
+        :param tuple_as_list: tuple as list
+        :param dataframe_in: list of sql chunks to filter
+        :param columns_to_keep: (useful for executing many tuples, for instance execute_mdx)
+            other columns to keep in the execution except the current tuple
+        :return: list of :class:`SqlChunk`, one per chunk which can contain tuple rows
+        """
+        return self._filter_chunks(
+            dataframe_in,
+            self._get_tuple_conditions(tuple_as_list),
+            columns_to_keep,
+            getattr(tuple_as_list, "position", 0),
+        )
+
+    def _get_tuple_conditions(self, tuple_as_list):
+        """Sql conditions of the members of a tuple.
+
+        :param tuple_as_list: tuple as list
+        :return: list of (column, member), member None for level names
+        """
+        conditions = []
+        for tup_att in tuple_as_list[2:]:
+            # 2010 must be as int, like with MdxEngine
+            if tup_att.isdigit():
+                tup_att = int(tup_att)
+
+            if tup_att in self.star_schema_columns:
+                conditions.append((tup_att, None))
+            else:
+                column_from_value = self._get_member_level(tuple_as_list[0], tup_att)
+                if column_from_value not in self.star_schema_columns:
+                    # like df[column_from_value] with MdxEngine
+                    raise KeyError(column_from_value)
+                conditions.append((column_from_value, tup_att))
+        return conditions
+
+    @staticmethod
+    def _filter_chunks(dataframe_in, conditions, columns_to_keep, order):
+        """Add tuple conditions to sql chunks.
+
+        :param dataframe_in: list of sql chunks to filter
+        :param conditions: :func:`_get_tuple_conditions`
+        :param columns_to_keep: columns to keep in the execution
+        :param order: position of the tuple (see :class:`SqlChunk`)
+        :return: list of :class:`SqlChunk`, one per chunk which can contain tuple rows
+        """
+        cols = list(itertools.chain.from_iterable(columns_to_keep))
+        chunks = []
+        for chunk in dataframe_in:
+            # columns filled with -1 are never empty, and never equal to a member
+            if any(
+                member is not None and column not in chunk.columns
+                for column, member in conditions
+            ):
+                continue
+            chunks.append(
+                SqlChunk(
+                    conditions=chunk.conditions
+                    + [
+                        (column, member)
+                        for column, member in conditions
+                        if column in chunk.columns
+                    ],
+                    columns=[col for col in cols if col in chunk.columns],
+                    order=[order] + chunk.order,
+                )
+            )
+        return chunks
+
+    def fusion_dataframes(self, df_to_fusion):
+        """Sql chunks are united by the query of :func:`group_measures`.
+
+        :param df_to_fusion: list of :class:`SqlChunk`
+        :return: list of :class:`SqlChunk`
+        """
+        return list(df_to_fusion)
+
+    def _quote(self, name):
+        return self.sqla_engine.dialect.identifier_preparer.quote(str(name))
+
+    def get_query(self, chunks, columns):
+        """Build the sql query which sums selected measures of chunks by columns.
+
+        :param chunks: list of :class:`SqlChunk`
+        :param columns: columns to group by
+        :return: (sql query, bound parameters)
+        """
+        params = {}
+
+        def _param(member):
+            param = f"member_{len(params)}"
+            params[param] = member
+            return f":{param}"
+
+        # tuples order of chunks, compared like tuples (see group_measures)
+        order_columns = [
+            f"rolap_order_{idx}"
+            for idx in range(max(len(chunk.order) for chunk in chunks))
+        ]
+        branches = []
+        for chunk in chunks:
+            selected = [
+                "{} AS {}".format(
+                    f"star.{self._quote(col)}" if col in chunk.columns else "NULL",
+                    self._quote(col),
+                )
+                for col in columns
+            ]
+            selected += [
+                f"star.{self._quote(measure)} AS {self._quote(measure)}"
+                for measure in self.selected_measures
+            ]
+            for order_column, position in itertools.zip_longest(
+                order_columns, chunk.order, fillvalue=0
+            ):
+                if isinstance(position, tuple):
+                    column, positions = position
+                    position = "CASE star.{} {} END".format(
+                        self._quote(column),
+                        " ".join(
+                            f"WHEN {_param(member)} THEN {member_position}"
+                            for member, member_position in positions.items()
+                        ),
+                    )
+                selected.append(f"{position} AS {order_column}")
+
+            conditions = []
+            for column, member in chunk.conditions:
+                if member is None:
+                    conditions.append(f"star.{self._quote(column)} IS NOT NULL")
+                elif isinstance(member, list):
+                    conditions.append(
+                        "star.{} IN ({})".format(
+                            self._quote(column), ", ".join(map(_param, member))
+                        )
+                    )
+                else:
+                    conditions.append(f"star.{self._quote(column)} = {_param(member)}")
+            # like pandas group-by, rows with empty grouped columns are ignored
+            conditions += [
+                f"star.{self._quote(col)} IS NOT NULL"
+                for col in columns
+                if col in chunk.columns
+            ]
+
+            branch = "SELECT {} FROM star".format(", ".join(selected))
+            if conditions:
+                branch += " WHERE " + " AND ".join(dict.fromkeys(conditions))
+            branches.append(branch)
+
+        grouped_columns = ", ".join(
+            [self._quote(col) for col in columns] + order_columns
+        )
+        query = "WITH star AS ({}) SELECT {}, {} FROM ({}) rolap GROUP BY {}".format(
+            self.star_schema_query,
+            grouped_columns,
+            ", ".join(
+                f"SUM({self._quote(measure)}) AS {self._quote(measure)}"
+                for measure in self.selected_measures
+            ),
+            " UNION ALL ".join(branches),
+            grouped_columns,
+        )
+        return query, params
+
+    def group_measures(self, df, columns, sort):
+        """Sum selected measures of sql chunks by columns, with one sql query.
+
+        :param df: list of :class:`SqlChunk`
+        :param columns: columns to group by
+        :param sort: sort groups by columns values, or keep them in tuples order
+        :return: DataFrame with columns as index and selected measures as columns
+        """
+        order_columns = []
+        if df:
+            result = self.cube_loader.read_query(*self.get_query(df, columns))
+            order_columns = [col for col in result if col.startswith("rolap_order_")]
+        else:
+            result = pd.DataFrame(columns=columns + self.selected_measures)
+
+        for col in columns:
+            values = result[col].fillna(-1)
+            if col in self.integer_columns:
+                values = values.astype("int64")
+            result[col] = values
+        result[self.selected_measures] = result[self.selected_measures].fillna(0)
+        if not sort and order_columns:
+            # first chunk of every group, in tuples order
+            result = result.sort_values(order_columns, kind="stable")
+        # a group can come from many chunks, pandas sums them and sorts groups (or not)
+        # like MdxEngine
+        return result.groupby(columns, sort=sort).sum()[self.selected_measures]
+
+    def sum_measures(self):
+        """Sum selected measures over the whole cube (query without tuples).
+
+        :return: DataFrame with one row
+        """
+        result = self.cube_loader.read_query(
+            "SELECT {} FROM ({}) star".format(
+                ", ".join(
+                    f"SUM(star.{self._quote(measure)}) AS {self._quote(measure)}"
+                    for measure in self.selected_measures
+                ),
+                self.star_schema_query,
+            )
+        )
+        return result.fillna(0).iloc[0].to_frame().T
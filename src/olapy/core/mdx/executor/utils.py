@@ -7,7 +7,7 @@ them injects these Df to OlaPy.
 
 import pandas as pd
 import pyodide
-from olapy.core.services.xmla_lib import get_response
+from olapy.core.services.xmla_lib import PreparedCube, get_response
 
 xmla_request_params = {'cube': 'sales','request_type': 'DISCOVER_PROPERTIES','properties': {},
           'restrictions': {'PropertyName': 'ServerName'},'mdx_query': None}
@@ -19,12 +19,18 @@ dataframes = {'Facts' : pd.read_csv(pyodide.open_url("olapy-data/cubes/sales/Fac
 
 # get_response uses the patch
 get_response(xmla_request_params=xmla_request_params,dataframes=dataframes, output='xmla') # or output='dict'
+
+# many requests with the same DataFrames (cleaned and merged once)
+cube = PreparedCube(dataframes, output='xmla')
+cube.get_response(xmla_request_params)
 """
 
 
 import numpy as np
 from pandas.errors import MergeError
 
+from .members_index import MembersIndex
+
 
 def _clean(dataframes):
     """remove *_id columns.
@@ -47,7 +53,8 @@ def _get_measures(dataframes, mdx_engine):
     # col.lower()[-2:] != 'id' to ignore any id column
     facts_df = dataframes[mdx_engine.facts]
     not_id_columns = [column for column in facts_df.columns if "id" not in column]
-    cleaned_facts = mdx_engine.clean_data(facts_df, not_id_columns)
+    # clean_data changes the DataFrame, the injected one is left as it is
+    cleaned_facts = mdx_engine.clean_data(facts_df.copy(), not_id_columns)
     return [
         col
         for col in cleaned_facts.select_dtypes(include=[np.number]).columns
@@ -76,7 +83,8 @@ def _get_star_schema_dataframe(dataframes, mdx_engine):
 def inject_dataframes(
     mdx_engine, dataframes, facts_table_name="Facts", cube_name="sales"
 ):
-    mdx_engine.csv_files_cubes.append(cube_name)
+    if cube_name not in mdx_engine.csv_files_cubes:
+        mdx_engine.csv_files_cubes.append(cube_name)
 
     mdx_engine.cube = cube_name
     mdx_engine.facts = facts_table_name
@@ -96,3 +104,9 @@ def inject_dataframes(
         mdx_engine.star_schema_dataframe = _get_star_schema_dataframe(
             dataframes, mdx_engine
         )
+    if mdx_engine.categorical_levels:
+        mdx_engine.encode_categorical_levels()
+    mdx_engine.members_index = MembersIndex.from_tables(
+        mdx_engine.tables_loaded, facts=mdx_engine.facts
+    )
+    mdx_engine.aggregates = mdx_engine.build_aggregates()
@@ -0,0 +1,535 @@
+"""Tokenizer and syntax tree of the MDX subset used by OlaPy.
+
+Supported statement::
+
+    SELECT [NON EMPTY] <set> [DIMENSION PROPERTIES ...] ON COLUMNS | ROWS | <number>, ...
+    FROM [cube]
+    [WHERE <tuple>]
+    [CELL PROPERTIES ...]
+
+where sets are made of ``{...}`` sets, ``(...)`` tuples, ``[a].[b].[c]`` members (with
+``.Members``, ``.Children`` ... suffixes), function calls (``Hierarchize(...)``,
+``DrilldownMember(...)`` ...), ``:`` ranges and ``*`` crossjoins.
+
+Parsed queries are cached (see :func:`parse_query`), so every query text is tokenized and
+parsed only once, even if the executor and the xmla handlers need it many times.
+
+usage::
+
+    query = parse_query("SELECT {[Measures].[Amount]} ON COLUMNS FROM [sales]")
+    query.axes_tuples("columns")  # (('Measures', 'Amount'),)
+"""
+
+from functools import lru_cache
+
+import regex
+from attrs import evolve, field, frozen
+
+TOKENS_REGEX = regex.compile(
+    r"""
+    (?P<space>\s+|--[^\n]*|//[^\n]*|/\*.*?\*/)
+    |(?P<bracket>\[(?:[^\]]|\]\])*\])
+    |(?P<key>&\[(?:[^\]]|\]\])*\])
+    |(?P<string>'(?:[^']|'')*'|"(?:[^"]|"")*")
+    |(?P<number>\d+(?:\.\d+)?)
+    |(?P<word>[^\W\d]\w*)
+    |(?P<punct>[{}(),.*:+\-/<>=;^])
+    """,
+    regex.VERBOSE | regex.DOTALL,
+)
+
+# numeric axes, and axes names
+AXES_NAMES = {
+    "0": "columns",
+    "COLUMNS": "columns",
+    "ROWS": "rows",
+    "PAGES": "pages",
+    "SECTIONS": "sections",
+    "CHAPTERS": "chapters",
+}
+
+PARSE_CACHE_SIZE = 256
+
+
+class MdxSyntaxError(SyntaxError):
+    """The query is not valid MDX, or uses MDX the parser doesn't know."""
+
+
+@frozen
+class Token:
+    """Query token.
+
+    :param kind: space, bracket, key, string, number, word or punct
+    :param value: token text
+    :param start: token position in the query
+    """
+
+    kind: str
+    value: str
+    start: int
+
+    @property
+    def end(self):
+        return self.start + len(self.value)
+
+    def is_word(self, *words):
+        return self.kind == "word" and self.value.upper() in words
+
+
+def tokenize(query):
+    """Split a query into tokens, spaces and comments are skipped.
+
+    :param query: MDX query
+    :return: list of :class:`Token`
+    """
+    tokens = []
+    position = 0
+    while position < len(query):
+        match = TOKENS_REGEX.match(query, position)
+        if match is None:
+            raise MdxSyntaxError(
+                f"Unexpected character {query[position]!r} at position {position}"
+            )
+        if match.lastgroup != "space":
+            tokens.append(Token(match.lastgroup, match.group(), position))
+        position = match.end()
+    return tokens
+
+
+@frozen
+class Member:
+    """Member (or level, hierarchy...) expression like
+    ``[Geography].[Geography].[Continent].Members``.
+
+    :param parts: names between brackets, example ('Geography', 'Geography', 'Continent')
+    :param suffixes: words after names, example ('Members',)
+    """
+
+    parts: tuple
+    suffixes: tuple = ()
+
+
+@frozen
+class FunctionCall:
+    """Function call, like ``Hierarchize({...})``, or method call like
+    ``[Time].[Time].Lag(1)`` (the member is the first argument).
+
+    :param name: function name
+    :param args: arguments expressions (None for empty arguments)
+    """
+
+    name: str
+    args: tuple
+
+
+@frozen
+class Set:
+    """``{...}`` set.
+
+    :param items: set expressions
+    """
+
+    items: tuple
+
+
+@frozen
+class Tuple:
+    """``(...)`` tuple.
+
+    :param items: tuple expressions
+    """
+
+    items: tuple
+
+
+@frozen
+class Operation:
+    """Binary operation, like ``{...} * {...}`` crossjoin, or ``[a]:[b]`` range.
+
+    :param operator: operator
+    :param left: left expression
+    :param right: right expression
+    """
+
+    operator: str
+    left: object
+    right: object
+
+
+@frozen
+class Literal:
+    """Number, string or keyword (``INCLUDE_CALC_MEMBERS``, ``ASC``...).
+
+    :param value: literal text
+    """
+
+    value: str
+
+
+@frozen
+class NonEmpty:
+    """``NON EMPTY`` expression.
+
+    :param expression: filtered expression
+    """
+
+    expression: object
+
+
+@frozen
+class Axis:
+    """Query axis.
+
+    :param name: columns, rows ... or the axis number
+    :param expression: axis set
+    :param non_empty: NON EMPTY axis
+    :param dimension_properties: DIMENSION PROPERTIES names
+    """
+
+    name: str
+    expression: object
+    non_empty: bool = False
+    dimension_properties: tuple = ()
+
+
+@frozen
+class SelectStatement:
+    """Parsed SELECT query.
+
+    :param axes: tuple of :class:`Axis`
+    :param cube: cube name
+    :param where: slicer expression, or None
+    :param cell_properties: CELL PROPERTIES names
+    :param nested_selects: contents of innermost parentheses (query text)
+    :param tuples: :func:`axes_tuples` of all, columns, rows and where axes
+    :param hierarchized: one of the axes uses the Hierarchize function
+    """
+
+    axes: tuple
+    cube: str
+    where: object = None
+    cell_properties: tuple = ()
+    nested_selects: tuple = ()
+    tuples: dict = field(factory=dict)
+    hierarchized: bool = False
+
+    def axes_tuples(self, axis_name):
+        """Tuples of one axis, like :func:`olapy.core.mdx.parser.parse.Parser.get_tuples`.
+
+        :param axis_name: columns, rows, where or all
+        :return: tuple of tuples of names
+        """
+        if axis_name == "all":
+            expressions = [axis.expression for axis in self.axes] + [self.where]
+        elif axis_name == "where":
+            expressions = [self.where]
+        else:
+            expressions = [
+                axis.expression for axis in self.axes if axis.name == axis_name
+            ]
+        return tuple(
+            member_tuple
+            for expression in expressions
+            for member_tuple in _members_tuples(expression)
+        )
+
+
+def _walk(expression):
+    """Walk the expression tree (depth first, in query order)."""
+    if expression is None:
+        return
+    yield expression
+    if isinstance(expression, (Set, Tuple)):
+        children = expression.items
+    elif isinstance(expression, FunctionCall):
+        children = expression.args
+    elif isinstance(expression, Operation):
+        children = (expression.left, expression.right)
+    elif isinstance(expression, NonEmpty):
+        children = (expression.expression,)
+    else:
+        children = ()
+    for child in children:
+        yield from _walk(child)
+
+
+def _members_tuples(expression):
+    # like Parser.get_tuples, 'All' is removed from names, and single names are ignored
+    for node in _walk(expression):
+        if isinstance(node, Member) and len(node.parts) > 1:
+            yield tuple(
+                part.replace("All ", "")
+                for part in node.parts
+                if part.replace("All ", "")
+            )
+
+
+class MdxAstParser:
+    """Recursive descent parser of :mod:`mdx_ast` queries.
+
+    :param query: MDX query
+    """
+
+    def __init__(self, query):
+        self.query = query
+        self.tokens = tokenize(query)
+        self.position = 0
+        # (start, end) of parentheses contents, and if they contain other parentheses
+        self.parentheses = []
+
+    # tokens helpers
+
+    def peek(self, offset=0):
+        if self.position + offset < len(self.tokens):
+            return self.tokens[self.position + offset]
+        return None
+
+    def next(self):
+        token = self.peek()
+        if token is None:
+            raise MdxSyntaxError("Unexpected end of query")
+        self.position += 1
+        return token
+
+    def expect(self, value):
+        token = self.next()
+        if token.value.upper() != value:
+            raise MdxSyntaxError(
+                f"Expected {value!r} at position {token.start}, got {token.value!r}"
+            )
+        return token
+
+    def accept(self, value):
+        token = self.peek()
+        if token is not None and token.value.upper() == value:
+            self.position += 1
+            return token
+        return None
+
+    def accept_words(self, *words):
+        """Accept a sequence of keywords, like NON EMPTY."""
+        tokens = [self.peek(idx) for idx in range(len(words))]
+        if all(
+            token is not None and token.is_word(word)
+            for token, word in zip(tokens, words)
+        ):
+            self.position += len(words)
+            return True
+        return False
+
+    # statement
+
+    def parse(self):
+        """Parse the query.
+
+        :return: :class:`SelectStatement`
+        """
+        if self.peek() is not None and self.peek().is_word("WITH"):
+            raise MdxSyntaxError("Calculated members (WITH) are not supported")
+        self.expect("SELECT")
+        axes = []
+        if not self.peek_word("FROM"):
+            axes.append(self.parse_axis())
+            while self.accept(","):
+                axes.append(self.parse_axis())
+
+        self.expect("FROM")
+        cube = self.next()
+        if cube.kind == "bracket":
+            cube_name = _unbracket(cube.value)
+        elif cube.kind == "word":
+            cube_name = cube.value
+        else:
+            raise MdxSyntaxError("Subselects are not supported")
+
+        where = None
+        if self.accept_words("WHERE"):
+            where = self.parse_expression()
+
+        cell_properties = ()
+        if self.accept_words("CELL", "PROPERTIES"):
+            cell_properties = self.parse_names()
+
+        self.accept(";")
+        if self.peek() is not None:
+            raise MdxSyntaxError(
+                f"Unexpected {self.peek().value!r} at position {self.peek().start}"
+            )
+
+        statement = SelectStatement(
+            axes=tuple(axes),
+            cube=cube_name,
+            where=where,
+            cell_properties=cell_properties,
+            nested_selects=tuple(
+                self.query[start:end]
+                for start, end, nested in sorted(self.parentheses)
+                if not nested and self.query[start:end]
+            ),
+        )
+        return evolve(
+            statement,
+            tuples={
+                axis_name: statement.axes_tuples(axis_name)
+                for axis_name in ("all", "columns", "rows", "where")
+            },
+            hierarchized=any(
+                isinstance(node, FunctionCall) and node.name.upper() == "HIERARCHIZE"
+                for axis in axes
+                for node in _walk(axis.expression)
+            ),
+        )
+
+    def peek_word(self, *words):
+        token = self.peek()
+        return token is not None and token.is_word(*words)
+
+    def parse_axis(self):
+        non_empty = self.accept_words("NON", "EMPTY")
+        expression = self.parse_expression()
+        dimension_properties = ()
+        if self.accept_words("DIMENSION", "PROPERTIES"):
+            dimension_properties = self.parse_names()
+        self.expect("ON")
+        token = self.next()
+        if token.is_word("AXIS"):
+            self.expect("(")
+            token = self.next()
+            self.expect(")")
+        if token.kind not in ("word", "number"):
+            raise MdxSyntaxError(f"Unexpected axis {token.value!r}")
+        return Axis(
+            name=AXES_NAMES.get(token.value.upper(), token.value),
+            expression=expression,
+            non_empty=non_empty,
+            dimension_properties=dimension_properties,
+        )
+
+    def parse_names(self):
+        """Comma separated properties, like VALUE, FORMAT_STRING."""
+        names = [self.parse_property()]
+        while self.accept(","):
+            names.append(self.parse_property())
+        return tuple(names)
+
+    def parse_property(self):
+        token = self.next()
+        if token.kind == "word":
+            return token.value
+        if token.kind == "bracket":
+            names = [_unbracket(token.value)]
+            while self.accept("."):
+                names.append(_unbracket(self.next().value))
+            return ".".join(f"[{name}]" for name in names)
+        raise MdxSyntaxError(f"Unexpected property {token.value!r}")
+
+    # expressions
+
+    def parse_expression(self):
+        expression = self.parse_unary()
+        while self.peek() is not None and self.peek().value in ("*", "+", "-"):
+            operator = self.next().value
+            expression = Operation(operator, expression, self.parse_unary())
+        return expression
+
+    def parse_unary(self):
+        if self.accept_words("NON", "EMPTY"):
+            return NonEmpty(self.parse_unary())
+        if self.accept("-"):
+            return Operation("-", None, self.parse_unary())
+        expression = self.parse_postfix()
+        if self.accept(":"):
+            expression = Operation(":", expression, self.parse_postfix())
+        return expression
+
+    def parse_arguments(self, closing):
+        """Comma separated expressions, arguments may be empty (``f(a,,b)``)."""
+        args = []
+        if self.accept(closing):
+            return ()
+        while True:
+            if self.peek() is not None and self.peek().value in (",", closing):
+                args.append(None)
+            else:
+                args.append(self.parse_expression())
+            if self.accept(closing):
+                return tuple(args)
+            self.expect(",")
+
+    def parse_parenthesized(self, opening_token):
+        parentheses_idx = len(self.parentheses)
+        self.parentheses.append(None)
+        args = self.parse_arguments(")")
+        closing = self.tokens[self.position - 1]
+        # parentheses appended after this one are nested inside it
+        self.parentheses[parentheses_idx] = (
+            opening_token.end,
+            closing.start,
+            len(self.parentheses) > parentheses_idx + 1,
+        )
+        return args
+
+    def parse_primary(self):
+        token = self.next()
+        if token.value == "{":
+            return Set(self.parse_arguments("}"))
+        if token.value == "(":
+            return Tuple(self.parse_parenthesized(token))
+        if token.kind in ("bracket", "key"):
+            return Member((_unbracket(token.value),))
+        if token.kind == "word":
+            following = self.peek()
+            if following is not None and following.value == "(":
+                return FunctionCall(token.value, self.parse_parenthesized(self.next()))
+            return Literal(token.value)
+        if token.kind in ("number", "string"):
+            return Literal(token.value)
+        raise MdxSyntaxError(f"Unexpected {token.value!r} at position {token.start}")
+
+    def parse_postfix(self):
+        expression = self.parse_primary()
+        while self.accept("."):
+            token = self.next()
+            if token.kind in ("bracket", "key"):
+                if not isinstance(expression, Member) or expression.suffixes:
+                    raise MdxSyntaxError(
+                        f"Unexpected {token.value!r} at position {token.start}"
+                    )
+                expression = Member(
+                    expression.parts + (_unbracket(token.value),)
+                )
+            elif token.kind == "word":
+                following = self.peek()
+                if following is not None and following.value == "(":
+                    args = self.parse_parenthesized(self.next())
+                    expression = FunctionCall(token.value, (expression,) + args)
+                elif isinstance(expression, Member):
+                    expression = Member(
+                        expression.parts, expression.suffixes + (token.value,)
+                    )
+                else:
+                    expression = FunctionCall(token.value, (expression,))
+            else:
+                raise MdxSyntaxError(
+                    f"Unexpected {token.value!r} at position {token.start}"
+                )
+        return expression
+
+
+def _unbracket(name):
+    """[Europe] -> Europe, &[12] -> 12"""
+    return name.lstrip("&")[1:-1].replace("]]", "]")
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_query(query):
+    """Parse a query, parsed queries are cached by query text.
+
+    :param query: MDX query
+    :return: :class:`SelectStatement`, or None if the query is not valid, or uses MDX
+        the parser doesn't know
+    """
+    try:
+        return MdxAstParser(query).parse()
+    except MdxSyntaxError:
+        return None
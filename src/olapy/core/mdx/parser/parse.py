@@ -3,6 +3,8 @@
 
 import regex
 
+from .mdx_ast import AXES_NAMES, parse_query
+
 # flake8: noqa W605
 
 # FIXME: make this regex more readable (split it)
@@ -128,6 +130,24 @@ class Parser:
         except AttributeError:
             pass
 
+        statement = parse_query(query)
+        if statement is None:
+            # queries the syntax tree parser doesn't know
+            return self.decorticate_query_regex(query)
+
+        # parsed queries are cached, so return new lists
+        return {
+            axis: [list(tupl) for tupl in tuples]
+            for axis, tuples in statement.tuples.items()
+        }
+
+    def decorticate_query_regex(self, query):
+        """Same as :func:`decorticate_query`, but searching tuples with :data:`REGEX`
+        between axes keywords.
+
+        :param query: MDX Query
+        :return: dict of axis as key and tuples as value
+        """
         tuples_on_mdx_query = self.get_tuples(query)
         on_rows = []
         on_columns = []
@@ -223,12 +243,35 @@ class Parser:
 
         :return: All groups as list of strings.
         """
-        return regex.findall(r"\(([^()]+)\)", self.mdx_query)
+        statement = parse_query(self.mdx_query)
+        if statement is None:
+            return regex.findall(r"\(([^()]+)\)", self.mdx_query)
+        return list(statement.nested_selects)
 
     def hierarchized_tuples(self) -> bool:
         """Check if `hierarchized <https://docs.microsoft.com/en-
         us/sql/mdx/hierarchize-mdx>`_  mdx query.
 
+        Hierarchize is searched in the whole query (WHERE clause included), not only in
+        the axes of the syntax tree.
+
         :return: True | False
         """
         return "Hierarchize" in self.mdx_query
+
+    def non_empty_axes(self) -> list[str]:
+        """Axes of the mdx query with ``NON EMPTY``.
+
+        :return: list of axes names (columns, rows...)
+        """
+        statement = parse_query(self.mdx_query)
+        if statement is None:
+            return [
+                AXES_NAMES.get(axis.upper(), axis)
+                for axis in regex.findall(
+                    r"\bNON\s+EMPTY\b.*?\bON\s+(\w+)",
+                    self.mdx_query,
+                    regex.IGNORECASE | regex.DOTALL,
+                )
+            ]
+        return [axis.name for axis in statement.axes if axis.non_empty]
@@ -86,6 +86,11 @@ class ConfigParser:
                 - name: store_city
                 - name: store_country
                   column_new_name: country
+
+        aggregates:                          # optional, levels combinations to pre-aggregate
+            - [store_type, country]
+
+        load_workers: 4                      # optional, number of tables loaded concurrently
     """
 
     def __init__(self, cube_config_file=None):
@@ -166,4 +171,6 @@ class ConfigParser:
             "source": config["source"],
             "facts": self._get_facts(config),
             "dimensions": self._get_dimensions(config),
+            "aggregates": config.get("aggregates") or [],
+            "load_workers": config.get("load_workers"),
         }
@@ -119,3 +119,15 @@ def get_dialect_name(conn_string):
     dialect = dialect.replace("postgresql", "postgres")
 
     return dialect
+
+
+def is_memory_database(sqla_engine):
+    # type: (Engine) -> bool
+    """Check if the engine is an in-memory sqlite database, which lives in a single
+    connection and can't be queried from several threads."""
+    url = sqla_engine.url
+    return url.get_backend_name() == "sqlite" and url.database in (
+        None,
+        "",
+        ":memory:",
+    )
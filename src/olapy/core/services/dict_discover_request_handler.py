@@ -6,8 +6,10 @@ requests and responses.
 
 import os
 import uuid
+from typing import Optional
 
 from olapy.core.mdx.executor import MdxEngine
+from olapy.core.mdx.executor.cube_registry import CubeRegistry
 
 from ..services.xmla_discover_request_utils import (
     discover_literals_response_rows,
@@ -15,6 +17,14 @@ from ..services.xmla_discover_request_utils import (
 )
 from ..services.xmla_discover_xsds import discover_preperties_xsd
 
+# MDSCHEMA_MEMBERS TREE_OP restriction flags, members related to the restricted member
+MDTREEOP_CHILDREN = 0x01
+MDTREEOP_SIBLINGS = 0x02
+MDTREEOP_PARENT = 0x04
+MDTREEOP_SELF = 0x08
+MDTREEOP_DESCENDANTS = 0x10
+MDTREEOP_ANCESTORS = 0x20
+
 # noinspection PyPep8Naming
 
 
@@ -27,14 +37,17 @@ class DictDiscoverReqHandler:
     the parameters passed to it.
     """
 
-    def __init__(self, mdx_engine):
-        # type: (MdxEngine) -> None
+    def __init__(self, mdx_engine, cube_registry=None):
+        # type: (MdxEngine, Optional[CubeRegistry]) -> None
         """
 
         :param mdx_engine: mdx_engine engine instance
+        :param cube_registry: CubeRegistry keeping loaded cubes, if None, mdx_engine
+            loads the cube again when requests use another cube
 
         """
         self.executor = mdx_engine
+        self.cube_registry = cube_registry
         if self.executor.sqla_engine:
             # save sqla uri so we can change it with new database
             self.sql_alchemy_uri = str(self.executor.sqla_engine.url)
@@ -50,17 +63,145 @@ class DictDiscoverReqHandler:
         :return: new instance of MdxEngine with new star_schema_DataFrame and other variables
         """
         if self.selected_cube != new_cube:
-            if (
-                self.executor.cube_config
-                and new_cube == self.executor.cube_config["name"]
-            ):
-                facts = self.executor.cube_config["facts"]["table_name"]
-            else:
-                facts = "Facts"
-
             self.selected_cube = new_cube
-            if self.executor.cube != new_cube:
-                self.executor.load_cube(new_cube, fact_table_name=facts)
+            self.executor = self.get_cube_engine(new_cube)
+
+    def _get_facts_table(self, cube_name):
+        if self.executor.cube_config and cube_name == self.executor.cube_config["name"]:
+            return self.executor.cube_config["facts"]["table_name"]
+        return "Facts"
+
+    def get_cube_engine(self, cube_name):
+        """Engine with a cube loaded, from the cube registry if there is one, else
+        :attr:`executor` (which loads the cube if it has another one).
+
+        :param cube_name: cube name
+        :return: MdxEngine
+        """
+        facts = self._get_facts_table(cube_name)
+        if self.cube_registry is not None:
+            return self.cube_registry.get(cube_name, fact_table_name=facts)
+        if self.executor.cube != cube_name:
+            self.executor.load_cube(cube_name, fact_table_name=facts)
+        return self.executor
+
+    def load_request_cube(self, request):
+        """Load the cube of a request (its Catalog) in the cube registry, before the
+        request is handled.
+
+        Requests are handled one at a time (they change the handler selected cube),
+        loading their cube first lets the cube be loaded while other requests are
+        handled. Without cube registry, the cube is loaded by the request handling.
+
+        :param request: :class:`DiscoverRequest` or :class:`ExecuteRequest`
+        """
+        properties = request.Properties and request.Properties.PropertyList
+        catalog = properties.Catalog if properties else None
+        if self.cube_registry is not None and catalog in self.cubes:
+            self.get_cube_engine(catalog)
+
+    def get_loaded_cube_engine(self, cube_name):
+        """Engine of a cube if it is loaded (the cube is not loaded otherwise).
+
+        :param cube_name: cube name
+        :return: MdxEngine, or None
+        """
+        if self.cube_registry is not None:
+            return self.cube_registry.get_loaded(cube_name)
+        if self.executor.cube == cube_name:
+            return self.executor
+        return None
+
+    def get_level_cardinality(self, dimension, column):
+        """Number of members of a level, from the cube members index.
+
+        :param dimension: dimension name
+        :param column: level column
+        :return: cardinality as string
+        """
+        if self.executor.members_index is None:
+            return "0"
+        return str(self.executor.members_index.level_cardinality(dimension, column))
+
+    def _member_row(self, dimension, path):
+        """MDSCHEMA_MEMBERS row of a member of the cube members index.
+
+        :param dimension: dimension name
+        :param path: member path (members names from the first level)
+        :return: dict
+        """
+        index = self.executor.members_index
+        columns = index.columns[dimension]
+        hierarchy = "[{0}].[{0}]".format(dimension)
+
+        def unique_name(member_path):
+            return "{}.[{}].{}".format(
+                hierarchy,
+                columns[len(member_path) - 1],
+                ".".join("[" + name + "]" for name in member_path),
+            )
+
+        row = {
+            "CATALOG_NAME": self.selected_cube,
+            "CUBE_NAME": self.selected_cube,
+            "DIMENSION_UNIQUE_NAME": "[" + dimension + "]",
+            "HIERARCHY_UNIQUE_NAME": hierarchy,
+            "LEVEL_UNIQUE_NAME": "{}.[{}]".format(hierarchy, columns[len(path) - 1]),
+            "LEVEL_NUMBER": str(len(path) - 1),
+            "MEMBER_ORDINAL": "0",
+            "MEMBER_NAME": path[-1],
+            "MEMBER_UNIQUE_NAME": unique_name(path),
+            "MEMBER_TYPE": "1",
+            "MEMBER_CAPTION": path[-1],
+            "CHILDREN_CARDINALITY": str(len(index.get_children(dimension, path))),
+            "PARENT_LEVEL": str(max(len(path) - 2, 0)),
+            "PARENT_COUNT": "1" if len(path) > 1 else "0",
+        }
+        if len(path) > 1:
+            row["PARENT_UNIQUE_NAME"] = unique_name(path[:-1])
+        row.update(
+            {
+                "MEMBER_KEY": path[-1],
+                "IS_PLACEHOLDERMEMBER": "false",
+                "IS_DATAMEMBER": "false",
+            }
+        )
+        return row
+
+    def get_tree_members_rows(self, member_unique_name, tree_op):
+        """MDSCHEMA_MEMBERS rows of the members related to a member (TREE_OP
+        restriction), from the cube members index, without scanning tables.
+
+        :param member_unique_name: member unique name, for instance
+            [Geography].[Geography].[Country].[Europe].[France]
+        :param tree_op: MDTREEOP_* flags
+        :return: list of rows (dicts), empty if the member doesn't exist
+        """
+        index = self.executor.members_index
+        names = self.executor.parser.split_tuple(member_unique_name)
+        dimension = names[0]
+        path = index.member_path(dimension, names[2:]) if index is not None else None
+        if path is None:
+            return []
+
+        paths = []
+        if tree_op & MDTREEOP_ANCESTORS:
+            paths += [path[:depth] for depth in range(1, len(path))]
+        elif tree_op & MDTREEOP_PARENT and len(path) > 1:
+            paths.append(path[:-1])
+        if tree_op & MDTREEOP_SELF:
+            paths.append(path)
+        if tree_op & MDTREEOP_SIBLINGS:
+            paths += [
+                sibling
+                for sibling in index.get_children(dimension, path[:-1])
+                if sibling != path
+            ]
+        if tree_op & MDTREEOP_DESCENDANTS:
+            paths += index.get_descendants(dimension, path)
+        elif tree_op & MDTREEOP_CHILDREN:
+            paths += index.get_children(dimension, path)
+        return [self._member_row(dimension, member_path) for member_path in paths]
 
     @staticmethod
     def discover_datasources_response():
@@ -610,7 +751,9 @@ class DictDiscoverReqHandler:
                             ),
                             "LEVEL_CAPTION": str(col),
                             "LEVEL_NUMBER": str(l_nb),
-                            "LEVEL_CARDINALITY": "0",
+                            "LEVEL_CARDINALITY": self.get_level_cardinality(
+                                tables, col
+                            ),
                             "LEVEL_TYPE": "0",
                             "CUSTOM_ROLLUP_SETTINGS": "0",
                             "LEVEL_UNIQUE_SETTINGS": "0",
@@ -790,3 +933,15 @@ class DictDiscoverReqHandler:
                 "IS_PLACEHOLDERMEMBER": "false",
                 "IS_DATAMEMBER": "false",
             }
+
+        if (
+            request.Restrictions.RestrictionList.CUBE_NAME == self.selected_cube
+            and request.Properties.PropertyList.Catalog is not None
+            and request.Restrictions.RestrictionList.TREE_OP
+            and request.Restrictions.RestrictionList.MEMBER_UNIQUE_NAME
+        ):
+            self.change_cube(request.Properties.PropertyList.Catalog)
+            return self.get_tree_members_rows(
+                request.Restrictions.RestrictionList.MEMBER_UNIQUE_NAME,
+                request.Restrictions.RestrictionList.TREE_OP,
+            )
@@ -6,7 +6,11 @@ import itertools
 import re
 from collections import OrderedDict
 
+import numpy as np
+import pandas as pd
+
 from ..mdx.parser.parse import REGEX
+from .query_plan import QueryPlan
 
 
 class DictExecuteReqHandler:
@@ -22,12 +26,30 @@ class DictExecuteReqHandler:
         :param convert2formulas: mdx queries with  `excel convert formulas \
             <https://exceljet.net/excel-functions/excel-convert-function>`_,
         """
-        self.executor = executor
+        self.mdx_engine = executor
+        self.context = None
         self.execute_mdx_query(mdx_query, convert2formulas)
 
+    def request_handler(self, mdx_engine=None):
+        """New handler, to handle one request while other requests are handled.
+
+        It executes queries with a copy of the engine (see
+        :func:`MdxEngine.query_executor`), so the cube of its queries doesn't change
+        if another request changes the engine cube.
+
+        :param mdx_engine: engine of the request cube, Default the handler engine
+        :return: handler of the same class
+        """
+        mdx_engine = mdx_engine if mdx_engine is not None else self.mdx_engine
+        return self.__class__(mdx_engine.query_executor())
+
     def execute_mdx_query(self, mdx_query, convert2formulas=False):
         """Use the MdxEngine instance to execute the provided mdx query.
 
+        The engine is not changed (see :func:`MdxEngine.execute`), :attr:`context` keeps
+        the query state, and :attr:`executor` is the engine which executed the query (its
+        parser and selected measures are the ones of the query).
+
         :param mdx_query: the mdx query
         :param convert2formulas: convert2formulas True or False
         :return:
@@ -35,16 +57,119 @@ class DictExecuteReqHandler:
 
         self.mdx_query = mdx_query
         self.convert2formulas = convert2formulas
+        # queries without measures use the measures of the previous query
+        selected_measures = self.context.selected_measures if self.context else None
+        self.context = None
         if self.convert2formulas:
             self.mdx_execution_result = self._execute_convert_formulas_query(mdx_query)
         elif mdx_query:
-            self.mdx_execution_result = self.executor.execute_mdx(self.mdx_query)
+            self.context = self.mdx_engine.execute(self.mdx_query, selected_measures)
+            self.mdx_execution_result = self.context.execution_result
         else:
             self.mdx_execution_result = None
+        self.executor = self.context.executor if self.context else self.mdx_engine
+        non_empty_axes = self.executor.parser.non_empty_axes() if self.context else []
+        if non_empty_axes:
+            self.mdx_execution_result = self._drop_empty_tuples(
+                self.mdx_execution_result, non_empty_axes
+            )
         if isinstance(self.mdx_execution_result, dict):
             self.columns_desc = self.mdx_execution_result.get("columns_desc")
         else:
             self.columns_desc = None
+        # parse state of this request, used by all generate_* functions
+        self.query_plan = QueryPlan.from_handler(self)
+
+    def _drop_empty_tuples(self, execution_result, non_empty_axes):
+        """Remove the empty tuples of NON EMPTY axes.
+
+        The result only has the tuples of the facts (group by), so only tuples with
+        empty (NaN) measures remain to be removed: tuples of a NON EMPTY dimensions axis
+        whose cells are all empty (whatever the tuples of the other axes), and the
+        measures of a NON EMPTY measures axis whose cells are all empty. Axes and cells
+        are generated from the remaining ones.
+
+        :param execution_result: :func:`MdxEngine.execute_mdx` result
+        :param non_empty_axes: NON EMPTY axes names (see :func:`Parser.non_empty_axes`)
+        :return: execution result without empty tuples (the execution result itself is
+            not changed, it can be cached)
+        """
+        result = execution_result.get("result") if execution_result else None
+        if not isinstance(result, pd.DataFrame) or result.empty:
+            return execution_result
+        columns_desc = execution_result["columns_desc"]
+        empty_cells = result.isna().to_numpy()
+        keep_rows = np.ones(len(result), dtype=bool)
+        keep_measures = np.ones(result.shape[1], dtype=bool)
+        for axis in non_empty_axes:
+            tables = columns_desc.get(axis) or {}
+            if self.executor.facts in tables:
+                keep_measures &= ~empty_cells.all(axis=0)
+            if set(tables) - {self.executor.facts}:
+                keep_rows &= ~self._empty_axis_tuples(
+                    result, empty_cells, columns_desc, axis
+                )
+        if keep_rows.all() and keep_measures.all():
+            return execution_result
+
+        if not keep_measures.all():
+            measures = set(result.columns[keep_measures])
+            columns_desc = OrderedDict(
+                (
+                    axis,
+                    OrderedDict(
+                        (
+                            table,
+                            [column for column in columns if column in measures]
+                            if table == self.executor.facts
+                            else columns,
+                        )
+                        for table, columns in tables.items()
+                    ),
+                )
+                for axis, tables in columns_desc.items()
+            )
+            # measures tuples of the query axes
+            self.executor.selected_measures = [
+                measure
+                for measure in self.executor.selected_measures
+                if measure in measures
+            ]
+        return dict(
+            execution_result,
+            result=result.iloc[keep_rows, keep_measures],
+            columns_desc=columns_desc,
+        )
+
+    def _empty_axis_tuples(self, result, empty_cells, columns_desc, axis):
+        """Result rows of the empty tuples of an axis (all the cells of the axis tuple
+        are empty, for all tuples of other axes).
+
+        :param result: execution result DataFrame
+        :param empty_cells: result empty values mask
+        :param columns_desc: execution result columns_desc
+        :param axis: dimensions axis name
+        :return: numpy boolean array, True for rows of empty tuples
+        """
+        empty_rows = empty_cells.all(axis=1)
+        levels = [name for name in result.index.names if name is not None]
+        other_axes_levels = {
+            column
+            for other_axis in ("columns", "rows")
+            if other_axis != axis
+            for table, columns in (columns_desc.get(other_axis) or {}).items()
+            if table != self.executor.facts
+            for column in columns
+        }
+        axis_levels = [level for level in levels if level not in other_axes_levels]
+        if not axis_levels or len(axis_levels) == len(levels):
+            # the axis tuples are the result rows
+            return empty_rows
+        groups = [result.index.get_level_values(level) for level in axis_levels]
+        axis_empty_rows = (
+            pd.Series(empty_rows).groupby(groups, dropna=False).transform("all")
+        )
+        return axis_empty_rows.to_numpy(dtype=bool)
 
     def _execute_convert_formulas_query(self, mdx_query):
         """convert Mdx Query to `excel formulas <https://exceljet.net/excel-
@@ -95,7 +220,7 @@ class DictExecuteReqHandler:
         xml["LName"] = "[Measures]"
         xml["LNum"] = "0"
         xml["DisplayInfo"] = "0"
-        if "HIERARCHY_UNIQUE_NAME" in self.mdx_query:
+        if self.query_plan.measures_hierarchy_unique_name:
             xml["HIERARCHY_UNIQUE_NAME"] = "[Measures]"
 
     def _gen_xs0_parent(self, xml, tuple, split_df, first_att):
@@ -129,14 +254,14 @@ class DictExecuteReqHandler:
             xml["LNum"] = str(len(tuple_without_minus_1) - first_att)
             xml["DisplayInfo"] = "131076"
 
-            if "PARENT_UNIQUE_NAME" in self.mdx_query.upper():
+            if self.query_plan.parent_unique_name:
                 self._gen_xs0_parent(
                     xml,
                     tuple=tuple_without_minus_1,
                     split_df=split_df,
                     first_att=first_att,
                 )
-            if "HIERARCHY_UNIQUE_NAME" in self.mdx_query.upper():
+            if self.query_plan.hierarchy_unique_name:
                 xml["HIERARCHY_UNIQUE_NAME"] = "[{0}].[{0}]".format(
                     tuple_without_minus_1[0]
                 )
@@ -155,7 +280,7 @@ class DictExecuteReqHandler:
 
             self._gen_xs0_tuples(tupl, tupls, split_df=split_df, first_att=first_att)
             # Hierarchize'
-            if not self.executor.parser.hierarchized_tuples():
+            if not self.query_plan.hierarchized:
                 self._gen_measures_xs0(tupl, tupls)
             all_axis["Tuples"] += tupl
         return all_axis
@@ -189,10 +314,8 @@ class DictExecuteReqHandler:
 
     def generate_xs0_one_axis(self, split_df, mdx_query_axis="all", axis="Axis0"):
         # patch 4 select (...) (...) (...) from bla bla bla
-        if self.executor.check_nested_select():
-            return self._gen_xs0_grouped_tuples(
-                axis, self.executor.parser.get_nested_select()
-            )
+        if self.query_plan.nested_select:
+            return self._gen_xs0_grouped_tuples(axis, self.query_plan.nested_select)
 
         all_axis = {"Axis": {"name": axis}, "Tuples": []}
 
@@ -440,7 +563,7 @@ class DictExecuteReqHandler:
                         self.executor.facts in self.columns_desc["all"]
                         and (len(self.columns_desc["all"][self.executor.facts]) > 1)
                         or (
-                            not self.executor.parser.hierarchized_tuples()
+                            not self.query_plan.hierarchized
                             and not self.columns_desc["where"]
                         )
                     ):
@@ -481,12 +604,12 @@ class DictExecuteReqHandler:
             "DisplayInfo": {"name": "[Measures].[DISPLAY_INFO]", "type": "unsignedInt"},
         }
 
-        if "PARENT_UNIQUE_NAME" in self.mdx_query:
+        if self.query_plan.measures_parent_unique_name:
             axes_info["PARENT_UNIQUE_NAME"] = {
                 "name": "[Measures].[PARENT_UNIQUE_NAME]",
                 "type": "string",
             }
-        if "HIERARCHY_UNIQUE_NAME" in self.mdx_query:
+        if self.query_plan.measures_hierarchy_unique_name:
             axes_info["HIERARCHY_UNIQUE_NAME"] = {
                 "name": "[Measures].[HIERARCHY_UNIQUE_NAME]",
                 "type": "xs:string",
@@ -521,7 +644,7 @@ class DictExecuteReqHandler:
                 },
             }
 
-            if "Hierarchize" in self.mdx_query:
+            if self.query_plan.hierarchized:
                 axe_info["PARENT_UNIQUE_NAME"] = {
                     "name": "[{0}].[{0}].[PARENT_UNIQUE_NAME]".format(table_name),
                     "type": "string",
@@ -585,7 +708,7 @@ class DictExecuteReqHandler:
             axes_info += self._generate_table_axis_info(None, axis_tables_without_facts)
             # Hierarchize
             if (
-                not self.executor.parser.hierarchized_tuples()
+                not self.query_plan.hierarchized
                 and len(self.columns_desc["columns"].get(self.executor.facts, [1, 1]))
                 == 1
             ):
@@ -726,7 +849,9 @@ class DictExecuteReqHandler:
         if self.convert2formulas:
             return self._generate_axes_convert2formulas()
 
-        dfs = self.split_dataframe()
+        if self.query_plan.split_df is None:
+            self.query_plan.split_df = self.split_dataframe()
+        dfs = self.query_plan.split_df
         if self.columns_desc["rows"] and self.columns_desc["columns"]:
             return """
             {}
@@ -947,7 +1072,7 @@ class DictExecuteReqHandler:
 
             # Hierarchize
             if len(self.executor.selected_measures) <= 1 and (
-                self.executor.parser.hierarchized_tuples()
+                self.query_plan.hierarchized
                 or self.executor.facts in self.columns_desc["where"]
             ):
                 all_axis["Tuples"] += {
@@ -0,0 +1,8 @@
+"""Managing `DISCOVER` requests of :func:`xmla_lib.get_response` with ``numpy``
+output, they have the dict responses (schemas rowsets have no cells)."""
+
+from .dict_discover_request_handler import DictDiscoverReqHandler
+
+
+class NumpyDiscoverReqHandler(DictDiscoverReqHandler):
+    """Discover requests handler used with :class:`NumpyExecuteReqHandler`."""
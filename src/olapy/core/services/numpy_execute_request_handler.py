@@ -0,0 +1,77 @@
+"""Managing `EXECUTE` requests with NumPy arrays responses, for in-process consumers
+(notebooks, web front ends...) working with arrays: the dict handler writes one Python
+object by cell, they convert back to arrays."""
+
+import numpy as np
+
+from .dict_execute_request_handler import DictExecuteReqHandler
+
+
+class NumpyExecuteReqHandler(DictExecuteReqHandler):
+    """DictExecuteReqHandler with the query result tuples and cells as NumPy arrays,
+    in place of the xs0 tuples and the cells list::
+
+        response = get_response(xmla_request_params, dataframes, output="numpy")
+        response["cell_data"]  # 2D array of the cells values
+        response["tuples"]  # {"continent": array([...]), "country": array([...])}
+    """
+
+    def _horizontal_cells(self):
+        """:return: True if the cells of a measure are written one after another"""
+        return (
+            len(self.columns_desc["columns"].keys()) == 0
+            or len(self.columns_desc["rows"].keys()) == 0
+        ) and self.executor.facts in self.columns_desc["all"].keys()
+
+    def generate_cell_data(self):
+        """Cells values, as a 2D array whose flattened values (``ravel()``) are in
+        CellOrdinal order, the cells of :class:`DictExecuteReqHandler`.
+
+        Rows are the result tuples (see :func:`generate_tuples`) and columns the
+        measures, or the transposed array (measures rows) when the query has one axis
+        with measures. The array is a view of the result DataFrame values if all
+        measures have the same type (no copy).
+
+        :return: numpy array
+        """
+        if self.convert2formulas:
+            return np.array(self._generate_cells_data_convert2formulas(), dtype=object)
+
+        values = self.mdx_execution_result["result"].to_numpy()
+        if self._horizontal_cells():
+            return values.T
+        return values
+
+    def generate_tuples(self):
+        """Members of the result tuples, one array by level, with one member by row of
+        :func:`generate_cell_data` (-1 if the tuple has no member at this level).
+
+        :return: dict of level name -> numpy array
+        """
+        if self.convert2formulas:
+            return {}
+        index = self.mdx_execution_result["result"].index
+        return {
+            name: index.get_level_values(name).to_numpy()
+            for name in index.names
+            if name is not None
+        }
+
+    def generate_response(self):
+        if self.convert2formulas:
+            return super().generate_response()
+
+        return {
+            "cell_info": self.generate_cell_info(),
+            "axes_info": self.generate_axes_info(),
+            "axes_info_slicer": self.generate_axes_info_slicer(),
+            "axes": {
+                axis: list(tables.keys())
+                for axis, tables in self.columns_desc.items()
+                if axis != "all"
+            },
+            "tuples": self.generate_tuples(),
+            "measures": np.array(self.mdx_execution_result["result"].columns),
+            "slicer_axis": self.generate_slicer_axis(),
+            "cell_data": self.generate_cell_data(),
+        }
@@ -0,0 +1,89 @@
+"""Parse state of one Execute request, shared by all response generators."""
+
+from typing import Optional
+
+from attrs import define, field
+
+
+@define
+class QueryPlan:
+    """Everything response generators need to know about the executed query, computed
+    once per request (instead of parsing / searching the query for every axis member).
+
+    :param mdx_query: executed mdx query
+    :param convert2formulas: excel convert formulas query
+    :param columns_desc: execute_mdx columns_desc (dimensions and columns used by axes)
+    :param query_axes: tuples by axis (see :func:`MdxParser.decorticate_query`)
+    :param hierarchized: Hierarchize query
+    :param non_empty_axes: NON EMPTY axes names (see :func:`MdxParser.non_empty_axes`)
+    :param nested_select: tuples groups of queries like *select (...) (...) (...)*, or None
+    :param parent_unique_name: PARENT_UNIQUE_NAME property requested (in any case), for
+        dimensions members
+    :param hierarchy_unique_name: HIERARCHY_UNIQUE_NAME property requested (in any case),
+        for dimensions members
+    :param measures_parent_unique_name: PARENT_UNIQUE_NAME property requested (upper
+        case), for measures members and axis info
+    :param measures_hierarchy_unique_name: HIERARCHY_UNIQUE_NAME property requested
+        (upper case), for measures members and axis info
+    :param split_df: execution result split by dimension (see
+        :func:`DictExecuteReqHandler.split_dataframe`), split by the first generate_xs0
+    :param used_levels: dict of dimension: levels of the dimension used in the query
+    :param known_levels: dict of dimension: True if all used_levels are dimension columns
+    """
+
+    mdx_query: Optional[str] = None
+    convert2formulas: bool = False
+    columns_desc: Optional[dict] = None
+    query_axes: dict = field(factory=dict)
+    hierarchized: bool = False
+    non_empty_axes: list = field(factory=list)
+    nested_select: Optional[list] = None
+    parent_unique_name: bool = False
+    hierarchy_unique_name: bool = False
+    measures_parent_unique_name: bool = False
+    measures_hierarchy_unique_name: bool = False
+    split_df: Optional[dict] = None
+    used_levels: dict = field(factory=dict)
+    known_levels: dict = field(factory=dict)
+
+    @classmethod
+    def from_handler(cls, handler):
+        """Query plan of the query executed by an execute request handler.
+
+        :param handler: :class:`DictExecuteReqHandler` (after execute_mdx_query)
+        :return: QueryPlan
+        """
+        mdx_query = handler.mdx_query or ""
+        if isinstance(mdx_query, bytes):
+            mdx_query = mdx_query.decode("utf-8")
+        upper_query = mdx_query.upper()
+        plan = cls(
+            mdx_query=mdx_query,
+            convert2formulas=handler.convert2formulas,
+            columns_desc=handler.columns_desc,
+            parent_unique_name="PARENT_UNIQUE_NAME" in upper_query,
+            hierarchy_unique_name="HIERARCHY_UNIQUE_NAME" in upper_query,
+            measures_parent_unique_name="PARENT_UNIQUE_NAME" in mdx_query,
+            measures_hierarchy_unique_name="HIERARCHY_UNIQUE_NAME" in mdx_query,
+        )
+        if handler.columns_desc is None:
+            # convert2formulas or empty queries
+            return plan
+
+        parser = handler.executor.parser
+        # parser.mdx_query is the (cleaned) executed query, already parsed by execute_mdx
+        plan.query_axes = parser.decorticate_query(parser.mdx_query)
+        plan.hierarchized = parser.hierarchized_tuples()
+        plan.non_empty_axes = parser.non_empty_axes()
+        if handler.executor.check_nested_select():
+            plan.nested_select = parser.get_nested_select()
+        for tupl in plan.query_axes["all"]:
+            if tupl[0].upper() != "MEASURES" and len(tupl) > 2:
+                plan.used_levels.setdefault(tupl[0], []).append(tupl[2])
+        tables_loaded = handler.executor.tables_loaded or {}
+        plan.known_levels = {
+            dimension: dimension in tables_loaded
+            and all(level in tables_loaded[dimension].columns for level in levels)
+            for dimension, levels in plan.used_levels.items()
+        }
+        return plan
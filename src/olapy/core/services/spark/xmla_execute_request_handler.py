@@ -351,7 +351,7 @@ class SparkXmlaExecuteReqHandler(XmlaExecuteReqHandler):
 
                         # Hierarchize
                         if len(self.executor.selected_measures) <= 1 and (
-                            self.executor.parser.hierarchized_tuples()
+                            self.query_plan.hierarchized
                             or self.executor.facts in self.columns_desc["where"]
                         ):
                             with xml.Member(Hierarchy="[Measures]"):
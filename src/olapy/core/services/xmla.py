@@ -8,6 +8,8 @@ import imp
 import logging
 import os
 import sys
+import threading
+from contextlib import nullcontext
 from os.path import expanduser, isfile
 from wsgiref.simple_server import make_server
 
@@ -21,12 +23,17 @@ from spyne.server.wsgi import WsgiApplication
 from sqlalchemy import create_engine
 
 from ..mdx.executor import MdxEngine
+from ..mdx.executor.cube_registry import CubeRegistry
 from ..mdx.executor.lite_execute import MdxEngineLite
+from ..mdx.executor.rolap_execute import RolapMdxEngine
 from ..mdx.tools.config_file_parser import ConfigParser
 from ..mdx.tools.olapy_config_file_parser import DbConfigParser
 from ..services.models import DiscoverRequest, ExecuteRequest, Session
 from . import XmlaDiscoverReqHandler, XmlaExecuteReqHandler
 from .xmla_lib import XmlaProviderLib
+from .xmla_preload import CubePreloader, ReadinessMiddleware, read_preload_options
+from .xmla_server import make_threaded_server
+from .xmla_streaming import CELL_DATA_ENVIRON_KEY, CellDataStreamingMiddleware
 
 # unicode_literals This is heavily discouraged with click
 
@@ -90,13 +97,11 @@ class XmlaProviderService(ServiceBase, XmlaProviderLib):
                 fault_string="You do not have permission to access this resource"
             )
 
-        method_name = request.RequestType.lower() + "_response"
-        method = getattr(discover_request_hanlder, method_name)
-
-        if request.RequestType == "DISCOVER_DATASOURCES":
-            return method()
-
-        return method(request)
+        # cubes are loaded outside of the lock with a cube registry
+        discover_request_hanlder.load_request_cube(request)
+        # discover requests can change the executor cube
+        with ctx.app.config.get("engine_lock", nullcontext()):
+            return discover_request_hanlder.discover_response(request)
 
     # Execute function must take 2 arguments (JUST 2!): Command and Properties.
     # We encapsulate them in ExecuteRequest object.
@@ -128,18 +133,36 @@ class XmlaProviderService(ServiceBase, XmlaProviderLib):
         else:
             convert2formulas = False
 
-        # change (or load cube) if direct execute handler without discover
-        # handler (which normally load the cube first)
-        if (
-            request.Properties
-            and request.Properties.PropertyList.Catalog
-            and not execute_request_hanlder.executor.cube
-        ):
-            execute_request_hanlder.executor.load_cube(
-                request.Properties.PropertyList.Catalog
+        catalog = request.Properties and request.Properties.PropertyList.Catalog
+        discover_request_hanlder = ctx.app.config["discover_request_hanlder"]
+        if discover_request_hanlder.cube_registry is not None:
+            # engine of the request cube, loaded cubes are kept, and the cube is loaded
+            # without lock (it doesn't block requests of other cubes)
+            if catalog:
+                mdx_engine = discover_request_hanlder.get_cube_engine(catalog)
+            else:
+                mdx_engine = discover_request_hanlder.executor
+            execute_request_hanlder = execute_request_hanlder.request_handler(
+                mdx_engine
             )
+        else:
+            with ctx.app.config.get("engine_lock", nullcontext()):
+                # change (or load cube) if direct execute handler without discover
+                # handler (which normally load the cube first)
+                if catalog and not execute_request_hanlder.mdx_engine.cube:
+                    execute_request_hanlder.mdx_engine.load_cube(catalog)
+                # the query is executed and its response generated by a handler of
+                # this request, without lock (the engine is copied while no discover
+                # request changes its cube)
+                execute_request_hanlder = execute_request_hanlder.request_handler()
 
         execute_request_hanlder.execute_mdx_query(mdx_query, convert2formulas)
+
+        # with CellDataStreamingMiddleware, cells are sent after the response skeleton
+        cell_data = getattr(ctx.transport, "req_env", {}).get(CELL_DATA_ENVIRON_KEY)
+        if cell_data is not None and execute_request_hanlder.mdx_query:
+            cell_data.append(execute_request_hanlder.iter_cell_data())
+            return execute_request_hanlder.generate_response(stream_cell_data=True)
         return execute_request_hanlder.generate_response()
 
 
@@ -155,6 +178,10 @@ def get_mdx_engine(
     direct_table_or_file,
     columns,
     measures,
+    cube_snapshots=False,
+    load_workers=1,
+    db_join_pushdown=False,
+    rolap=False,
 ):
     sqla_engine = None
     if sql_alchemy_uri:
@@ -172,11 +199,16 @@ def get_mdx_engine(
         )
         executor.load_cube(table_or_file=direct_table_or_file)
     else:
-        executor = MdxEngine(
+        # with rolap, queries are executed by the database
+        engine_class = RolapMdxEngine if rolap else MdxEngine
+        executor = engine_class(
             olapy_data_location=olapy_data,
             source_type=source_type,
             cube_config=cube_config,
             sqla_engine=sqla_engine,
+            cube_snapshots=cube_snapshots,
+            load_workers=load_workers,
+            db_join_pushdown=db_join_pushdown,
         )
     return executor
 
@@ -193,23 +225,45 @@ def get_spyne_app(discover_request_hanlder, execute_request_hanlder):
         config={
             "discover_request_hanlder": discover_request_hanlder,
             "execute_request_hanlder": execute_request_hanlder,
+            # discover requests (which can change the engine cube) are handled one
+            # after another, execute requests use their own handler
+            "engine_lock": threading.RLock(),
         },
     )
 
 
-def get_wsgi_application(mdx_engine):
+def get_wsgi_application(
+    mdx_engine, cubes_memory=0, preload_cubes=(), warmup_queries=()
+):
     """
     :param mdx_engine: MdxEngine instance
+    :param cubes_memory: memory (MB) of cubes kept loaded by a CubeRegistry, 0 to
+        load cubes again when requests change the cube
+    :param preload_cubes: cubes loaded in the background (``["all"]`` for all cubes)
+    :param warmup_queries: mdx queries executed in the background, once cubes are
+        loaded
     :return: Wsgi Application
     """
-    discover_request_hanlder = XmlaDiscoverReqHandler(mdx_engine)
+    cube_registry = None
+    if cubes_memory and not isinstance(mdx_engine, MdxEngineLite):
+        cube_registry = CubeRegistry(mdx_engine, max_memory=cubes_memory * 1024 ** 2)
+    discover_request_hanlder = XmlaDiscoverReqHandler(mdx_engine, cube_registry)
     execute_request_hanlder = XmlaExecuteReqHandler(mdx_engine)
     application = get_spyne_app(discover_request_hanlder, execute_request_hanlder)
+    preloader = CubePreloader(
+        discover_request_hanlder,
+        preload_cubes,
+        warmup_queries,
+        engine_lock=application.config["engine_lock"],
+    )
+    preloader.start()
 
     # validator='soft' or nothing, this is important because spyne doesn't
     # support encodingStyle until now !!!!
 
-    return WsgiApplication(application)
+    return CellDataStreamingMiddleware(
+        ReadinessMiddleware(WsgiApplication(application), preloader)
+    )
 
 
 @click.command()
@@ -277,6 +331,79 @@ def get_wsgi_application(mdx_engine):
     default=None,
     help="To explicitly specify measures if (construct cube from a single file)",
 )
+@click.option(
+    "--cube_snapshots",
+    "-cs",
+    is_flag=True,
+    default=False,
+    help="Save loaded csv cubes in binary snapshots, to load them faster next time",
+)
+@click.option(
+    "--load_workers",
+    "-lw",
+    default=1,
+    help="Number of tables loaded concurrently when loading a cube, DEFAULT : 1",
+)
+@click.option(
+    "--db_join_pushdown",
+    "-jp",
+    is_flag=True,
+    default=False,
+    help="Let the database join the star schema of database cubes",
+)
+@click.option(
+    "--rolap",
+    "-rl",
+    is_flag=True,
+    default=False,
+    help="Keep database cubes data in the database, and execute queries with sql queries",
+)
+@click.option(
+    "--workers",
+    "-w",
+    default=1,
+    help="Number of threads serving requests (with keep-alive connections), "
+    "DEFAULT : 1 (single threaded wsgiref server)",
+)
+@click.option(
+    "--request_timeout",
+    "-rt",
+    default=60,
+    help="Seconds before closing slow connections (with workers), DEFAULT : 60",
+)
+@click.option(
+    "--keep_alive_timeout",
+    "-kt",
+    default=15,
+    help="Seconds before closing idle connections (with workers), DEFAULT : 15",
+)
+@click.option(
+    "--cubes_memory",
+    "-cm",
+    default=0,
+    help="Memory (MB) of cubes kept loaded, least recently used cubes are unloaded "
+    "beyond it, DEFAULT : 0 (one cube loaded, loaded again when requests change it)",
+)
+@click.option(
+    "--preload",
+    "-pl",
+    default=None,
+    help="Cubes loaded at server start (in the background), comma separated, or all",
+)
+@click.option(
+    "--warmup_queries",
+    "-wq",
+    default=None,
+    help="File of mdx queries (separated by empty lines) executed at server start, "
+    "once cubes are loaded",
+)
+@click.option(
+    "--warmup_log",
+    "-wl",
+    default=None,
+    help="Log file of a previous xmla server, its most frequent queries are executed "
+    "at server start",
+)
 def runserver(
     host,
     port,
@@ -290,6 +417,17 @@ def runserver(
     direct_table_or_file,
     columns,
     measures,
+    cube_snapshots,
+    load_workers,
+    db_join_pushdown,
+    rolap,
+    workers,
+    request_timeout,
+    keep_alive_timeout,
+    cubes_memory,
+    preload,
+    warmup_queries,
+    warmup_log,
 ):
     """Start the xmla server."""
     try:
@@ -322,9 +460,13 @@ def runserver(
         direct_table_or_file=direct_table_or_file,
         columns=columns,
         measures=measures,
+        cube_snapshots=cube_snapshots,
+        load_workers=load_workers,
+        db_join_pushdown=db_join_pushdown,
+        rolap=rolap,
     )
 
-    wsgi_application = get_wsgi_application(mdx_engine)
+    preload_cubes, queries = read_preload_options(preload, warmup_queries, warmup_log)
 
     # log to the console
     # logging.basicConfig(level=logging.DEBUG")
@@ -337,7 +479,23 @@ def runserver(
     else:
         logging.basicConfig(level=logging.DEBUG)
     logging.getLogger("spyne.protocol.xml").setLevel(logging.DEBUG)
+    wsgi_application = get_wsgi_application(
+        mdx_engine,
+        cubes_memory=cubes_memory,
+        preload_cubes=preload_cubes,
+        warmup_queries=queries,
+    )
     logging.info("listening to http://127.0.0.1:8000/xmla")
     logging.info("wsdl is at: http://localhost:8000/xmla?wsdl")
-    server = make_server(host, port, wsgi_application)
+    if workers > 1:
+        server = make_threaded_server(
+            host,
+            port,
+            wsgi_application,
+            workers=workers,
+            request_timeout=request_timeout,
+            keep_alive_timeout=keep_alive_timeout,
+        )
+    else:
+        server = make_server(host, port, wsgi_application)
     server.serve_forever()
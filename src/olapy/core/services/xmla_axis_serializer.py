@@ -0,0 +1,250 @@
+"""Fast serialization of Execute responses axes (Axis0, Axis1).
+
+:func:`XmlaExecuteReqHandler.tuples_2_xs0` writes every axis member with xmlwitch, one
+tuple after another, which is slower than the query execution itself for big axes.
+:func:`serialize_axis` builds the same xml (byte for byte), but column by column: members
+names, captions and levels are computed for whole columns of the split DataFrames, then
+every tuple is written from precomputed templates.
+"""
+
+from xml.sax.saxutils import escape, quoteattr
+
+import numpy as np
+
+# xmlwitch indentation, Axis > Tuples > Tuple > Member > UName ...
+_TUPLES, _TUPLE, _MEMBER, _MEMBER_CHILD = ("\n" + "  " * level for level in range(1, 5))
+
+
+def _element(name, content):
+    """Member child element, like xmlwitch (escaped content, empty elements closed)."""
+    content = escape(content)
+    if content:
+        return f"{_MEMBER_CHILD}<{name}>{content}</{name}>"
+    return f"{_MEMBER_CHILD}<{name} />"
+
+
+def _elements(name, contents):
+    """Same as :func:`_element` for an array of (escaped) contents."""
+    return np.where(
+        contents == "",
+        f"{_MEMBER_CHILD}<{name} />",
+        f"{_MEMBER_CHILD}<{name}>" + contents + f"</{name}>",
+    )
+
+
+def _measures_member(measure, hierarchy_unique_name):
+    """Same as :func:`XmlaExecuteReqHandler._gen_measures_xs0`."""
+    return "".join(
+        [
+            f'{_MEMBER}<Member Hierarchy="[Measures]">',
+            _element("UName", f"[Measures].[{measure}]"),
+            _element("Caption", f"{measure}"),
+            _element("LName", "[Measures]"),
+            _element("LNum", "0"),
+            _element("DisplayInfo", "0"),
+            _element("HIERARCHY_UNIQUE_NAME", "[Measures]")
+            if hierarchy_unique_name
+            else "",
+            f"{_MEMBER}</Member>",
+        ]
+    )
+
+
+def _measures_members(values, hierarchy_unique_name):
+    """:func:`_measures_member` of every value of an array (computed once by value)."""
+    members = {}
+    for value in values:
+        # 1 and 1.0 are the same key, but not the same caption
+        key = (type(value), value)
+        if key not in members:
+            members[key] = _measures_member(value, hierarchy_unique_name)
+    return np.array(
+        [members[(type(value), value)] for value in values], dtype=object
+    )
+
+
+class _DimensionMembers:
+    """Members of one dimension for all result rows (see :func:`serialize_axis`).
+
+    :param dimension: dimension name
+    :param df: split DataFrame of the dimension (one column by level)
+    :param prefix: values before levels values in legacy tuples (dimension, measure)
+    """
+
+    def __init__(self, dimension, df, prefix):
+        self.dimension = dimension
+        self.columns = [df[column].tolist() for column in df.columns]
+        self.levels = list(df.columns)
+        self.values = np.empty((len(df), len(self.columns)), dtype=object)
+        for idx, column in enumerate(self.columns):
+            self.values[:, idx] = column
+        self.prefix = prefix
+        self.depths = self._get_depths()
+
+    def _get_depths(self):
+        """Number of levels of every member, like
+        :func:`DictExecuteReqHandler.get_tuple_without_nan` (-1 values are removed, up to
+        the first occurrence of the last value).
+
+        :return: array of levels numbers, or None if some tuples are not members
+        """
+        rows = np.arange(len(self.values))
+        not_empty = self.values != -1
+        if not not_empty.any(axis=1).all():
+            # tuples without members
+            return None
+        last_idx = self.values.shape[1] - 1 - np.argmax(not_empty[:, ::-1], axis=1)
+        last_values = self.values[rows, last_idx]
+        if any(
+            (last_values == prefix_value).any() for prefix_value in set(self.prefix)
+        ):
+            return None
+        equal = self.values == last_values[:, np.newaxis]
+        first_idx = np.where(
+            equal[rows, last_idx], np.argmax(equal, axis=1), last_idx
+        )
+        return first_idx + 1
+
+    def xml(self, known_levels, parent_unique_name, hierarchy_unique_name):
+        """Member elements of all rows.
+
+        :return: array of xml strings
+        """
+        rows = np.arange(len(self.values))
+        escaped = np.empty(self.values.shape, dtype=object)
+        for idx, column in enumerate(self.columns):
+            escaped[:, idx] = list(map(escape, map(str, column)))
+        # [Europe].[France].[Paris]
+        paths = np.empty(self.values.shape, dtype=object)
+        paths[:, 0] = "[" + escaped[:, 0] + "]"
+        for idx in range(1, paths.shape[1]):
+            paths[:, idx] = paths[:, idx - 1] + ".[" + escaped[:, idx] + "]"
+
+        level_idx = self.depths - 1
+        levels = np.array([escape(str(level)) for level in self.levels], dtype=object)
+        dimension = escape("[{0}].[{0}]".format(self.dimension))
+        if known_levels:
+            unames = f"{dimension}.[" + levels[level_idx] + "]." + paths[rows, level_idx]
+        else:
+            unames = f"{dimension}." + paths[rows, level_idx]
+
+        members = (
+            f"{_MEMBER}<Member Hierarchy={quoteattr('[{0}].[{0}]'.format(self.dimension))}>"
+            + _elements("UName", unames)
+            + _elements("Caption", escaped[rows, level_idx])
+            + _elements("LName", f"{dimension}.[" + levels[level_idx] + "]")
+            + np.array(
+                [_element("LNum", str(idx)) for idx in range(len(levels))], dtype=object
+            )[level_idx]
+            + _element("DisplayInfo", "131076")
+        )
+        if parent_unique_name:
+            parents = np.where(
+                level_idx > 0, "." + paths[rows, np.maximum(level_idx - 1, 0)], ""
+            )
+            members = members + _elements(
+                "PARENT_UNIQUE_NAME", f"{dimension}.[{levels[0]}]" + parents
+            )
+        if hierarchy_unique_name:
+            members = members + _element("HIERARCHY_UNIQUE_NAME", dimension)
+        return members + f"{_MEMBER}</Member>"
+
+
+def serialize_axis(
+    axis,
+    dimensions,
+    measures,
+    selected_measures=None,
+    many_measures=False,
+    hierarchized=False,
+    parent_unique_name=False,
+    hierarchy_unique_name=False,
+    measures_hierarchy_unique_name=False,
+    known_levels=None,
+):
+    """Axis element of an Execute response, the same as
+    :func:`XmlaExecuteReqHandler.tuples_2_xs0`.
+
+    :param axis: Axis0 | Axis1
+    :param dimensions: list of (dimension name, split DataFrame) of axis dimensions
+    :param measures: all cube measures
+    :param selected_measures: one tuple by row and measure if selected measures are in the
+        axis tuples, else None
+    :param many_measures: more than one selected measure
+    :param hierarchized: Hierarchize query
+    :param parent_unique_name: PARENT_UNIQUE_NAME property requested
+    :param hierarchy_unique_name: HIERARCHY_UNIQUE_NAME property requested, for
+        dimensions members
+    :param measures_hierarchy_unique_name: HIERARCHY_UNIQUE_NAME property requested, for
+        measures members
+    :param known_levels: dict of dimension: True if used levels are dimension columns
+    :return: Axis xml as string, or None if the axis can't be serialized column by
+        column (tuples_2_xs0 must be used)
+    """
+    if not dimensions or any(len(df.columns) == 0 for _, df in dimensions):
+        return None
+    known_levels = known_levels or {}
+    blocks_measures = selected_measures if selected_measures is not None else [None]
+
+    dimensions_members = []
+    for dimension, df in dimensions:
+        prefix = [dimension] + [
+            measure for measure in blocks_measures if measure is not None
+        ]
+        dimension_members = _DimensionMembers(dimension, df, prefix)
+        if dimension_members.depths is None:
+            return None
+        dimensions_members.append(dimension_members)
+
+    members = dimensions_members[0].xml(
+        known_levels.get(dimensions[0][0], True),
+        parent_unique_name,
+        hierarchy_unique_name,
+    )
+    for dimension_members in dimensions_members[1:]:
+        members = members + dimension_members.xml(
+            known_levels.get(dimension_members.dimension, True),
+            parent_unique_name,
+            hierarchy_unique_name,
+        )
+
+    first_dimension = dimensions_members[0]
+    last_values = first_dimension.values[:, -1]
+    blocks = []
+    for measure in blocks_measures:
+        # the second value of tuples: measure, or first level value of the first dimension
+        if measure is None:
+            tuples_measures = first_dimension.values[:, 0]
+        else:
+            tuples_measures = np.full(len(last_values), measure, dtype=object)
+        tuples = members
+        if not hierarchized:
+            tuples = tuples + _measures_members(
+                tuples_measures, measures_hierarchy_unique_name
+            )
+        if many_measures:
+            with_measure = np.array(
+                [value in measures for value in tuples_measures], dtype=bool
+            )
+            measures_members = _measures_members(
+                tuples_measures, measures_hierarchy_unique_name
+            )
+            only_measure = with_measure & np.array(
+                [value in measures for value in last_values], dtype=bool
+            )
+            tuples = np.where(
+                only_measure,
+                measures_members,
+                np.where(with_measure, measures_members + tuples, tuples),
+            )
+        blocks.append(f"{_TUPLE}<Tuple>" + tuples + f"{_TUPLE}</Tuple>")
+
+    return "".join(
+        [
+            f"<Axis name={quoteattr(axis)}>",
+            f"{_TUPLES}<Tuples>",
+            *("".join(block) for block in blocks),
+            f"{_TUPLES}</Tuples>",
+            "\n</Axis>",
+        ]
+    )
@@ -7,6 +7,7 @@ import os
 from urllib.parse import urlparse
 
 import xmlwitch
+from spyne.model.complex import ComplexModelBase
 
 from ..services.dict_discover_request_handler import DictDiscoverReqHandler
 from ..services.xmla_discover_request_utils import (
@@ -40,6 +41,37 @@ try:
 except ImportError:
     pass
 
+# responses which only depend on the request and its cube (and the selected cube), kept
+# in the cube engine discover_cache
+CACHED_RESPONSES = frozenset(
+    [
+        "DBSCHEMA_TABLES",
+        "MDSCHEMA_CUBES",
+        "MDSCHEMA_DIMENSIONS",
+        "MDSCHEMA_HIERARCHIES",
+        "MDSCHEMA_KPIS",
+        "MDSCHEMA_LEVELS",
+        "MDSCHEMA_MEASUREGROUP_DIMENSIONS",
+        "MDSCHEMA_MEASUREGROUPS",
+        "MDSCHEMA_MEASURES",
+        "MDSCHEMA_MEMBERS",
+        "MDSCHEMA_PROPERTIES",
+        "MDSCHEMA_SETS",
+    ]
+)
+
+
+def _request_key(value):
+    """Hashable key of request values (restrictions, properties)."""
+    if isinstance(value, ComplexModelBase):
+        return tuple(
+            (name, _request_key(item)) for name, item in sorted(value.as_dict().items())
+        )
+    if isinstance(value, (list, tuple)):
+        return tuple(_request_key(item) for item in value)
+    return value
+
+
 # noinspection PyPep8Naming
 
 
@@ -59,30 +91,68 @@ class XmlaDiscoverReqHandler(DictDiscoverReqHandler):
         parse_uri = urlparse(old_sqla_uri)
         return parse_uri.scheme + "://" + parse_uri.netloc + "/" + new_db
 
-    def change_cube(self, new_cube):
-        """If you change the cube in any request, we have to instantiate the
-        MdxEngine with the new cube.
+    def get_cube_engine(self, cube_name):
+        """Engine with a cube loaded, from the cube registry if there is one, else
+        :attr:`executor` (which loads the cube if it has another one).
 
-        :param new_cube: cube name
-        :return: new instance of MdxEngine with new star_schema_DataFrame and other variables
+        With a database source, cubes are databases, the engine connects to the cube
+        database.
+
+        :param cube_name: cube name
+        :return: MdxEngine
         """
-        if self.selected_cube != new_cube:
-            if (
-                self.executor.cube_config
-                and new_cube == self.executor.cube_config["name"]
-            ):
-                facts = self.executor.cube_config["facts"]["table_name"]
-            else:
-                facts = "Facts"
-
-            self.selected_cube = new_cube
-            if "db" in self.executor.source_type:
-                new_sql_alchemy_uri = self._change_db_uri(
-                    self.sql_alchemy_uri, new_cube
-                )
-                self.executor.sqla_engine = create_engine(new_sql_alchemy_uri)
-            if self.executor.cube != new_cube:
-                self.executor.load_cube(new_cube, fact_table_name=facts)
+        facts = self._get_facts_table(cube_name)
+        new_sql_alchemy_uri = None
+        if "db" in self.executor.source_type:
+            new_sql_alchemy_uri = self._change_db_uri(self.sql_alchemy_uri, cube_name)
+        if self.cube_registry is not None:
+            return self.cube_registry.get(
+                cube_name, fact_table_name=facts, sqla_uri=new_sql_alchemy_uri
+            )
+        if new_sql_alchemy_uri:
+            self.executor.sqla_engine = create_engine(new_sql_alchemy_uri)
+        if self.executor.cube != cube_name:
+            self.executor.load_cube(cube_name, fact_table_name=facts)
+        return self.executor
+
+    def discover_response(self, request):
+        """Response of a Discover request, by the method of its RequestType.
+
+        Responses of :data:`CACHED_RESPONSES` requests are cached by the engine of
+        the request cube (see :attr:`MdxEngine.discover_cache`), until the cube is loaded
+        again: Excel sends the same requests every time it connects or refreshes.
+
+        :param request: :class:`DiscoverRequest`
+        :return: XML Discover response as string
+        """
+        method = getattr(self, request.RequestType.lower() + "_response")
+        if request.RequestType == "DISCOVER_DATASOURCES":
+            return method()
+        properties = request.Properties and request.Properties.PropertyList
+        catalog = properties.Catalog if properties else None
+        if request.RequestType not in CACHED_RESPONSES or catalog is None:
+            return method(request)
+
+        # responses depend on the cube selected by previous requests
+        key = (
+            request.RequestType,
+            self.selected_cube,
+            _request_key(request.Restrictions),
+            _request_key(request.Properties),
+        )
+        engine = self.get_loaded_cube_engine(catalog)
+        cached = engine.discover_cache.get(key) if engine is not None else None
+        if cached is not None:
+            response, selected_cube = cached
+            if selected_cube != self.selected_cube:
+                self.change_cube(selected_cube)
+            return response
+
+        response = method(request)
+        engine = self.get_loaded_cube_engine(catalog)
+        if engine is not None and isinstance(response, str):
+            engine.discover_cache.put(key, (response, self.selected_cube))
+        return response
 
     @staticmethod
     def discover_datasources_response():
@@ -798,7 +868,9 @@ class XmlaDiscoverReqHandler(DictDiscoverReqHandler):
                                     )
                                     xml.LEVEL_CAPTION(str(col))
                                     xml.LEVEL_NUMBER(str(l_nb))
-                                    xml.LEVEL_CARDINALITY("0")
+                                    xml.LEVEL_CARDINALITY(
+                                        self.get_level_cardinality(tables, col)
+                                    )
                                     xml.LEVEL_TYPE("0")
                                     xml.CUSTOM_ROLLUP_SETTINGS("0")
                                     xml.LEVEL_UNIQUE_SETTINGS("0")
@@ -1059,6 +1131,22 @@ class XmlaDiscoverReqHandler(DictDiscoverReqHandler):
                             xml.IS_PLACEHOLDERMEMBER("false")
                             xml.IS_DATAMEMBER("false")
 
+                    elif (
+                        request.Restrictions.RestrictionList.CUBE_NAME
+                        == self.selected_cube
+                        and request.Properties.PropertyList.Catalog is not None
+                        and request.Restrictions.RestrictionList.TREE_OP
+                        and request.Restrictions.RestrictionList.MEMBER_UNIQUE_NAME
+                    ):
+                        # children, siblings, descendants... of the member
+                        for row in self.get_tree_members_rows(
+                            member_lvl_name,
+                            request.Restrictions.RestrictionList.TREE_OP,
+                        ):
+                            with xml.row:
+                                for name, value in row.items():
+                                    xml[name](value)
+
                     elif member_lvl_name:
                         parent_level = [
                             "[" + tuple_att + "]" for tuple_att in separated_tuple[:-1]
@@ -5,13 +5,22 @@ requests and responses."""
 import itertools
 from datetime import datetime
 from typing import List, Text
+from xml.sax.saxutils import escape
 
 import numpy as np
+import pandas as pd
 import xmlwitch
 
 from .dict_execute_request_handler import DictExecuteReqHandler
+from .xmla_axis_serializer import serialize_axis
 from .xmla_execute_xsds import execute_xsd
 
+# number of cells written at once by iter_cell_data
+CELL_DATA_CHUNK_SIZE = 10000
+
+# CellData content of responses which cells are streamed (see generate_response)
+CELL_DATA_MARKER = "<!--olapy:CellData-->"
+
 
 class XmlaExecuteReqHandler(DictExecuteReqHandler):
     """The Execute method executes XMLA commands provided in the Command
@@ -49,7 +58,7 @@ class XmlaExecuteReqHandler(DictExecuteReqHandler):
             xml.LName("[Measures]")
             xml.LNum("0")
             xml.DisplayInfo("0")
-            if "HIERARCHY_UNIQUE_NAME" in self.mdx_query:
+            if self.query_plan.measures_hierarchy_unique_name:
                 xml.HIERARCHY_UNIQUE_NAME("[Measures]")
 
     def _gen_xs0_parent(self, xml, tuple, splitted_df, first_att):
@@ -72,35 +81,19 @@ class XmlaExecuteReqHandler(DictExecuteReqHandler):
             )
         )
 
-    def _get_lvl_column_by_dimension(self, all_tuples):
-        """TODO.
-
-        :param all_tuples:
-        :return:
-        """
-        used_levels = {}
-        for tupl in all_tuples:
-            if not tupl[0].upper() == "MEASURES":
-                used_levels[tupl[0]] = list(used_levels.get(tupl[0], [])) + [tupl[2]]
-        return used_levels
-
     def _gen_xs0_tuples(self, xml, tuples, **kwargs):
         first_att = kwargs.get("first_att")
         split_df = kwargs.get("split_df")
-        all_tuples = self.executor.parser.decorticate_query(self.mdx_query)["all"]
         # [Geography].[Geography].[Continent]  -> first_lvlname : Country
         # [Geography].[Geography].[Europe]     -> first_lvlname : Europe
-        all_level_columns = self._get_lvl_column_by_dimension(all_tuples)
+        known_levels = self.query_plan.known_levels
         for tupl in tuples:
             tuple_without_minus_1 = self.get_tuple_without_nan(tupl)
             current_lvl_name = split_df[tuple_without_minus_1[0]].columns[
                 len(tuple_without_minus_1) - first_att
             ]
             current_dimension = tuple_without_minus_1[0]
-            if all(
-                used_column in self.executor.tables_loaded[current_dimension].columns
-                for used_column in all_level_columns[current_dimension]
-            ):
+            if known_levels.get(current_dimension, True):
                 uname = "[{0}].[{0}].[{1}].{2}".format(
                     current_dimension,
                     current_lvl_name,
@@ -133,14 +126,14 @@ class XmlaExecuteReqHandler(DictExecuteReqHandler):
                 xml.LNum(str(len(tuple_without_minus_1) - first_att))
                 xml.DisplayInfo("131076")
 
-                if "PARENT_UNIQUE_NAME" in self.mdx_query.upper():
+                if self.query_plan.parent_unique_name:
                     self._gen_xs0_parent(
                         xml,
                         tuple=tuple_without_minus_1,
                         splitted_df=split_df,
                         first_att=first_att,
                     )
-                if "HIERARCHY_UNIQUE_NAME" in self.mdx_query.upper():
+                if self.query_plan.hierarchy_unique_name:
                     xml.HIERARCHY_UNIQUE_NAME(
                         "[{0}].[{0}]".format(tuple_without_minus_1[0])
                     )
@@ -170,7 +163,7 @@ class XmlaExecuteReqHandler(DictExecuteReqHandler):
                             xml, tupls, split_df=splitted_df, first_att=first_att
                         )
                         # Hierarchize'
-                        if not self.executor.parser.hierarchized_tuples():
+                        if not self.query_plan.hierarchized:
                             self._gen_measures_xs0(xml, tupls)
         return xml
 
@@ -208,6 +201,47 @@ class XmlaExecuteReqHandler(DictExecuteReqHandler):
                                 xml.DisplayInfo(displayinfo)
         return str(xml)
 
+    def _serialize_axis(self, splitted_df, mdx_query_axis, axis):
+        """Serialize axis tuples column by column (see :mod:`xmla_axis_serializer`),
+        instead of :func:`tuples_2_xs0`, for the same tuples as :func:`_generate_tuples_xs0`.
+
+        :param splitted_df: splitted dataframes (with split_dataframe() function)
+        :param mdx_query_axis: rows | columns | where | all
+        :param axis: Axis0 | Axis1
+        :return: axis xml as string, or None if tuples_2_xs0 must be used
+        """
+        if list(self.columns_desc[mdx_query_axis].keys()) == [self.executor.facts]:
+            # only measures, few tuples
+            return None
+        if not all(isinstance(df, pd.DataFrame) for df in splitted_df.values()):
+            return None
+
+        dimensions = [
+            (key, df)
+            for key, df in splitted_df.items()
+            if key is not self.executor.facts
+        ]
+        if self.columns_desc["columns"] and self.columns_desc["rows"]:
+            # tuples like ['Geography', 'America']
+            selected_measures = None
+        else:
+            # tuples like ['Geography', 'Amount', 'America']
+            selected_measures = self.executor.selected_measures
+        return serialize_axis(
+            axis,
+            dimensions,
+            self.executor.measures,
+            selected_measures=selected_measures,
+            many_measures=len(self.executor.selected_measures) > 1,
+            hierarchized=self.query_plan.hierarchized,
+            parent_unique_name=self.query_plan.parent_unique_name,
+            hierarchy_unique_name=self.query_plan.hierarchy_unique_name,
+            measures_hierarchy_unique_name=(
+                self.query_plan.measures_hierarchy_unique_name
+            ),
+            known_levels=self.query_plan.known_levels,
+        )
+
     def generate_xs0_one_axis(self, splitted_df, mdx_query_axis="all", axis="Axis0"):
         """
 
@@ -217,10 +251,12 @@ class XmlaExecuteReqHandler(DictExecuteReqHandler):
         :return:
         """
         # patch 4 select (...) (...) (...) from bla bla bla
-        if self.executor.check_nested_select():
-            return self._gen_xs0_grouped_tuples(
-                axis, self.executor.parser.get_nested_select()
-            )
+        if self.query_plan.nested_select:
+            return self._gen_xs0_grouped_tuples(axis, self.query_plan.nested_select)
+
+        fast_xml = self._serialize_axis(splitted_df, mdx_query_axis, axis)
+        if fast_xml is not None:
+            return fast_xml
 
         xml = xmlwitch.Builder()
         tuples, first_att = self._generate_tuples_xs0(splitted_df, mdx_query_axis)
@@ -396,36 +432,102 @@ class XmlaExecuteReqHandler(DictExecuteReqHandler):
         if self.convert2formulas:
             return self._generate_cells_data_convert2formulas()
 
+        return b"".join(self.iter_cell_data()).decode("utf-8")
+
+    def iter_cell_data(self, chunk_size=CELL_DATA_CHUNK_SIZE, encoding="utf-8"):
+        """Same Cell elements as :func:`generate_cell_data`, as encoded chunks of
+        *chunk_size* cells, written from the result columns arrays (the whole CellData
+        is never built in memory).
+
+        Cells are taken from the execution result when this method is called, the
+        chunks can be consumed after another query execution.
+
+        :param chunk_size: number of cells by chunk
+        :param encoding: chunks encoding
+        :return: iterator of bytes
+        """
+        result = self.mdx_execution_result["result"] if not self.convert2formulas else None
+        if not isinstance(result, pd.DataFrame):
+            # convert2formulas, spark DataFrames
+            return iter([self.generate_cell_data().encode(encoding)])
+
+        columns = [result.iloc[:, idx].to_numpy() for idx in range(result.shape[1])]
         if (
             len(self.columns_desc["columns"].keys()) == 0
             or len(self.columns_desc["rows"].keys()) == 0
         ) and self.executor.facts in self.columns_desc["all"].keys():
             # iterate DataFrame horizontally
-            columns_loop = itertools.chain(
-                *[
-                    self.mdx_execution_result["result"][measure]
-                    for measure in self.mdx_execution_result["result"].columns
-                ]
+            values_chunks = (
+                (idx * len(result) + start, column[start : start + chunk_size].tolist())
+                for idx, column in enumerate(columns)
+                for start in range(0, len(column), chunk_size)
             )
-
         else:
             # iterate DataFrame vertically
-            columns_loop = itertools.chain(
-                *list(self.mdx_execution_result["result"].itertuples(index=False))
+            rows_chunk = max(chunk_size // max(len(columns), 1), 1)
+            values_chunks = (
+                (
+                    start * len(columns),
+                    list(
+                        itertools.chain.from_iterable(
+                            zip(
+                                *[
+                                    column[start : start + rows_chunk].tolist()
+                                    for column in columns
+                                ]
+                            )
+                        )
+                    ),
+                )
+                for start in range(0, len(result), rows_chunk)
             )
+        # only NON EMPTY queries skip empty cells, others write them as empty values
+        return self._iter_cells(
+            values_chunks, encoding, skip_empty=bool(self.query_plan.non_empty_axes)
+        )
 
-        xml = xmlwitch.Builder()
-        index = 0
-
-        for value in columns_loop:
-            if np.isnan(value):
-                value = ""
-            with xml.Cell(CellOrdinal=str(index)):
-                xml.Value(str(value), **{"xsi:type": "xsi:long"})
+    @staticmethod
+    def _iter_cells(values_chunks, encoding, skip_empty=False):
+        """Cell elements of values, like xmlwitch (xmlwitch writes a new line before
+        every element, except the first one).
 
-            index += 1
+        The CellOrdinal of a cell is its position in the chunk plus the chunk first
+        ordinal.
 
-        return str(xml)
+        :param values_chunks: iterator of (first cell ordinal, list of values)
+        :param encoding: chunks encoding
+        :param skip_empty: empty (NaN) cells are not written, Default False
+        :return: iterator of bytes
+        """
+        first = True
+        for first_ordinal, values in values_chunks:
+            not_empty = ~pd.isna(np.array(values, dtype=object))
+            if not skip_empty:
+                values = [
+                    value if value_not_empty else ""
+                    for value, value_not_empty in zip(values, not_empty)
+                ]
+                not_empty = np.ones(len(values), dtype=bool)
+            ordinals = (np.flatnonzero(not_empty) + first_ordinal).tolist()
+            cells = []
+            for ordinal, value in zip(ordinals, itertools.compress(values, not_empty)):
+                value = escape(str(value))
+                if value:
+                    cells.append(
+                        f'\n<Cell CellOrdinal="{ordinal}">'
+                        f'\n  <Value xsi:type="xsi:long">{value}</Value>\n</Cell>'
+                    )
+                else:
+                    cells.append(
+                        f'\n<Cell CellOrdinal="{ordinal}">'
+                        '\n  <Value xsi:type="xsi:long" />\n</Cell>'
+                    )
+            if not cells:
+                continue
+            if first:
+                cells[0] = cells[0][1:]
+                first = False
+            yield "".join(cells).encode(encoding)
 
     def _generate_axes_info_slicer_convert2formulas(self):
         """generate Slicer Axes for convert formulas query.
@@ -504,7 +606,7 @@ class XmlaExecuteReqHandler(DictExecuteReqHandler):
                             self.executor.facts in self.columns_desc["all"]
                             and (len(self.columns_desc["all"][self.executor.facts]) > 1)
                             or (
-                                not self.executor.parser.hierarchized_tuples()
+                                not self.query_plan.hierarchized
                                 and not self.columns_desc["where"]
                             )
                         ):
@@ -542,11 +644,11 @@ class XmlaExecuteReqHandler(DictExecuteReqHandler):
             xml.LName(name="[Measures].[LEVEL_UNIQUE_NAME]", type="xs:string")
             xml.LNum(name="[Measures].[LEVEL_NUMBER]", type="xs:int")
             xml.DisplayInfo(name="[Measures].[DISPLAY_INFO]", type="xs:unsignedInt")
-            if "PARENT_UNIQUE_NAME" in self.mdx_query:
+            if self.query_plan.measures_parent_unique_name:
                 xml.PARENT_UNIQUE_NAME(
                     name="[Measures].[PARENT_UNIQUE_NAME]", type="xs:string"
                 )
-            if "HIERARCHY_UNIQUE_NAME" in self.mdx_query:
+            if self.query_plan.measures_hierarchy_unique_name:
                 xml.HIERARCHY_UNIQUE_NAME(
                     name="[Measures].[HIERARCHY_UNIQUE_NAME]", type="xs:string"
                 )
@@ -583,7 +685,7 @@ class XmlaExecuteReqHandler(DictExecuteReqHandler):
                     type="xs:unsignedInt",
                 )
 
-                if "Hierarchize" in self.mdx_query:
+                if self.query_plan.hierarchized:
                     xml.PARENT_UNIQUE_NAME(
                         name="[{0}].[{0}].[PARENT_UNIQUE_NAME]".format(dimension_name),
                         type="xs:string",
@@ -648,7 +750,7 @@ class XmlaExecuteReqHandler(DictExecuteReqHandler):
                 self._generate_table_axis_info(xml, axis_tables_without_facts)
                 # Hierarchize
                 if (
-                    not self.executor.parser.hierarchized_tuples()
+                    not self.query_plan.hierarchized
                     and len(
                         self.columns_desc["columns"].get(self.executor.facts, [1, 1])
                     )
@@ -818,7 +920,7 @@ class XmlaExecuteReqHandler(DictExecuteReqHandler):
 
                         # Hierarchize
                         if len(self.executor.selected_measures) <= 1 and (
-                            self.executor.parser.hierarchized_tuples()
+                            self.query_plan.hierarchized
                             or self.executor.facts in self.columns_desc["where"]
                         ):
                             with xml.Member(Hierarchy="[Measures]"):
@@ -830,9 +932,12 @@ class XmlaExecuteReqHandler(DictExecuteReqHandler):
 
         return str(xml)
 
-    def generate_response(self):
+    def generate_response(self, stream_cell_data=False):
         """generate the xmla response.
 
+        :param stream_cell_data: write :data:`CELL_DATA_MARKER` instead of the
+            CellData content, to stream :func:`iter_cell_data` chunks in its place
+            (see :class:`CellDataStreamingMiddleware`)
         :return: xmla response as string
         """
 
@@ -879,5 +984,8 @@ class XmlaExecuteReqHandler(DictExecuteReqHandler):
                         xml.write(self.generate_slicer_axis())
 
                     with xml.CellData:
-                        xml.write(self.generate_cell_data())
+                        if stream_cell_data:
+                            xml.write(CELL_DATA_MARKER)
+                        else:
+                            xml.write(self.generate_cell_data())
             return str(xml)
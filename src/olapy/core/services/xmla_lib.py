@@ -1,5 +1,6 @@
 import importlib
 from pprint import pprint
+from typing import Optional
 
 import pandas as pd
 
@@ -69,6 +70,103 @@ class XmlaProviderLib:
         return self.execute_request_hanlder.generate_response()
 
 
+class PreparedCube:
+    """Cube of injected DataFrames, answering many xmla requests.
+
+    DataFrames are cleaned and merged (star schema) once, and the request handlers are
+    kept, so a request only costs its query (and repeated queries are answered from the
+    engine queries cache)::
+
+        cube = PreparedCube(dataframes, output="dict")
+        cube.get_response(discover_request_params)
+        cube.get_response(execute_request_params)
+
+    :param dataframes: dict of pandas dataframes {df_name : df}, they are not changed
+    :param output: xmla, dict or numpy output type
+    :param facts_table_name: facts DataFrame name
+    :param mdx_engine: engine used for the cube, Default a new MdxEngine
+    :param cube_name: cube name
+    """
+
+    def __init__(
+        self,
+        dataframes,
+        output="dict",
+        facts_table_name="Facts",
+        mdx_engine=None,
+        cube_name="sales",
+    ):
+        # type: (dict, str, str, Optional[MdxEngine], str) -> None
+        if mdx_engine:
+            executor = mdx_engine
+        else:
+            executor = MdxEngine(facts=facts_table_name)
+        inject_dataframes(
+            executor, dataframes, facts_table_name=facts_table_name, cube_name=cube_name
+        )
+        self.mdx_engine = executor
+        self.output = output
+
+        module = importlib.import_module(
+            "olapy.core.services." + output + "_discover_request_handler"
+        )
+        discover_request_handler = getattr(
+            module, output.title() + "DiscoverReqHandler"
+        )(executor)
+
+        module = importlib.import_module(
+            "olapy.core.services." + output + "_execute_request_handler"
+        )
+        execute_request_handler = getattr(module, output.title() + "ExecuteReqHandler")(
+            executor
+        )
+
+        self.xmla_service = XmlaProviderLib(
+            discover_request_handler, execute_request_handler
+        )
+
+    def get_response(self, xmla_request_params):
+        # type: (dict) -> dict
+        """get xmla reponse.
+
+        :param xmla_request_params: xmla request parameters
+        :return: xmla response
+        """
+        self.xmla_service.discover_request_hanlder.change_cube(
+            xmla_request_params.get("cube")
+        )
+
+        property = Property(**xmla_request_params.get("properties"))  # type: ignore
+        properties = Propertieslist()
+        properties.PropertyList = property  # type: ignore
+
+        # Execute request
+        if xmla_request_params.get("mdx_query"):
+            request = ExecuteRequest()
+            request.Command = Command(  # type: ignore
+                Statement=xmla_request_params.get("mdx_query")
+            )
+
+            request.Properties = properties  # type: ignore
+
+            return self.xmla_service.Execute(request)
+
+        # Discover request
+        else:
+            request = DiscoverRequest()  # type: ignore
+            restriction = Restriction(  # type: ignore
+                **xmla_request_params.get("restrictions")
+            )
+            request.Restrictions = Restrictionlist(  # type: ignore
+                RestrictionList=restriction
+            )
+
+            request.RequestType = xmla_request_params.get("request_type")  # type: ignore
+            request.Properties = properties  # type: ignore
+
+            return self.xmla_service.Discover(request)
+
+
 def get_response(
     xmla_request_params,
     dataframes=None,
@@ -79,63 +177,21 @@ def get_response(
     # type: (dict, dict, str, str, MdxEngine) -> dict
     """get xmla reponse.
 
+    The cube is built from the DataFrames at every call, use :class:`PreparedCube` to
+    answer many requests with the same DataFrames.
+
     :param xmla_request_params: xmla request parameters
     :param dataframes: dict of pandas dataframes {df_name : df}
-    :param output: xmla or dict output type
+    :param output: xmla, dict or numpy (cells and tuples as NumPy arrays) output type
     :return: xmla response
     """
-    if mdx_engine:
-        executor = mdx_engine
-    else:
-        executor = MdxEngine(facts=facts_table_name)
-    inject_dataframes(executor, dataframes, facts_table_name=facts_table_name)
-
-    module = importlib.import_module(
-        "olapy.core.services." + output + "_discover_request_handler"
-    )
-    discover_request_handler = getattr(module, output.title() + "DiscoverReqHandler")(
-        executor
-    )
-    discover_request_handler.change_cube(xmla_request_params.get("cube"))
-
-    module = importlib.import_module(
-        "olapy.core.services." + output + "_execute_request_handler"
-    )
-    execute_request_handler = getattr(module, output.title() + "ExecuteReqHandler")(
-        executor
+    cube = PreparedCube(
+        dataframes,
+        output=output,
+        facts_table_name=facts_table_name,
+        mdx_engine=mdx_engine,
     )
-
-    xmla_service = XmlaProviderLib(discover_request_handler, execute_request_handler)
-
-    property = Property(**xmla_request_params.get("properties"))  # type: ignore
-    properties = Propertieslist()
-    properties.PropertyList = property  # type: ignore
-
-    # Execute request
-    if xmla_request_params.get("mdx_query"):
-        request = ExecuteRequest()
-        request.Command = Command(  # type: ignore
-            Statement=xmla_request_params.get("mdx_query")
-        )
-
-        request.Properties = properties  # type: ignore
-
-        return xmla_service.Execute(request)
-
-    # Discover request
-    else:
-        request = DiscoverRequest()  # type: ignore
-        restriction = Restriction(  # type: ignore
-            **xmla_request_params.get("restrictions")
-        )
-        request.Restrictions = Restrictionlist(  # type: ignore
-            RestrictionList=restriction
-        )
-
-        request.RequestType = xmla_request_params.get("request_type")  # type: ignore
-        request.Properties = properties  # type: ignore
-
-        return xmla_service.Discover(request)
+    return cube.get_response(xmla_request_params)
 
 
 if __name__ == "__main__":
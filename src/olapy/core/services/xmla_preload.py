@@ -0,0 +1,233 @@
+"""Load cubes and warm caches up at server start, in the background.
+
+Without preloading, the first request using a cube waits for the whole cube loading
+(csv files or database tables). :class:`CubePreloader` loads the given cubes in a
+background thread, then executes warmup queries (filling queries and aggregates caches),
+while the server already answers requests. :class:`ReadinessMiddleware` answers
+``GET /ready`` requests with ``200`` once preloading is done (``503`` before), for load
+balancers health checks.
+
+usage::
+
+    preloader = CubePreloader(discover_request_hanlder, ["sales"], warmup_queries)
+    wsgi_application = ReadinessMiddleware(wsgi_application, preloader)
+    preloader.start()
+"""
+
+import logging
+import os
+import re
+import threading
+from collections import Counter
+from contextlib import nullcontext
+from xml.sax.saxutils import unescape
+
+# number of the most frequent queries of a query log used as warmup queries
+WARMUP_LOG_QUERIES = 10
+
+_CUBE_NAME = re.compile(r"\bFROM\s*\[([^\]]+)\]", re.IGNORECASE)
+_STATEMENT = re.compile(
+    r"<(?:\w+:)?Statement\b[^>]*>(.*?)</(?:\w+:)?Statement>", re.DOTALL
+)
+
+
+def query_cube(mdx_query):
+    """Cube name of an mdx query.
+
+    :param mdx_query: mdx query
+    :return: cube name, or None if the query has no FROM [cube]
+    """
+    match = _CUBE_NAME.search(mdx_query)
+    return match.group(1) if match else None
+
+
+def read_warmup_queries(file_path):
+    """Mdx queries of a file, separated by empty lines.
+
+    :param file_path: queries file path
+    :return: list of queries
+    """
+    with open(file_path, encoding="utf-8") as queries_file:
+        content = queries_file.read()
+    queries = re.split(r"\n\s*\n", content)
+    return [query.strip() for query in queries if query.strip()]
+
+
+def read_logged_queries(log_file_path, top=WARMUP_LOG_QUERIES):
+    """Most frequent mdx queries of xmla server logs (statements of the logged Execute
+    requests).
+
+    :param log_file_path: log file path (runserver -lf)
+    :param top: number of queries
+    :return: list of queries, the most frequent first
+    """
+    with open(log_file_path, encoding="utf-8", errors="replace") as log_file:
+        statements = Counter(
+            # spyne logs requests documents as bytes reprs (escaped new lines)
+            unescape(statement.replace("\\r", "").replace("\\n", "\n")).strip()
+            for statement in _STATEMENT.findall(log_file.read())
+        )
+    statements.pop("", None)
+    return [statement for statement, _ in statements.most_common(top)]
+
+
+def read_preload_options(preload=None, warmup_queries_file=None, warmup_log=None):
+    """Cubes and warmup queries of the runserver preload options.
+
+    :param preload: comma separated cubes names, or ``all``
+    :param warmup_queries_file: mdx queries file (see :func:`read_warmup_queries`)
+    :param warmup_log: log file of a previous server (see :func:`read_logged_queries`),
+        ignored if it doesn't exist
+    :return: (list of cubes names, list of warmup queries)
+    """
+    cubes = [cube.strip() for cube in (preload or "").split(",") if cube.strip()]
+    queries = []
+    if warmup_queries_file:
+        queries += read_warmup_queries(warmup_queries_file)
+    if warmup_log and os.path.isfile(warmup_log):
+        queries += read_logged_queries(warmup_log)
+    return cubes, queries
+
+
+class CubePreloader:
+    """Load cubes, then execute warmup queries, in a background thread.
+
+    Without cube registry, the discover handler engine holds one cube: only the first
+    cube is loaded, and warmup queries of other cubes are skipped.
+
+    :param discover_request_hanlder: DictDiscoverReqHandler of the server
+    :param cubes: cubes names, or ``["all"]`` for all cubes
+    :param warmup_queries: mdx queries executed once cubes are loaded (their cubes are
+        loaded too)
+    :param engine_lock: lock of the server engine (see :func:`get_spyne_app`)
+    """
+
+    def __init__(
+        self, discover_request_hanlder, cubes=(), warmup_queries=(), engine_lock=None
+    ):
+        self.discover_request_hanlder = discover_request_hanlder
+        if list(cubes) == ["all"]:
+            cubes = discover_request_hanlder.cubes
+        self.cubes = list(cubes)
+        self.warmup_queries = list(warmup_queries)
+        self.engine_lock = engine_lock or nullcontext()
+        self.status = "loading"
+        self.errors = []
+        self.ready = threading.Event()
+        self.thread = None
+
+    def start(self):
+        """Preload in a background thread (ready at once if there is nothing to
+        preload)."""
+        if not self.cubes and not self.warmup_queries:
+            self._done()
+            return
+        self.thread = threading.Thread(
+            target=self.run, name="olapy-preload", daemon=True
+        )
+        self.thread.start()
+
+    def run(self):
+        """Load cubes, and execute warmup queries."""
+        queries_cubes = [query_cube(query) for query in self.warmup_queries]
+        engines = self._load_cubes(self._cubes_to_load(queries_cubes))
+        self._warmup(engines, queries_cubes)
+        self._done()
+
+    def _cubes_to_load(self, queries_cubes):
+        """Preloaded cubes, then cubes of warmup queries.
+
+        :param queries_cubes: cube of each warmup query
+        :return: list of cubes names
+        """
+        cubes = list(self.cubes)
+        for cube in queries_cubes:
+            if cube and cube not in cubes:
+                cubes.append(cube)
+        if self.discover_request_hanlder.cube_registry is None and len(cubes) > 1:
+            logging.warning(
+                "without cube registry (runserver -cm), only %s is preloaded", cubes[0]
+            )
+            cubes = cubes[:1]
+        return cubes
+
+    def _load_cubes(self, cubes):
+        """Load cubes, cubes which fail to load are logged and skipped.
+
+        :param cubes: cubes names
+        :return: dict of cube name -> MdxEngine of the loaded cubes
+        """
+        engines = {}
+        # the cube registry loads cubes without blocking requests
+        if self.discover_request_hanlder.cube_registry is None:
+            engine_lock = self.engine_lock
+        else:
+            engine_lock = nullcontext()
+        for idx, cube in enumerate(cubes):
+            self.status = f"loading {cube} ({idx + 1}/{len(cubes)})"
+            try:
+                with engine_lock:
+                    engines[cube] = self.discover_request_hanlder.get_cube_engine(cube)
+            except Exception as error:
+                logging.exception("preloading %s failed", cube)
+                self.errors.append((cube, error))
+        return engines
+
+    def _warmup(self, engines, queries_cubes):
+        """Execute warmup queries of loaded cubes, failed queries are logged.
+
+        :param engines: loaded cubes engines (see :func:`_load_cubes`)
+        :param queries_cubes: cube of each warmup query
+        """
+        for idx, (query, cube) in enumerate(zip(self.warmup_queries, queries_cubes)):
+            if cube not in engines:
+                continue
+            self.status = f"warmup query {idx + 1}/{len(self.warmup_queries)}"
+            try:
+                engines[cube].execute(query)
+            except Exception as error:
+                logging.exception("warmup query failed: %s", query)
+                self.errors.append((query, error))
+
+    def _done(self):
+        self.status = "ready"
+        self.ready.set()
+        logging.info("olapy is ready")
+
+
+class ReadinessMiddleware:
+    """WSGI middleware answering readiness requests (``GET /ready``).
+
+    :param application: xmla WSGI application
+    :param preloader: :class:`CubePreloader`
+    :param path: readiness requests path
+    """
+
+    def __init__(self, application, preloader, path="/ready"):
+        self.application = application
+        self.preloader = preloader
+        self.path = path
+
+    def __getattr__(self, name):
+        # wrapped application attributes (app, event_manager...)
+        return getattr(self.application, name)
+
+    def __call__(self, environ, start_response):
+        if (
+            environ.get("REQUEST_METHOD") != "GET"
+            or environ.get("PATH_INFO", "").rstrip("/") != self.path
+        ):
+            return self.application(environ, start_response)
+        body = (self.preloader.status + "\n").encode("utf-8")
+        if self.preloader.ready.is_set():
+            status = "200 OK"
+        else:
+            status = "503 Service Unavailable"
+        start_response(
+            status,
+            [
+                ("Content-Type", "text/plain; charset=utf-8"),
+                ("Content-Length", str(len(body))),
+            ],
+        )
+        return [body]
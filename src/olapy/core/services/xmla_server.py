@@ -0,0 +1,299 @@
+"""Multi-threaded HTTP/1.1 server for the xmla WSGI application.
+
+``wsgiref.simple_server`` serves one request at a time, so one slow query blocks every
+other client. :class:`ThreadPoolWSGIServer` serves connections with a pool of worker
+threads, keeps HTTP/1.1 connections alive (Excel sends many Discover requests in a row),
+sends responses without Content-Length (see :mod:`xmla_streaming`) with chunked transfer
+encoding, and closes idle or slow connections after a timeout.
+
+Workers only handle connections while they have a request: idle connections (new ones,
+and kept alive ones between requests) wait in a selector, so idle Excel connections don't
+hold the workers.
+
+usage::
+
+    server = make_threaded_server(host, port, wsgi_application, workers=8)
+    server.serve_forever()
+"""
+
+import io
+import selectors
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler
+from wsgiref.simple_server import ServerHandler, WSGIRequestHandler, WSGIServer
+
+# max size of requests bodies (xmla requests are small)
+MAX_REQUEST_SIZE = 10 * 1024 * 1024
+
+
+class KeepAliveServerHandler(ServerHandler):
+    """HTTP/1.1 responses, chunked if the application doesn't give their length."""
+
+    http_version = "1.1"
+    chunked = False
+
+    def cleanup_headers(self):
+        super().cleanup_headers()
+        if "Content-Length" in self.headers:
+            return
+        if self.environ.get("SERVER_PROTOCOL") == "HTTP/1.1":
+            self.chunked = True
+            self.headers["Transfer-Encoding"] = "chunked"
+        else:
+            # the end of the response is the end of the connection
+            self.request_handler.close_connection = True
+        if self.request_handler.close_connection:
+            self.headers["Connection"] = "close"
+
+    def write(self, data):
+        if not self.headers_sent:
+            # status and headers (chunked is known after cleanup_headers)
+            super().write(b"")
+        if not self.chunked:
+            super().write(data)
+        elif data:
+            self.bytes_sent += len(data)
+            self._write(b"%x\r\n%s\r\n" % (len(data), data))
+            self._flush()
+
+    def finish_content(self):
+        super().finish_content()
+        if self.chunked:
+            self._write(b"0\r\n\r\n")
+            self._flush()
+
+    def handle_error(self):
+        # the response may be incomplete, the connection can't be used anymore
+        self.request_handler.close_connection = True
+        super().handle_error()
+
+
+class KeepAliveRequestHandler(WSGIRequestHandler):
+    """Handle the requests of one connection while the client sends them, the idle
+    connection is then given back to the server (see :attr:`keep_alive`)."""
+
+    protocol_version = "HTTP/1.1"
+    # the connection waits for its next request in the server selector
+    keep_alive = False
+
+    def setup(self):
+        # timeout of every socket operation while handling requests
+        self.timeout = self.server.request_timeout
+        super().setup()
+
+    def handle(self):
+        """Handle requests until the connection is closed or has no pending request."""
+        self.close_connection = True
+        self.handle_one_request()
+        while not self.close_connection:
+            if not self._request_pending():
+                self.keep_alive = True
+                return
+            self.handle_one_request()
+
+    def _request_pending(self):
+        """:return: True if the next request has already been (partly) received"""
+        self.connection.settimeout(0)
+        try:
+            return bool(self.rfile.peek(1))
+        except OSError:
+            return False
+        finally:
+            self.connection.settimeout(self.timeout)
+
+    def handle_one_request(self):
+        """Same as :func:`WSGIRequestHandler.handle`, for one request of the
+        connection."""
+        try:
+            self.raw_requestline = self.rfile.readline(65537)
+        except socket.timeout:
+            self.close_connection = True
+            return
+        if not self.raw_requestline:
+            self.close_connection = True
+            return
+        if len(self.raw_requestline) > 65536:
+            self.requestline = ""
+            self.request_version = ""
+            self.command = ""
+            self.send_error(414)
+            self.close_connection = True
+            return
+
+        if not self.parse_request():  # An error code has been sent
+            return
+
+        environ = self.get_environ()
+        content_length = int(self.headers.get("Content-Length") or 0)
+        if content_length > MAX_REQUEST_SIZE:
+            self.send_error(413)
+            self.close_connection = True
+            return
+        if self.headers.get("Transfer-Encoding"):
+            # chunked requests bodies are not read, the connection can't be reused
+            self.close_connection = True
+            request_body = self.rfile
+        else:
+            # the whole body is read, even if the application doesn't read it, so the
+            # next request of the connection starts where expected
+            try:
+                request_body = io.BytesIO(self.rfile.read(content_length))
+            except socket.timeout:
+                self.close_connection = True
+                return
+
+        handler = KeepAliveServerHandler(
+            request_body,
+            self.wfile,
+            self.get_stderr(),
+            environ,
+            multithread=True,
+        )
+        handler.request_handler = self  # backpointer for logging
+        handler.run(self.server.get_app())
+
+
+class ThreadPoolWSGIServer(WSGIServer):
+    """WSGI server handling requests with a pool of *workers* threads.
+
+    Idle connections wait for their next request in a selector thread, a connection is
+    handled by a worker once it has a request.
+
+    :param workers: max number of requests handled at the same time
+    :param request_timeout: seconds before closing slow connections (reading a request
+        or sending a response)
+    :param keep_alive_timeout: seconds before closing idle connections (at most
+        request_timeout)
+    """
+
+    def __init__(
+        self,
+        server_address,
+        RequestHandlerClass=KeepAliveRequestHandler,
+        workers=8,
+        request_timeout=60,
+        keep_alive_timeout=15,
+        bind_and_activate=True,
+    ):
+        self.workers = workers
+        self.request_timeout = request_timeout
+        self.keep_alive_timeout = min(keep_alive_timeout, request_timeout)
+        self.pool = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="olapy-xmla"
+        )
+        self.selector = selectors.DefaultSelector()
+        # connections given to the selector thread, by workers
+        self._idle_connections = []
+        self._idle_lock = threading.Lock()
+        self._wakeup_receiver, self._wakeup_sender = socket.socketpair()
+        self.selector.register(self._wakeup_receiver, selectors.EVENT_READ)
+        self._closed = False
+        self._selector_thread = threading.Thread(
+            target=self._select_requests, name="olapy-xmla-selector", daemon=True
+        )
+        super().__init__(server_address, RequestHandlerClass, bind_and_activate)
+        self._selector_thread.start()
+
+    def process_request(self, request, client_address):
+        # new connections wait for their first request like idle ones
+        self.wait_for_request(request, client_address)
+
+    def process_request_thread(self, request, client_address):
+        """Same as :func:`socketserver.ThreadingMixIn.process_request_thread`, the
+        connection waits for its next request if it is kept alive."""
+        try:
+            handler = self.RequestHandlerClass(request, client_address, self)
+        except Exception:
+            self.handle_error(request, client_address)
+        else:
+            if handler.keep_alive:
+                self.wait_for_request(request, client_address)
+                return
+        self.shutdown_request(request)
+
+    def wait_for_request(self, request, client_address):
+        """Give a connection to the selector thread, it is handled by a worker once it
+        has a request, or closed after :attr:`keep_alive_timeout`.
+
+        :param request: connection socket
+        :param client_address: client address
+        """
+        deadline = time.monotonic() + self.keep_alive_timeout
+        with self._idle_lock:
+            if self._closed:
+                self.shutdown_request(request)
+                return
+            self._idle_connections.append((request, client_address, deadline))
+            self._wakeup_sender.send(b"\0")
+
+    def _select_requests(self):
+        """Selector thread: submit connections with a request to workers, close
+        expired idle connections."""
+        deadlines = {}
+        while not self._closed:
+            with self._idle_lock:
+                idle_connections, self._idle_connections = self._idle_connections, []
+            for request, client_address, deadline in idle_connections:
+                self.selector.register(request, selectors.EVENT_READ, client_address)
+                deadlines[request] = deadline
+
+            timeout = min(deadlines.values(), default=time.monotonic() + 1)
+            events = self.selector.select(max(timeout - time.monotonic(), 0))
+            for key, _ in events:
+                if key.fileobj is self._wakeup_receiver:
+                    self._wakeup_receiver.recv(4096)
+                    continue
+                self.selector.unregister(key.fileobj)
+                del deadlines[key.fileobj]
+                self.pool.submit(self.process_request_thread, key.fileobj, key.data)
+
+            now = time.monotonic()
+            for request in [
+                request for request, deadline in deadlines.items() if deadline <= now
+            ]:
+                self.selector.unregister(request)
+                del deadlines[request]
+                self.shutdown_request(request)
+
+        for request in list(deadlines) + [
+            request for request, _, _ in self._idle_connections
+        ]:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        with self._idle_lock:
+            self._closed = True
+            self._wakeup_sender.send(b"\0")
+        self._selector_thread.join()
+        self.selector.close()
+        self._wakeup_receiver.close()
+        self._wakeup_sender.close()
+        self.pool.shutdown(wait=False)
+
+
+def make_threaded_server(
+    host, port, app, workers=8, request_timeout=60, keep_alive_timeout=15
+):
+    """Same as :func:`wsgiref.simple_server.make_server`, with a
+    :class:`ThreadPoolWSGIServer`.
+
+    :param host: host ip address
+    :param port: host port
+    :param app: WSGI application
+    :param workers: number of threads handling requests
+    :param request_timeout: seconds before closing slow connections
+    :param keep_alive_timeout: seconds before closing idle connections
+    :return: ThreadPoolWSGIServer
+    """
+    server = ThreadPoolWSGIServer(
+        (host, port),
+        workers=workers,
+        request_timeout=request_timeout,
+        keep_alive_timeout=keep_alive_timeout,
+    )
+    server.set_app(app)
+    return server
@@ -0,0 +1,77 @@
+"""Send Execute responses cells as a streamed (chunked) HTTP response.
+
+Spyne builds the whole SOAP envelope in memory before sending it, and so did olapy with
+CellData, the biggest part of Execute responses. With :class:`CellDataStreamingMiddleware`,
+the Execute service only returns the response skeleton (with
+:data:`CELL_DATA_MARKER` as CellData content), and the middleware sends
+:func:`XmlaExecuteReqHandler.iter_cell_data` chunks in place of the marker, without
+Content-Length (HTTP/1.1 servers send the response with chunked transfer encoding).
+
+usage::
+
+    wsgi_application = CellDataStreamingMiddleware(WsgiApplication(application))
+"""
+
+from .xmla_execute_request_handler import CELL_DATA_MARKER
+
+# environ key of the list where the Execute service puts CellData chunks iterators
+CELL_DATA_ENVIRON_KEY = "olapy.cell_data"
+
+XSI_NAMESPACE = b"http://www.w3.org/2001/XMLSchema-instance"
+
+
+class CellDataStreamingMiddleware:
+    """WSGI middleware streaming Execute responses CellData.
+
+    :param application: spyne WsgiApplication
+    :param encoding: encoding of spyne responses
+    """
+
+    def __init__(self, application, encoding="utf-8"):
+        self.application = application
+        self.encoding = encoding
+
+    def __getattr__(self, name):
+        # WsgiApplication attributes (app, event_manager...)
+        return getattr(self.application, name)
+
+    def __call__(self, environ, start_response):
+        cell_data = []
+        environ[CELL_DATA_ENVIRON_KEY] = cell_data
+
+        def _start_response(status, headers, exc_info=None):
+            if cell_data:
+                # the streamed response length is not known
+                headers = [
+                    (name, value)
+                    for name, value in headers
+                    if name.lower() != "content-length"
+                ]
+            return start_response(status, headers, exc_info)
+
+        body = self.application(environ, _start_response)
+        if not cell_data:
+            return body
+        return self._stream(body, cell_data[0])
+
+    def _stream(self, body, cell_data):
+        """Response body with cells chunks in place of :data:`CELL_DATA_MARKER`.
+
+        :param body: spyne response body
+        :param cell_data: CellData chunks iterator
+        :return: iterator of bytes
+        """
+        try:
+            # response without CellData, small
+            document = b"".join(body)
+        finally:
+            if hasattr(body, "close"):
+                body.close()
+        head, marker, tail = document.partition(CELL_DATA_MARKER.encode(self.encoding))
+        if marker and XSI_NAMESPACE not in head and head.endswith(b"<CellData>"):
+            # spyne removes unused namespaces declarations, but cells use xsi:type
+            head = head[: -len(b">")] + b' xmlns:xsi="' + XSI_NAMESPACE + b'">'
+        yield head
+        if marker:
+            yield from cell_data
+        yield tail
@@ -0,0 +1,210 @@
+import os
+
+import pandas as pd
+import pytest
+import sqlalchemy
+from pandas.util.testing import assert_frame_equal
+
+from olapy.core.mdx.executor import MdxEngine
+from olapy.core.mdx.executor.cube_loader_db import CubeLoaderDB
+
+from .db_creation_utils import create_insert
+
+FACTS = """Day;City;Licence;Amount;Count
+May 12,2010;Madrid;Personal;1;84
+May 13,2010;Barcelona;Personal;2;841
+May 14,2010;Paris;Personal;4;2
+May 15,2010;Lausanne;Corporate;8;231
+"""
+
+GEOGRAPHY = """Continent;Country;City
+Europe;Spain;Madrid
+Europe;Spain;Barcelona
+Europe;France;Paris
+Europe;Switzerland;Lausanne
+"""
+
+PRODUCT = """Company;Article;Licence
+Crazy Development;olapy;Corporate
+Crazy Development;olapy;Personal
+"""
+
+QUERY = """SELECT
+    Hierarchize({[Geography].[Geography].[Country].Members}) ON COLUMNS
+    FROM [sales]
+    WHERE ([Measures].[Amount])"""
+
+
+@pytest.fixture
+def olapy_data(tmp_path):
+    cube_path = tmp_path / "cubes" / "sales"
+    cube_path.mkdir(parents=True)
+    for table_name, content in (
+        ("Facts", FACTS),
+        ("Geography", GEOGRAPHY),
+        ("Product", PRODUCT),
+    ):
+        (cube_path / (table_name + ".csv")).write_text(content)
+    return str(tmp_path)
+
+
+def test_csv_cube(olapy_data):
+    executor = MdxEngine(olapy_data_location=olapy_data)
+    executor.load_cube("sales")
+    assert sorted(executor.tables_loaded) == ["Facts", "Geography", "Product"]
+    assert executor.measures == ["Amount", "Count"]
+    assert len(executor.star_schema_dataframe) == 4
+    assert list(executor.execute_mdx(QUERY)["result"]["Amount"]) == [4, 3, 8]
+
+
+def test_cube_snapshot(olapy_data, monkeypatch):
+    executor = MdxEngine(olapy_data_location=olapy_data, cube_snapshots=True)
+    executor.load_cube("sales")
+    snapshot_path = os.path.join(olapy_data, "cubes", "sales.snapshot")
+    assert os.path.isfile(snapshot_path)
+
+    snapshot_executor = MdxEngine(olapy_data_location=olapy_data, cube_snapshots=True)
+
+    def _load_tables(self, sep):
+        raise AssertionError("cube must be loaded from its snapshot")
+
+    monkeypatch.setattr(MdxEngine, "load_tables", _load_tables)
+    snapshot_executor.load_cube("sales")
+    assert snapshot_executor.measures == executor.measures
+    assert_frame_equal(
+        snapshot_executor.star_schema_dataframe, executor.star_schema_dataframe
+    )
+    assert_frame_equal(
+        snapshot_executor.execute_mdx(QUERY)["result"],
+        executor.execute_mdx(QUERY)["result"],
+    )
+    monkeypatch.undo()
+
+    # touched files (same content) don't invalidate the snapshot
+    facts_path = os.path.join(olapy_data, "cubes", "sales", "Facts.csv")
+    os.utime(facts_path, ns=(0, 0))
+    monkeypatch.setattr(MdxEngine, "load_tables", _load_tables)
+    snapshot_executor.load_cube("sales")
+    monkeypatch.undo()
+
+    with open(facts_path, "a") as facts_file:
+        facts_file.write("May 16,2010;Paris;Corporate;16;4\n")
+    snapshot_executor.load_cube("sales")
+    assert len(snapshot_executor.star_schema_dataframe) == 5
+
+    # other csv columns types rebuild the snapshot
+    dtypes_executor = MdxEngine(
+        olapy_data_location=olapy_data,
+        cube_snapshots=True,
+        csv_dtypes={"Facts": {"Amount": "float64"}},
+    )
+    dtypes_executor.load_cube("sales")
+    assert dtypes_executor.star_schema_dataframe["Amount"].dtype == "float64"
+    snapshot_executor.load_cube("sales")
+    assert snapshot_executor.star_schema_dataframe["Amount"].dtype == "int64"
+
+
+def test_csv_files_parsed_once(olapy_data, monkeypatch):
+    read_csv = pd.read_csv
+    parsed_files = []
+
+    def _read_csv(file_path, *args, **kwargs):
+        parsed_files.append(os.path.basename(file_path))
+        return read_csv(file_path, *args, **kwargs)
+
+    monkeypatch.setattr(pd, "read_csv", _read_csv)
+    executor = MdxEngine(
+        olapy_data_location=olapy_data, csv_dtypes={"Facts": {"Amount": "float64"}}
+    )
+    executor.load_cube("sales")
+    assert sorted(parsed_files) == ["Facts.csv", "Geography.csv", "Product.csv"]
+    assert sorted(executor.load_timings) == sorted(parsed_files)
+    assert executor.cube_loader is None
+    assert executor.star_schema_dataframe["Amount"].dtype == "float64"
+    # facts table is not merged with itself
+    assert len(executor.star_schema_dataframe) == 4
+    assert list(executor.execute_mdx(QUERY)["result"]["Amount"]) == [4, 3, 8]
+
+
+def test_parallel_load(olapy_data):
+    executor = MdxEngine(olapy_data_location=olapy_data)
+    executor.load_cube("sales")
+    parallel_executor = MdxEngine(olapy_data_location=olapy_data, load_workers=4)
+    parallel_executor.load_cube("sales")
+    assert list(parallel_executor.tables_loaded) == list(executor.tables_loaded)
+    for table_name, table in executor.tables_loaded.items():
+        assert_frame_equal(parallel_executor.tables_loaded[table_name], table)
+    assert_frame_equal(
+        parallel_executor.star_schema_dataframe, executor.star_schema_dataframe
+    )
+
+
+def test_parallel_load_in_memory_sqlite():
+    cube_loader = CubeLoaderDB(sqlalchemy.create_engine("sqlite://"), workers=4)
+    assert cube_loader.workers == 1
+
+
+def test_db_chunked_load():
+    engine = sqlalchemy.create_engine("sqlite://")
+    create_insert(engine)
+    cube_loader = CubeLoaderDB(engine, chunk_size=3)
+    tables = cube_loader.load_tables()
+    assert sorted(tables) == ["facts", "geography", "product", "time"]
+    for table_name, table in tables.items():
+        expected = pd.read_sql_query(f"SELECT * FROM {table_name}", engine)
+        assert_frame_equal(
+            table,
+            expected[[col for col in expected.columns if col[-3:] != "_id"]],
+        )
+
+    star_schema = cube_loader.construct_star_schema("facts")
+    assert len(star_schema) == 10
+    assert list(star_schema[["amount", "count"]].sum()) == [1023, 1880]
+    assert list(cube_loader.read_table("time", ["year", "month"]).columns) == [
+        "year",
+        "month",
+    ]
+
+
+def test_db_pruned_columns():
+    engine = sqlalchemy.create_engine("sqlite://")
+    engine.execute("CREATE TABLE store (store_id INTEGER, store_name TEXT)")
+    engine.execute(
+        "CREATE TABLE sales (store_id INTEGER, import_id INTEGER, amount INTEGER)"
+    )
+    engine.execute("INSERT INTO store VALUES (1, 'Paris'), (2, 'Madrid')")
+    engine.execute("INSERT INTO sales VALUES (1, 7, 10), (2, 8, 20), (1, 9, 30)")
+    cube_loader = CubeLoaderDB(engine)
+    # import_id is not a join key, so it is not even selected
+    tables = cube_loader.read_tables()
+    assert list(tables["sales"].columns) == ["store_id", "amount"]
+    assert list(tables["store"].columns) == ["store_id", "store_name"]
+    star_schema = cube_loader.construct_star_schema("sales")
+    assert list(star_schema["store_name"]) == ["Paris", "Paris", "Madrid"]
+
+
+def test_db_join_pushdown():
+    engine = sqlalchemy.create_engine("sqlite://")
+    create_insert(engine)
+    star_schema = CubeLoaderDB(engine).construct_star_schema("facts")
+    cube_loader = CubeLoaderDB(engine, join_pushdown=True)
+    assert_frame_equal(
+        cube_loader.construct_star_schema("facts")
+        .sort_values(list(star_schema.columns))
+        .reset_index(drop=True),
+        star_schema.sort_values(list(star_schema.columns)).reset_index(drop=True),
+    )
+    for table_name, table in cube_loader.load_tables().items():
+        assert all(col[-3:] != "_id" for col in table.columns)
+
+    engine = sqlalchemy.create_engine("sqlite://")
+    cube_loader = CubeLoaderDB(engine, join_pushdown=True)
+    engine.execute("CREATE TABLE store (id INTEGER PRIMARY KEY, store_name TEXT)")
+    engine.execute(
+        "CREATE TABLE sales (store_ref INTEGER REFERENCES store (id), amount INTEGER)"
+    )
+    engine.execute("INSERT INTO store VALUES (1, 'Paris'), (2, 'Madrid')")
+    engine.execute("INSERT INTO sales VALUES (1, 10), (2, 20), (1, 30)")
+    star_schema = cube_loader.construct_star_schema("sales").sort_values("amount")
+    assert list(star_schema.columns) == ["store_ref", "amount", "store_name"]
+    assert list(star_schema["store_name"]) == ["Paris", "Madrid", "Paris"]
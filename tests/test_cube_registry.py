@@ -0,0 +1,152 @@
+import threading
+
+import pytest
+
+from olapy.core.mdx.executor import MdxEngine
+from olapy.core.mdx.executor.cube_registry import CubeRegistry, cube_memory
+from olapy.core.services.xmla import get_wsgi_application
+from olapy.core.services.xmla_discover_request_handler import XmlaDiscoverReqHandler
+
+from .test_cube_loader import FACTS, GEOGRAPHY, PRODUCT, QUERY
+from .test_xmla_streaming import EXECUTE_REQUEST, call, cells_values
+
+CUBES = ["sales", "sales_2", "sales_3"]
+
+
+@pytest.fixture
+def olapy_data(tmp_path):
+    for cube in CUBES:
+        cube_path = tmp_path / "cubes" / cube
+        cube_path.mkdir(parents=True)
+        for table_name, content in (
+            ("Facts", FACTS),
+            ("Geography", GEOGRAPHY),
+            ("Product", PRODUCT),
+        ):
+            (cube_path / (table_name + ".csv")).write_text(content)
+    return str(tmp_path)
+
+
+@pytest.fixture
+def loads(monkeypatch):
+    loaded_cubes = []
+    load_cube = MdxEngine.load_cube
+
+    def counted_load_cube(self, cube_name, *args, **kwargs):
+        loaded_cubes.append(cube_name)
+        return load_cube(self, cube_name, *args, **kwargs)
+
+    monkeypatch.setattr(MdxEngine, "load_cube", counted_load_cube)
+    return loaded_cubes
+
+
+def test_cubes_loaded_once(olapy_data, loads):
+    registry = CubeRegistry(MdxEngine(olapy_data_location=olapy_data))
+    sales = registry.get("sales")
+    sales_2 = registry.get("sales_2")
+    assert sales is not sales_2
+    assert registry.get("sales") is sales
+    assert registry.get("sales_2") is sales_2
+    assert loads == ["sales", "sales_2"]
+    assert sales.cube == "sales" and sales_2.cube == "sales_2"
+    assert list(sales.execute(QUERY).result["Amount"]) == [4, 3, 8]
+    assert registry.memory == cube_memory(sales) + cube_memory(sales_2) > 0
+
+
+def test_loaded_engine_registered(olapy_data, loads):
+    engine = MdxEngine(olapy_data_location=olapy_data)
+    engine.load_cube("sales")
+    registry = CubeRegistry(engine)
+    assert "sales" in registry
+    assert registry.get("sales") is engine
+    assert registry.engine.cube is None
+    assert loads == ["sales"]
+
+
+def test_least_recently_used_evicted(olapy_data, loads):
+    registry = CubeRegistry(MdxEngine(olapy_data_location=olapy_data))
+    sales = registry.get("sales")
+    # room for two cubes
+    registry.max_memory = int(cube_memory(sales) * 2.5)
+    registry.get("sales_2")
+    registry.get("sales")
+    registry.get("sales_3")
+    assert list(registry.stats()) == ["sales", "sales_3"]
+    registry.get("sales_2")
+    assert list(registry.stats()) == ["sales_3", "sales_2"]
+    assert loads == ["sales", "sales_2", "sales_3", "sales_2"]
+
+    # the last used cube is kept, even beyond max_memory
+    registry.max_memory = 1
+    registry.evict()
+    assert list(registry.stats()) == ["sales_2"]
+
+
+def test_load_without_blocking(olapy_data, monkeypatch):
+    registry = CubeRegistry(MdxEngine(olapy_data_location=olapy_data))
+    sales = registry.get("sales")
+    loading = threading.Event()
+    loaded = threading.Event()
+    loads = []
+    load_cube = MdxEngine.load_cube
+
+    def slow_load_cube(self, cube_name, *args, **kwargs):
+        loads.append(cube_name)
+        loading.set()
+        assert loaded.wait(10)
+        return load_cube(self, cube_name, *args, **kwargs)
+
+    monkeypatch.setattr(MdxEngine, "load_cube", slow_load_cube)
+    engines = []
+    threads = [
+        threading.Thread(target=lambda: engines.append(registry.get("sales_2")))
+        for _ in range(2)
+    ]
+    for thread in threads:
+        thread.start()
+    assert loading.wait(10)
+    # a loaded cube is available while another one is loaded
+    assert registry.get("sales") is sales
+    loaded.set()
+    for thread in threads:
+        thread.join(10)
+    assert len(engines) == 2 and engines[0] is engines[1]
+    assert loads == ["sales_2"]
+
+
+def test_discover_change_cube(olapy_data, loads):
+    registry = CubeRegistry(MdxEngine(olapy_data_location=olapy_data))
+    discover_handler = XmlaDiscoverReqHandler(registry.engine, registry)
+    for cube in ["sales", "sales_2", "sales", "sales_2"]:
+        discover_handler.change_cube(cube)
+        assert discover_handler.executor.cube == cube
+    assert loads == ["sales", "sales_2"]
+
+
+def test_discover_change_cube_without_registry(olapy_data, loads):
+    engine = MdxEngine(olapy_data_location=olapy_data)
+    discover_handler = XmlaDiscoverReqHandler(engine)
+    for cube in ["sales", "sales_2", "sales"]:
+        discover_handler.change_cube(cube)
+        assert discover_handler.executor is engine
+        assert engine.cube == cube
+    assert loads == ["sales", "sales_2", "sales"]
+
+
+EXECUTE_QUERY = """SELECT
+    {[Geography].[Geography].[Continent].Members} ON COLUMNS
+    FROM [sales]
+    WHERE ([Measures].[Amount])"""
+
+
+def test_execute_catalog(olapy_data, loads):
+    application = get_wsgi_application(
+        MdxEngine(olapy_data_location=olapy_data), cubes_memory=64
+    )
+    for cube in ["sales", "sales_2", "sales", "sales_3", "sales_2"]:
+        body = EXECUTE_REQUEST.format(EXECUTE_QUERY).replace(
+            "<Catalog>main</Catalog>", "<Catalog>{}</Catalog>".format(cube)
+        )
+        response = call(application, body.encode("utf-8"))
+        assert cells_values(response) == ["15"]
+    assert loads == ["sales", "sales_2", "sales_3"]
@@ -0,0 +1,102 @@
+import pytest
+
+from olapy.core.mdx.executor import MdxEngine
+from olapy.core.mdx.executor.cube_registry import CubeRegistry
+from olapy.core.services.models import (
+    DiscoverRequest,
+    Propertieslist,
+    Property,
+    Restriction,
+    Restrictionlist,
+)
+from olapy.core.services.xmla_discover_request_handler import XmlaDiscoverReqHandler
+
+from .test_cube_registry import loads, olapy_data  # noqa: F401
+
+
+def discover_request(request_type, catalog="sales", **restrictions):
+    return DiscoverRequest(
+        RequestType=request_type,
+        Restrictions=Restrictionlist(RestrictionList=Restriction(**restrictions)),
+        Properties=Propertieslist(PropertyList=Property(Catalog=catalog)),
+    )
+
+
+def excel_requests(cube):
+    """Discover requests of an Excel connection (a part of)."""
+    return [
+        discover_request("MDSCHEMA_CUBES", cube, CUBE_NAME=cube),
+        discover_request("DBSCHEMA_TABLES", cube),
+        discover_request(
+            "MDSCHEMA_DIMENSIONS", cube, CUBE_NAME=cube, CATALOG_NAME=cube
+        ),
+        discover_request("MDSCHEMA_HIERARCHIES", cube, CUBE_NAME=cube),
+        discover_request("MDSCHEMA_LEVELS", cube, CUBE_NAME=cube),
+        discover_request("MDSCHEMA_MEASURES", cube, CUBE_NAME=cube),
+        discover_request("MDSCHEMA_PROPERTIES", cube, PROPERTY_TYPE=2),
+        discover_request(
+            "MDSCHEMA_MEMBERS",
+            cube,
+            CUBE_NAME=cube,
+            MEMBER_UNIQUE_NAME="[Geography].[Geography].[Continent].[Europe]",
+        ),
+        discover_request("DISCOVER_DATASOURCES", None),
+    ]
+
+
+def uncached_responses(handler, requests):
+    return [
+        getattr(handler, request.RequestType.lower() + "_response")(request)
+        if request.RequestType != "DISCOVER_DATASOURCES"
+        else handler.discover_datasources_response()
+        for request in requests
+    ]
+
+
+@pytest.mark.parametrize("with_registry", [False, True])
+def test_cached_responses(olapy_data, loads, with_registry):  # noqa: F811
+    requests = excel_requests("sales") * 2 + excel_requests("sales_2")
+    expected = uncached_responses(
+        XmlaDiscoverReqHandler(MdxEngine(olapy_data_location=olapy_data)), requests
+    )
+    del loads[:]
+
+    engine = MdxEngine(olapy_data_location=olapy_data)
+    registry = CubeRegistry(engine) if with_registry else None
+    handler = XmlaDiscoverReqHandler(engine, registry)
+    previous_misses = None
+    for idx in range(3):
+        responses = [handler.discover_response(request) for request in requests]
+        assert responses == expected
+        assert handler.selected_cube == "sales_2"
+        if with_registry:
+            caches = [
+                registry.get(cube).discover_cache for cube in ["sales", "sales_2"]
+            ]
+            misses = sum(cache.misses for cache in caches)
+            if idx == 2:
+                # same requests with the same selected cube as the second round
+                assert misses == previous_misses
+            previous_misses = misses
+    if with_registry:
+        assert loads == ["sales", "sales_2"]
+    else:
+        # one cube at a time
+        assert loads == ["sales", "sales_2"] * 3
+
+
+def test_cache_cleared_with_cube(olapy_data):  # noqa: F811
+    engine = MdxEngine(olapy_data_location=olapy_data)
+    engine.load_cube("sales")
+    handler = XmlaDiscoverReqHandler(engine)
+    handler.discover_response(discover_request("MDSCHEMA_CUBES", CUBE_NAME="sales"))
+    assert handler.selected_cube == "sales"
+    request = discover_request("MDSCHEMA_MEASURES", CUBE_NAME="sales")
+    response = handler.discover_response(request)
+    assert "<MEASURE_NAME>Amount</MEASURE_NAME>" in response
+    assert handler.discover_response(request) == response
+    assert len(engine.discover_cache) == 2
+    assert engine.discover_cache.hits == 1
+
+    engine.load_cube("sales")
+    assert len(engine.discover_cache) == 0
@@ -0,0 +1,270 @@
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+import sqlalchemy
+from pandas.api.types import is_categorical_dtype
+from pandas.util.testing import assert_frame_equal
+
+from olapy.core.mdx.executor import MdxEngine
+from olapy.core.mdx.executor.query_cache import QueryCache
+
+from .db_creation_utils import create_insert, drop_tables
+from .queries import query1, query7, query9, query16, query_posgres1, query_posgres2
+
+
+def _create_executor(**kwargs):
+    engine = sqlalchemy.create_engine("sqlite://")
+    create_insert(engine)
+    mdx_engine = MdxEngine(sqla_engine=engine, source_type="db", **kwargs)
+    mdx_engine.load_cube(cube_name="main", fact_table_name="facts")
+    yield mdx_engine
+    drop_tables(engine)
+
+
+@pytest.fixture(scope="module")
+def categorical_executor():
+    yield from _create_executor(categorical_levels=True)
+
+
+@pytest.fixture(scope="module")
+def aggregates_executor():
+    yield from _create_executor(
+        aggregate_levels=[
+            ["continent", "country", "year"],
+            ["country"],
+            ["year", "quarter", "month", "day"],
+        ]
+    )
+
+
+def test_categorical_levels_dtypes(categorical_executor):
+    star_df = categorical_executor.star_schema_dataframe
+    for column in star_df.columns:
+        if column in categorical_executor.measures:
+            assert not is_categorical_dtype(star_df[column])
+        else:
+            assert is_categorical_dtype(star_df[column])
+    assert is_categorical_dtype(categorical_executor.tables_loaded["geography"]["country"])
+
+
+@pytest.mark.parametrize(
+    "query", [query1, query7, query9, query16, query_posgres1, query_posgres2]
+)
+def test_categorical_levels_same_result(executor, categorical_executor, query):
+    assert_frame_equal(
+        categorical_executor.execute_mdx(query)["result"],
+        executor.execute_mdx(query)["result"],
+    )
+
+
+def test_members_index(executor):
+    members_index = executor.members_index
+    assert members_index.get_level("geography", "France") == "country"
+    assert members_index.get_level("time", 2010) == "year"
+    assert members_index.get_level("geography", "Atlantis") is None
+    assert members_index.member_exists("geography", 0, "Europe")
+    assert not members_index.member_exists("geography", 1, "Europe")
+
+
+def test_members_tree(executor):
+    members_index = executor.members_index
+    assert members_index.level_cardinality("geography", "continent") == 2
+    assert members_index.level_cardinality("geography", "country") == 7
+    assert members_index.level_cardinality("geography", "city") == 14
+    assert executor.facts not in members_index.children
+
+    assert members_index.member_path("geography", ["country", "Europe", "Spain"]) == (
+        "Europe",
+        "Spain",
+    )
+    assert members_index.member_path("geography", ["Europe", "Spain"]) == (
+        "Europe",
+        "Spain",
+    )
+    assert members_index.member_path("geography", ["city", "Europe", "Spain"]) is None
+    assert members_index.member_path("geography", ["Europe", "Canada"]) is None
+    assert members_index.member_path("time", ["2010", "Q2 2010"]) == (
+        "2010",
+        "Q2 2010",
+    )
+
+    assert members_index.get_children("geography", ()) == [
+        ("America",),
+        ("Europe",),
+    ]
+    assert members_index.get_children("geography", ("Europe", "Spain")) == [
+        ("Europe", "Spain", "Barcelona"),
+        ("Europe", "Spain", "Madrid"),
+        ("Europe", "Spain", "Valencia"),
+    ]
+    assert members_index.get_descendants("geography", ("Europe",))[:5] == [
+        ("Europe", "France"),
+        ("Europe", "France", "Paris"),
+        ("Europe", "Spain"),
+        ("Europe", "Spain", "Barcelona"),
+        ("Europe", "Spain", "Madrid"),
+    ]
+    assert len(members_index.get_descendants("geography", ())) == 2 + 7 + 14
+
+
+def test_members_index_matches_columns_scan(executor):
+    for dimension, df in executor.tables_loaded.items():
+        for column in df.columns:
+            for member in df[column].dropna().unique():
+                assert executor.members_index.get_level(
+                    dimension, member
+                ) == executor._get_column_name_from_value(df, member)
+
+
+def test_query_cache(categorical_executor):
+    mdx_engine = categorical_executor
+    mdx_engine.query_cache.clear()
+    hits = mdx_engine.query_cache.hits
+    first = mdx_engine.execute_mdx(query_posgres1)
+    mdx_engine.execute_mdx(query1)
+    result = first["result"]
+    cached = mdx_engine.execute_mdx(query_posgres1)
+    assert cached["result"] is result
+    assert mdx_engine.query_cache.hits == hits + 1
+    # callers get their own dict
+    cached["result"] = None
+    assert mdx_engine.execute_mdx(query_posgres1)["result"] is result
+    # measures of the cached query are selected again
+    assert mdx_engine.selected_measures == ["amount"]
+    assert len(mdx_engine.query_cache) == 2
+
+    mdx_engine.load_cube(cube_name="main", fact_table_name="facts")
+    assert len(mdx_engine.query_cache) == 0
+    assert mdx_engine.execute_mdx(query_posgres1)["result"] is not result
+
+
+def test_query_cache_limits():
+    query_cache = QueryCache(max_size=2)
+    result = {"result": pd.DataFrame({"amount": [1, 2]}), "columns_desc": {}}
+    for key in "abc":
+        query_cache.put(key, (result, ["amount"]))
+    assert query_cache.get("a") is None
+    assert query_cache.get("c") is not None
+    assert len(query_cache) == 2
+
+    query_cache = QueryCache(max_memory=1)
+    query_cache.put("a", (result, ["amount"]))
+    assert len(query_cache) == 0
+
+
+def test_aggregates(aggregates_executor):
+    aggregates = aggregates_executor.aggregates
+    assert len(aggregates) == 3
+    # smallest aggregates first
+    sizes = [len(aggregate) for aggregate in aggregates.aggregates]
+    assert sizes == sorted(sizes)
+    assert aggregates_executor.get_aggregate(
+        [["geography", "geography", "country"]]
+    ) is aggregates.find({"country"}, ["amount"])
+    assert (
+        aggregates_executor.get_aggregate([["product", "product", "company"]])
+        is aggregates_executor.star_schema_dataframe
+    )
+
+
+@pytest.mark.parametrize("query", [query7, query9, query_posgres1, query_posgres2])
+def test_aggregates_same_result(executor, aggregates_executor, query):
+    assert_frame_equal(
+        aggregates_executor.execute_mdx(query)["result"],
+        executor.execute_mdx(query)["result"],
+    )
+
+
+def test_fusion_dataframes(executor):
+    chunks = [
+        pd.DataFrame({"continent": ["Europe"], "amount": [1]}),
+        pd.DataFrame({"continent": ["Europe"], "country": ["Spain"], "amount": [2]}),
+        pd.DataFrame({"continent": ["America"], "amount": [4]}),
+        pd.DataFrame({"company": ["Crazy Development"], "amount": [8]}),
+        pd.DataFrame(
+            {
+                "year": [2010],
+                "quarter": ["Q2 2010"],
+                "month": ["May 2010"],
+                "day": ["May 12,2010"],
+                "amount": [16],
+            }
+        ),
+    ]
+    # chunks concatenated one by one
+    expected = chunks[0]
+    for chunk in chunks[1:]:
+        expected = pd.concat(executor.add_missed_column(expected, chunk), sort=False)
+
+    df = executor.fusion_dataframes(chunks)
+    # same columns order too
+    assert_frame_equal(df, expected)
+    # chunks with less columns are concatenated first
+    assert list(df["amount"]) == [8, 4, 1, 2, 16]
+    assert list(df["country"][:4]) == [-1, -1, -1, "Spain"]
+    # chunks are not modified
+    assert list(chunks[0].columns) == ["continent", "amount"]
+
+
+def test_execute_sibling_tuples(executor):
+    siblings = [
+        ["geography", "geography", "continent", "Europe", country]
+        for country in ["Switzerland", "France", "United States", "Spain"]
+    ]
+    columns_to_keep = OrderedDict([("geography", ["continent", "country"])])
+    executor.clean_mdx_query("SELECT FROM [main]")
+    chunks = executor.execute_sibling_tuples(
+        siblings, executor.star_schema_dataframe, columns_to_keep
+    )
+    assert len(chunks) == 4
+    for tupl, chunk in zip(siblings, chunks):
+        assert_frame_equal(
+            chunk,
+            executor.execute_one_tuple(
+                tupl, executor.star_schema_dataframe, columns_to_keep.values()
+            ),
+        )
+    assert list(chunks[0]["amount"]) == [8, 16, 128, 32, 64]
+    # United States is not in Europe
+    assert chunks[2].empty
+
+
+def test_reentrant_execute(executor):
+    mdx_query = executor.parser.mdx_query
+    selected_measures = list(executor.selected_measures)
+    count_query = """
+    SELECT {[geography].[geography].[continent].Members} ON COLUMNS
+    FROM [main]
+    WHERE ([Measures].[count])
+    """
+    context = executor.execute(count_query)
+    assert context.selected_measures == ("count",)
+    assert list(context.result.columns) == ["count"]
+    assert context.executor.parser.mdx_query == context.mdx_query
+    # the engine state is not changed
+    assert executor.parser.mdx_query == mdx_query
+    assert executor.selected_measures == selected_measures
+
+    # queries without measures use the given selected measures
+    context = executor.execute(query16, selected_measures=["count"])
+    assert list(context.result.columns) == ["count"]
+
+    queries = [count_query, query1, query7, query9, query16] * 4
+    expected = [executor.execute(query).result for query in queries]
+    executor.query_cache.clear()
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        contexts = list(pool.map(executor.execute, queries))
+    for context, result in zip(contexts, expected):
+        assert_frame_equal(context.result, result)
+
+
+def test_query_cache_without_measures(executor, monkeypatch):
+    mdx_engine = executor.query_executor()
+    mdx_engine.selected_measures = None
+    monkeypatch.setattr(MdxEngine, "sum_measures", lambda self: pd.DataFrame())
+    query = "SELECT FROM [main]"
+    assert mdx_engine.execute_mdx(query)["result"].empty
+    assert mdx_engine.execute_mdx(query)["result"].empty
+    assert mdx_engine.selected_measures == []
@@ -1,7 +1,9 @@
-from pytest import fixture
+from pytest import fixture, mark
 
 from olapy.core.mdx.parser import MdxParser
+from olapy.core.mdx.parser.mdx_ast import Member, parse_query
 
+from . import queries
 from .queries import query1, query2, query3, query4, query5, query6, where
 
 
@@ -171,3 +173,80 @@ def test_parsing_query6(parser):
         ["time", "time", "quarter", "2010", "Q2 2010"],
         ["time", "time", "month", "2010", "Q2 2010", "May 2010"],
     ]
+
+
+@mark.parametrize(
+    "query",
+    [
+        getattr(queries, name)
+        for name in sorted(dir(queries))
+        if name.startswith("query")
+    ],
+)
+def test_syntax_tree_same_tuples(parser, query):
+    # queries parsed with the syntax tree, or REGEX, have the same tuples
+    for mdx_query in (query, query.strip().replace("\n", "").replace("\t", "")):
+        assert parse_query(mdx_query) is not None
+        assert parser.decorticate_query(mdx_query) == parser.decorticate_query_regex(
+            mdx_query
+        )
+
+
+def test_syntax_tree():
+    statement = parse_query(query6)
+    assert statement is parse_query(query6)
+    assert statement.cube == "sales"
+    assert [axis.name for axis in statement.axes] == ["columns"]
+    assert statement.axes[0].non_empty
+    assert statement.axes[0].dimension_properties == (
+        "PARENT_UNIQUE_NAME",
+        "HIERARCHY_UNIQUE_NAME",
+    )
+    assert statement.where.items == (Member(("Measures", "amount")),)
+    assert statement.cell_properties[:2] == ("VALUE", "FORMAT_STRING")
+    assert statement.hierarchized
+
+    assert MdxParser(query6).non_empty_axes() == ["columns"]
+    assert MdxParser(queries.query14).non_empty_axes() == ["rows"]
+    # not parsed queries
+    assert MdxParser(
+        "WITH MEMBER [Measures].[x] AS 1 SELECT {[Measures].[x]} ON 0, "
+        "NON EMPTY {[geography].[geography].Members} ON ROWS FROM [sales]"
+    ).non_empty_axes() == ["rows"]
+
+    parser = MdxParser(queries.query7.strip())
+    assert not parser.hierarchized_tuples()
+    assert parser.non_empty_axes() == []
+    assert len(parser.get_nested_select()) == 8
+    assert parser.get_nested_select()[0].strip().startswith(
+        "[product].[product].[company].[Crazy Development],"
+    )
+
+    # [Measures] alone is not a tuple, .Children is not a member name
+    statement = parse_query(
+        "SELECT {[Geo].[Geo].[All Regions].&[Europe].Children} * {[Measures]} ON 0 "
+        "FROM [sales]"
+    )
+    assert statement.axes_tuples("columns") == (("Geo", "Geo", "Regions", "Europe"),)
+    assert not statement.hierarchized
+
+
+def test_hierarchized_tuples():
+    # Hierarchize is searched in the whole query, with its case
+    assert MdxParser(
+        "SELECT {[geography].[geography].[continent].Members} ON 0 FROM [sales] "
+        "WHERE (Hierarchize({[Measures].[amount]}))"
+    ).hierarchized_tuples()
+    assert not MdxParser(
+        "SELECT hierarchize({[geography].[geography].[continent].Members}) ON 0 "
+        "FROM [sales]"
+    ).hierarchized_tuples()
+
+
+def test_syntax_tree_unsupported_query(parser):
+    query = (
+        "WITH MEMBER [Measures].[Double] AS [Measures].[amount] * 2 "
+        "SELECT {[Measures].[Double]} ON COLUMNS FROM [sales]"
+    )
+    assert parse_query(query) is None
+    assert parser.decorticate_query(query) == parser.decorticate_query_regex(query)
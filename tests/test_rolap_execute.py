@@ -0,0 +1,95 @@
+import pytest
+import sqlalchemy
+from pandas.util.testing import assert_frame_equal
+
+from olapy.core.mdx.executor.rolap_execute import RolapMdxEngine
+
+from .db_creation_utils import create_insert, drop_tables
+from .queries import (
+    query1,
+    query3,
+    query6,
+    query7,
+    query9,
+    query14,
+    query16,
+    query_posgres1,
+    query_posgres2,
+    query_postgres3,
+)
+
+
+@pytest.fixture(scope="module")
+def rolap_executor():
+    engine = sqlalchemy.create_engine("sqlite://")
+    create_insert(engine)
+    mdx_engine = RolapMdxEngine(sqla_engine=engine, source_type="db")
+    mdx_engine.load_cube(cube_name="main", fact_table_name="facts")
+    yield mdx_engine
+    drop_tables(engine)
+
+
+def test_rolap_load_cube(executor, rolap_executor):
+    assert rolap_executor.star_schema_dataframe is None
+    assert rolap_executor.measures == executor.measures
+    assert list(rolap_executor.tables_loaded) == list(executor.tables_loaded)
+    assert rolap_executor.tables_loaded["facts"].empty
+    assert_frame_equal(
+        rolap_executor.tables_loaded["geography"], executor.tables_loaded["geography"]
+    )
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        query1,
+        query3,
+        query6,
+        query7,
+        query9,
+        query14,
+        query16,
+        query_posgres1,
+        query_posgres2,
+        query_postgres3,
+    ],
+)
+def test_rolap_same_result(executor, rolap_executor, query):
+    result = executor.execute_mdx(query)
+    rolap_result = rolap_executor.execute_mdx(query)
+    assert_frame_equal(rolap_result["result"], result["result"])
+    assert str(rolap_result["columns_desc"]) == str(result["columns_desc"])
+
+
+def test_rolap_sibling_tuples(executor, rolap_executor, monkeypatch):
+    query = """
+    SELECT
+    {[geography].[geography].[continent].[Europe].[Spain],
+    [geography].[geography].[continent].[Europe].[France],
+    [geography].[geography].[continent].[America].[Mexico],
+    [geography].[geography].[continent].[America].[Canada]} ON COLUMNS,
+    {[product].[product].[company].[Crazy Development].[olapy].[Personal],
+    [product].[product].[company].[Crazy Development].[olapy].[Corporate]} ON ROWS
+    FROM [sales]
+    WHERE ([Measures].[amount])
+    """
+    queries = []
+    get_query = RolapMdxEngine.get_query
+
+    def _get_query(self, chunks, columns):
+        sql_query, params = get_query(self, chunks, columns)
+        queries.append(sql_query)
+        return sql_query, params
+
+    monkeypatch.setattr(RolapMdxEngine, "get_query", _get_query)
+    result = executor.execute_mdx(query)
+    rolap_result = rolap_executor.execute_mdx(query)
+    assert_frame_equal(rolap_result["result"], result["result"])
+    # one branch per continent, for all products and countries
+    assert queries[0].count(" UNION ALL ") == 1
+    assert queries[0].count(" IN (") == 4
+    # tuples positions are not kept between queries
+    rolap_executor.query_cache.clear()
+    rolap_executor.execute_mdx(query7)
+    rolap_executor.execute_mdx(query)
+    assert queries[-1] == queries[0]
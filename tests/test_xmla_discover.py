@@ -0,0 +1,101 @@
+from lxml import etree
+
+from olapy.core.services.dict_discover_request_handler import (
+    MDTREEOP_ANCESTORS,
+    MDTREEOP_CHILDREN,
+    MDTREEOP_DESCENDANTS,
+    MDTREEOP_SELF,
+    MDTREEOP_SIBLINGS,
+    DictDiscoverReqHandler,
+)
+from olapy.core.services.xmla_discover_request_handler import XmlaDiscoverReqHandler
+
+from .test_discover_cache import discover_request
+
+SPAIN = "[geography].[geography].[country].[Europe].[Spain]"
+
+
+def rows(response):
+    document = etree.fromstring(response)
+    return [
+        {etree.QName(child).localname: child.text for child in row}
+        for row in document.iter("{urn:schemas-microsoft-com:xml-analysis:rowset}row")
+    ]
+
+
+def selected_handler(handler_class, executor):
+    handler = handler_class(executor)
+    # the executor cube is the selected cube (without changing the database)
+    handler.selected_cube = executor.cube
+    return handler
+
+
+def test_levels_cardinality(executor):
+    handler = selected_handler(XmlaDiscoverReqHandler, executor)
+    response = handler.mdschema_levels_response(
+        discover_request("MDSCHEMA_LEVELS", "main", CUBE_NAME="main")
+    )
+    cardinalities = {
+        row["LEVEL_UNIQUE_NAME"]: row["LEVEL_CARDINALITY"] for row in rows(response)
+    }
+    assert cardinalities["[geography].[geography].[continent]"] == "2"
+    assert cardinalities["[geography].[geography].[city]"] == "14"
+    assert cardinalities["[time].[time].[day]"] == "10"
+
+
+def test_tree_op_members(executor):
+    handler = selected_handler(DictDiscoverReqHandler, executor)
+
+    def members(member_unique_name, tree_op):
+        return [
+            row["MEMBER_UNIQUE_NAME"]
+            for row in handler.mdschema_members_response(
+                discover_request(
+                    "MDSCHEMA_MEMBERS",
+                    "main",
+                    CUBE_NAME="main",
+                    MEMBER_UNIQUE_NAME=member_unique_name,
+                    TREE_OP=tree_op,
+                )
+            )
+        ]
+
+    assert members(SPAIN, MDTREEOP_CHILDREN) == [
+        "[geography].[geography].[city].[Europe].[Spain].[Barcelona]",
+        "[geography].[geography].[city].[Europe].[Spain].[Madrid]",
+        "[geography].[geography].[city].[Europe].[Spain].[Valencia]",
+    ]
+    assert members(SPAIN, MDTREEOP_SIBLINGS) == [
+        "[geography].[geography].[country].[Europe].[France]",
+        "[geography].[geography].[country].[Europe].[Switzerland]",
+    ]
+    assert members(SPAIN, MDTREEOP_ANCESTORS | MDTREEOP_SELF) == [
+        "[geography].[geography].[continent].[Europe]",
+        SPAIN,
+    ]
+    europe = members("[geography].[geography].[Europe]", MDTREEOP_DESCENDANTS)
+    assert len(europe) == 3 + 7
+    assert members("[geography].[geography].[Atlantis]", MDTREEOP_CHILDREN) == []
+
+
+def test_tree_op_members_response(executor):
+    handler = selected_handler(XmlaDiscoverReqHandler, executor)
+    response = handler.mdschema_members_response(
+        discover_request(
+            "MDSCHEMA_MEMBERS",
+            "main",
+            CUBE_NAME="main",
+            MEMBER_UNIQUE_NAME="[geography].[geography].[continent].[Europe]",
+            TREE_OP=MDTREEOP_CHILDREN,
+        )
+    )
+    france = rows(response)[0]
+    assert len(rows(response)) == 3
+    assert france["MEMBER_NAME"] == "France"
+    assert france["LEVEL_UNIQUE_NAME"] == "[geography].[geography].[country]"
+    assert france["LEVEL_NUMBER"] == "1"
+    assert france["CHILDREN_CARDINALITY"] == "1"
+    assert france["PARENT_COUNT"] == "1"
+    assert france["PARENT_UNIQUE_NAME"] == (
+        "[geography].[geography].[continent].[Europe]"
+    )
@@ -1,4 +1,15 @@
-from olapy.core.services.xmla_lib import get_response
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from olapy.core.mdx.executor import utils
+from olapy.core.services.xmla_lib import PreparedCube, get_response
+
+from .queries import query12, query14, query15
+from .test_cube_loader import FACTS, GEOGRAPHY, PRODUCT
+from .test_cube_registry import EXECUTE_QUERY
 
 
 def test_dict_execute(executor):
@@ -54,3 +65,79 @@ def test_dict_discover(executor):
             "Value": "Mouadh",
         }
     ]
+
+
+@pytest.mark.parametrize("query", [query12, query14, query15])
+def test_numpy_execute(executor, query):
+    xmla_request_params = {
+        "cube": "sales",
+        "properties": {"Catalog": "sales"},
+        "mdx_query": query,
+    }
+    responses = {
+        output: get_response(
+            xmla_request_params,
+            executor.tables_loaded,
+            output=output,
+            facts_table_name="facts",
+            mdx_engine=executor,
+        )
+        for output in ["dict", "numpy"]
+    }
+    cell_data = responses["numpy"]["cell_data"]
+    assert isinstance(cell_data, np.ndarray)
+    assert cell_data.ravel().tolist() == responses["dict"]["cell_data"]
+    tuples = responses["numpy"]["tuples"]
+    measures = responses["numpy"]["measures"]
+    assert all(len(members) in cell_data.shape for members in tuples.values())
+    assert len(measures) in cell_data.shape
+    assert responses["numpy"]["axes_info"] == responses["dict"]["axes_info"]
+
+
+def test_prepared_cube(monkeypatch):
+    dataframes = {
+        name: pd.read_csv(io.StringIO(content), sep=";")
+        for name, content in (
+            ("Facts", FACTS),
+            ("Geography", GEOGRAPHY),
+            ("Product", PRODUCT),
+        )
+    }
+    # amounts like "1 349", converted to numbers by the engine
+    dataframes["Facts"]["Amount"] = dataframes["Facts"]["Amount"].astype(str)
+    facts = dataframes["Facts"].copy()
+
+    star_schemas = []
+    get_star_schema_dataframe = utils._get_star_schema_dataframe
+
+    def counted_get_star_schema_dataframe(*args, **kwargs):
+        star_schemas.append(1)
+        return get_star_schema_dataframe(*args, **kwargs)
+
+    monkeypatch.setattr(
+        utils, "_get_star_schema_dataframe", counted_get_star_schema_dataframe
+    )
+
+    cube = PreparedCube(dataframes)
+    for _ in range(3):
+        execute_response = cube.get_response(
+            {"cube": "sales", "properties": {}, "mdx_query": EXECUTE_QUERY}
+        )
+        assert execute_response["cell_data"] == [15]
+        discover_response = cube.get_response(
+            {
+                "cube": "sales",
+                "request_type": "MDSCHEMA_MEASURES",
+                "properties": {"Catalog": "sales"},
+                "restrictions": {"CUBE_NAME": "sales"},
+                "mdx_query": None,
+            }
+        )
+        assert [row["MEASURE_NAME"] for row in discover_response] == [
+            "Amount",
+            "Count",
+        ]
+    assert len(star_schemas) == 1
+    assert cube.mdx_engine.query_cache.hits == 2
+    # injected DataFrames are not changed
+    pd.testing.assert_frame_equal(dataframes["Facts"], facts)
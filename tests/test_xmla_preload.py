@@ -0,0 +1,121 @@
+from olapy.core.mdx.executor import MdxEngine
+from olapy.core.mdx.executor.cube_registry import CubeRegistry
+from olapy.core.services.xmla import get_wsgi_application
+from olapy.core.services.xmla_discover_request_handler import XmlaDiscoverReqHandler
+from olapy.core.services.xmla_preload import (
+    CubePreloader,
+    ReadinessMiddleware,
+    query_cube,
+    read_logged_queries,
+    read_preload_options,
+    read_warmup_queries,
+)
+
+from .test_cube_loader import QUERY
+from .test_cube_registry import EXECUTE_QUERY, loads, olapy_data  # noqa: F401
+from .test_xmla_streaming import EXECUTE_REQUEST, call, cells_values
+
+
+def get_ready(application):
+    environ = {"REQUEST_METHOD": "GET", "PATH_INFO": "/ready"}
+    response = {}
+
+    def start_response(status, headers, exc_info=None):
+        response["status"] = status
+
+    response["body"] = b"".join(application(environ, start_response))
+    return response
+
+
+def test_warmup_queries_file(tmp_path):
+    queries_file = tmp_path / "queries.mdx"
+    queries_file.write_text(QUERY + "\n\n  \n" + EXECUTE_QUERY + "\n")
+    assert read_warmup_queries(str(queries_file)) == [QUERY, EXECUTE_QUERY]
+    assert query_cube(QUERY) == "sales"
+    assert query_cube("SELECT {} ON 0 FROM (SELECT {} ON 0 FROM [sales_2])") == (
+        "sales_2"
+    )
+
+
+def test_logged_queries(tmp_path):
+    log_file = tmp_path / "xmla.log"
+    logged_request = "DEBUG:spyne.protocol.xml:{!r}\n".format(
+        EXECUTE_REQUEST.format("{} &amp; 1").encode("utf-8")
+    )
+    log_file.write_text(
+        logged_request.format("SELECT\n    [a]")
+        + logged_request.format("SELECT [b]") * 2
+        + "DEBUG:spyne.interface._base:    adding Command.Statement = Unicode\n"
+    )
+    assert read_logged_queries(str(log_file)) == [
+        "SELECT [b] & 1",
+        "SELECT\n    [a] & 1",
+    ]
+    assert read_logged_queries(str(log_file), top=1) == ["SELECT [b] & 1"]
+
+
+def test_preload_options(tmp_path):
+    queries_file = tmp_path / "queries.mdx"
+    queries_file.write_text(QUERY + "\n")
+    assert read_preload_options("sales, ,sales_2, ", str(queries_file)) == (
+        ["sales", "sales_2"],
+        [QUERY],
+    )
+    assert read_preload_options(None, None, str(tmp_path / "missing.log")) == ([], [])
+
+
+def test_preload_cubes(olapy_data, loads):  # noqa: F811
+    registry = CubeRegistry(MdxEngine(olapy_data_location=olapy_data))
+    discover_handler = XmlaDiscoverReqHandler(registry.engine, registry)
+    preloader = CubePreloader(
+        discover_handler,
+        ["sales_2"],
+        [
+            EXECUTE_QUERY,
+            EXECUTE_QUERY.replace("[sales]", "[sales_3]"),
+            "SELECT {[Unknown].[Unknown].Members} ON COLUMNS FROM [sales]",
+            # without cube
+            "SELECT ;",
+        ],
+    )
+    application = ReadinessMiddleware(lambda environ, start_response: [], preloader)
+    assert get_ready(application)["status"].startswith("503")
+
+    preloader.start()
+    assert preloader.ready.wait(10)
+    assert get_ready(application) == {"status": "200 OK", "body": b"ready\n"}
+    assert loads == ["sales_2", "sales", "sales_3"]
+    assert len(registry.get("sales").query_cache) == 1
+    assert len(registry.get("sales_2").query_cache) == 0
+    # failed warmup queries don't stop preloading
+    assert [query for query, _ in preloader.errors] == [
+        "SELECT {[Unknown].[Unknown].Members} ON COLUMNS FROM [sales]"
+    ]
+
+
+def test_preload_all_without_registry(olapy_data, loads):  # noqa: F811
+    engine = MdxEngine(olapy_data_location=olapy_data)
+    preloader = CubePreloader(XmlaDiscoverReqHandler(engine), ["all"])
+    preloader.run()
+    # the engine keeps one cube
+    assert loads == [preloader.cubes[0]]
+    assert engine.cube == preloader.cubes[0]
+
+
+def test_ready_application(olapy_data, loads):  # noqa: F811
+    application = get_wsgi_application(
+        MdxEngine(olapy_data_location=olapy_data),
+        cubes_memory=64,
+        preload_cubes=["sales"],
+    )
+    for _ in range(100):
+        response = get_ready(application)
+        if response["status"] == "200 OK":
+            break
+        assert response["status"].startswith("503")
+        assert response["body"].startswith(b"loading")
+        application.application.preloader.ready.wait(0.1)
+    assert response["status"] == "200 OK"
+    body = EXECUTE_REQUEST.format(EXECUTE_QUERY).replace("main", "sales")
+    assert cells_values(call(application, body.encode("utf-8"))) == ["15"]
+    assert loads == ["sales"]
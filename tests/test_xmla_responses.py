@@ -5,7 +5,15 @@ import xmlwitch
 
 from olapy.core.services.xmla_execute_request_handler import XmlaExecuteReqHandler
 
-from .queries import query11, query12, query14, query15
+from .queries import (
+    query6,
+    query11,
+    query12,
+    query14,
+    query15,
+    query16,
+    query_posgres2,
+)
 
 sqlalchemy = pytest.importorskip("sqlalchemy")
 
@@ -138,6 +146,108 @@ def test_query15_cell_data(executor):
     assert str(xml) == xmla_tools.generate_cell_data()
 
 
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 1000])
+def test_cell_data_chunks(executor, chunk_size):
+    xmla_tools = XmlaExecuteReqHandler(executor, query15, False)
+    chunks = list(xmla_tools.iter_cell_data(chunk_size=chunk_size))
+    assert len(chunks) == -(-5 // chunk_size)
+    assert b"".join(chunks).decode("utf-8") == xmla_tools.generate_cell_data()
+
+
+def _with_empty_cells(monkeypatch, executor, empty_cells):
+    """Executions results with NaN values at (row, column) positions."""
+    execute_mdx = type(executor).execute_mdx
+
+    def execute_mdx_with_empty_cells(self, mdx_query):
+        execution_result = execute_mdx(self, mdx_query)
+        result = execution_result["result"].astype(float)
+        for row, column in empty_cells:
+            result.iloc[row, column] = float("nan")
+        return dict(execution_result, result=result)
+
+    monkeypatch.setattr(type(executor), "execute_mdx", execute_mdx_with_empty_cells)
+
+
+def _cell_ordinals(cell_data):
+    return [
+        int(line.split('"')[1])
+        for line in cell_data.splitlines()
+        if line.startswith("<Cell ")
+    ]
+
+
+def test_empty_cells(executor, monkeypatch):
+    # query15 cells are written horizontally (one measure), without NON EMPTY axes
+    # empty cells are written with empty values
+    _with_empty_cells(monkeypatch, executor, [(0, 0), (3, 0)])
+    xmla_tools = XmlaExecuteReqHandler(executor, query15, False)
+    assert len(xmla_tools.mdx_execution_result["result"]) == 5
+    cell_data = xmla_tools.generate_cell_data()
+    assert _cell_ordinals(cell_data) == [0, 1, 2, 3, 4]
+    assert cell_data.startswith(
+        '<Cell CellOrdinal="0">\n  <Value xsi:type="xsi:long" />\n</Cell>'
+    )
+    assert cell_data.count('<Value xsi:type="xsi:long" />') == 2
+    for chunk_size in [1, 2, 1000]:
+        chunks = xmla_tools.iter_cell_data(chunk_size=chunk_size)
+        assert b"".join(chunks).decode("utf-8") == cell_data
+
+
+def test_non_empty_tuples(executor, monkeypatch):
+    # NON EMPTY rows, 2 measures cells written vertically
+    _with_empty_cells(monkeypatch, executor, [(0, 0), (1, 0), (1, 1), (3, 1)])
+    xmla_tools = XmlaExecuteReqHandler(executor, query14, False)
+    result = xmla_tools.mdx_execution_result["result"]
+    assert len(result) == 4
+    assert len(xmla_tools.context.execution_result["result"]) == 5
+    # 2 measures tuples, and 4 rows tuples
+    assert xmla_tools.generate_xs0().count("<Tuple>") == 6
+    # (0, 1), (2, 0), (2, 1), (3, 0), (4, 0), (4, 1) once the empty row removed,
+    # other empty cells are not written
+    cell_data = xmla_tools.generate_cell_data()
+    assert _cell_ordinals(cell_data) == [1, 2, 3, 4, 6, 7]
+    assert cell_data.startswith('<Cell CellOrdinal="1">')
+    for chunk_size in [1, 3, 1000]:
+        chunks = xmla_tools.iter_cell_data(chunk_size=chunk_size)
+        assert b"".join(chunks).decode("utf-8") == cell_data
+
+
+def test_non_empty_measures_axis(executor, monkeypatch):
+    # NON EMPTY measures, rows empty tuples are kept
+    _with_empty_cells(monkeypatch, executor, [(0, 0), (0, 1), (1, 1)])
+    query = """SELECT NON EMPTY {[Measures].[amount], [Measures].[count]} ON COLUMNS,
+        {[geography].[geography].[continent].Members} ON ROWS
+        FROM [sales]"""
+    xmla_tools = XmlaExecuteReqHandler(executor, query, False)
+    result = xmla_tools.mdx_execution_result["result"]
+    assert list(result.columns) == ["amount"]
+    assert len(result) == 2
+    assert xmla_tools.executor.selected_measures == ["amount"]
+    assert "[Measures].[count]" not in xmla_tools.generate_xs0()
+    assert _cell_ordinals(xmla_tools.generate_cell_data()) == [1]
+
+
+@pytest.mark.parametrize(
+    "product_axis, geography_axis, tuples",
+    [
+        ("", "", 2),
+        ("", "NON EMPTY", 1),
+        ("NON EMPTY", "", 2),
+    ],
+)
+def test_non_empty_one_axis(
+    executor, monkeypatch, product_axis, geography_axis, tuples
+):
+    # the (Europe, Crazy Development) cell is empty, Crazy Development has other cells
+    _with_empty_cells(monkeypatch, executor, [(0, 0)])
+    query = f"""SELECT
+        {product_axis} {{[product].[product].[company].Members}} ON COLUMNS,
+        {geography_axis} {{[geography].[geography].[continent].Members}} ON ROWS
+        FROM [sales] WHERE ([Measures].[amount])"""
+    xmla_tools = XmlaExecuteReqHandler(executor, query, False)
+    assert len(xmla_tools.mdx_execution_result["result"]) == tuples
+
+
 #
 # Test xs0 responses
 #
@@ -256,3 +366,86 @@ def test_query15_xs0(executor):
 
     xmla_tools = XmlaExecuteReqHandler(executor, query15, False)
     assert str(xml) == xmla_tools.generate_xs0()
+
+
+def test_query_plan(executor, monkeypatch):
+    xmla_tools = XmlaExecuteReqHandler(executor, query15, False)
+    query_plan = xmla_tools.query_plan
+    assert not query_plan.hierarchized
+    # select (...) (...) (...) query
+    assert len(query_plan.nested_select) == 5
+    assert len(query_plan.query_axes["columns"]) == 15
+    expected_xs0 = xmla_tools.generate_xs0()
+    assert query_plan.split_df is not None
+
+    def _parse_again(*args, **kwargs):
+        raise AssertionError("the query is parsed once per request")
+
+    # generators only use the request query plan
+    monkeypatch.setattr(type(executor.parser), "decorticate_query", _parse_again)
+    monkeypatch.setattr(type(executor.parser), "hierarchized_tuples", _parse_again)
+    monkeypatch.setattr(type(executor.parser), "get_nested_select", _parse_again)
+    assert xmla_tools.generate_xs0() == expected_xs0
+    xmla_tools.generate_axes_info()
+    xmla_tools.generate_axes_info_slicer()
+    xmla_tools.generate_slicer_axis()
+
+
+def test_query_plan_properties(executor):
+    # dimensions members properties are matched in any case, measures ones in upper case
+    query = """SELECT {[geography].[geography].[continent].Members}
+        DIMENSION PROPERTIES parent_unique_name, hierarchy_unique_name ON COLUMNS
+        FROM [sales]"""
+    query_plan = XmlaExecuteReqHandler(executor, query, False).query_plan
+    assert query_plan.parent_unique_name
+    assert query_plan.hierarchy_unique_name
+    assert not query_plan.measures_parent_unique_name
+    assert not query_plan.measures_hierarchy_unique_name
+
+    query = query.replace("parent_unique_name", "PARENT_UNIQUE_NAME").replace(
+        "hierarchy_unique_name", "HIERARCHY_UNIQUE_NAME"
+    )
+    query_plan = XmlaExecuteReqHandler(executor, query, False).query_plan
+    assert query_plan.measures_parent_unique_name
+    assert query_plan.measures_hierarchy_unique_name
+
+
+def test_request_handler(executor):
+    mdx_query = executor.parser.mdx_query
+    xmla_tools = XmlaExecuteReqHandler(executor)
+    request_handler = xmla_tools.request_handler()
+    request_handler.execute_mdx_query(query15)
+    assert request_handler.context.mdx_query == request_handler.executor.parser.mdx_query
+    assert executor.parser.mdx_query == mdx_query
+    assert request_handler.generate_cell_data() == XmlaExecuteReqHandler(
+        executor, query15
+    ).generate_cell_data()
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        query6,
+        query14,
+        query15,
+        query16,
+        query_posgres2,
+        # without Hierarchize, axes tuples contain measures
+        query15.replace("Hierarchize", ""),
+    ],
+)
+def test_xs0_column_serializer(executor, query):
+    # same axes xml as xmlwitch, tuple by tuple
+    xmla_tools = XmlaExecuteReqHandler(executor, query, False)
+    split_df = xmla_tools.split_dataframe()
+    for mdx_query_axis in ("columns", "rows"):
+        if not xmla_tools.columns_desc[mdx_query_axis]:
+            continue
+        xml = xmla_tools._serialize_axis(split_df, mdx_query_axis, "Axis0")
+        if xml is None:
+            # measures only axis, serialized by tuples_2_xs0
+            continue
+        tuples, first_att = xmla_tools._generate_tuples_xs0(split_df, mdx_query_axis)
+        assert xml == str(
+            xmla_tools.tuples_2_xs0(tuples, split_df, first_att, "Axis0")
+        )
@@ -0,0 +1,104 @@
+import http.client
+import socket
+import threading
+
+import pytest
+
+from olapy.core.services.xmla_server import make_threaded_server
+
+
+@pytest.fixture
+def server(request):
+    release = threading.Event()
+
+    def application(environ, start_response):
+        # only the first byte of the body
+        body = environ["wsgi.input"].read(1)
+        if environ["PATH_INFO"] == "/slow":
+            release.wait(5)
+        if environ["PATH_INFO"] == "/stream":
+            # no Content-Length
+            start_response("200 OK", [("Content-Type", "text/plain")])
+            return iter([b"first ", b"second ", body + b"hird"])
+        start_response("200 OK", [("Content-Length", str(len(body) + 2))])
+        return [b"ok" + body]
+
+    server = make_threaded_server(
+        "127.0.0.1", 0, application, workers=2, request_timeout=0.5
+    )
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    yield server, release
+    release.set()
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+def test_keep_alive(server):
+    server, _ = server
+    connection = http.client.HTTPConnection(*server.server_address)
+    for body in (b"1", b"2"):
+        # the end of the body is not read by the application
+        connection.request("POST", "/", body=body + b"unread")
+        assert connection.getresponse().read() == b"ok" + body
+    connection.request("POST", "/stream", body=b"third")
+    response = connection.getresponse()
+    assert response.getheader("Transfer-Encoding") == "chunked"
+    assert response.read() == b"first second third"
+    connection.close()
+
+
+def test_concurrent_requests(server):
+    server, release = server
+    slow_connection = http.client.HTTPConnection(*server.server_address)
+    slow_connection.request("GET", "/slow")
+
+    connection = http.client.HTTPConnection(*server.server_address, timeout=2)
+    connection.request("GET", "/")
+    assert connection.getresponse().read() == b"ok"
+    release.set()
+    assert slow_connection.getresponse().read() == b"ok"
+
+
+def test_request_timeout(server):
+    server, _ = server
+    client = socket.create_connection(server.server_address)
+    client.settimeout(5)
+    # idle connection closed by the server
+    assert client.recv(1024) == b""
+    client.close()
+
+
+def test_idle_connections_release_workers():
+    def application(environ, start_response):
+        start_response("200 OK", [("Content-Length", "2")])
+        return [b"ok"]
+
+    # one worker, idle connections are kept 5 seconds
+    server = make_threaded_server(
+        "127.0.0.1", 0, application, workers=1, request_timeout=5
+    )
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    try:
+        idle_connections = []
+        for _ in range(3):
+            connection = http.client.HTTPConnection(*server.server_address, timeout=1)
+            connection.request("GET", "/")
+            assert connection.getresponse().read() == b"ok"
+            idle_connections.append(connection)
+        # idle connections don't hold the worker
+        connection = http.client.HTTPConnection(*server.server_address, timeout=1)
+        connection.request("GET", "/")
+        assert connection.getresponse().read() == b"ok"
+        # nor new connections without request
+        client = socket.create_connection(server.server_address)
+        connection = idle_connections[0]
+        connection.request("GET", "/")
+        assert connection.getresponse().read() == b"ok"
+        client.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
@@ -0,0 +1,82 @@
+import io
+
+import pytest
+from lxml import etree
+
+from olapy.core.services.xmla import get_wsgi_application
+from olapy.core.services.xmla_streaming import CellDataStreamingMiddleware
+
+from .queries import query15
+
+sqlalchemy = pytest.importorskip("sqlalchemy")
+
+EXECUTE_REQUEST = """<?xml version="1.0"?>
+<soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/">
+  <soap:Body>
+    <Execute xmlns="urn:schemas-microsoft-com:xml-analysis">
+      <Command><Statement>{}</Statement></Command>
+      <Properties><PropertyList><Catalog>main</Catalog></PropertyList></Properties>
+    </Execute>
+  </soap:Body>
+</soap:Envelope>"""
+
+
+def call(application, body):
+    environ = {
+        "REQUEST_METHOD": "POST",
+        "PATH_INFO": "/",
+        "QUERY_STRING": "",
+        "CONTENT_TYPE": "text/xml",
+        "CONTENT_LENGTH": str(len(body)),
+        "SERVER_NAME": "localhost",
+        "SERVER_PORT": "8000",
+        "SERVER_PROTOCOL": "HTTP/1.1",
+        "wsgi.input": io.BytesIO(body),
+        "wsgi.url_scheme": "http",
+    }
+    response = {}
+
+    def start_response(status, headers, exc_info=None):
+        response["status"] = status
+        response["headers"] = dict(headers)
+
+    response["chunks"] = list(application(environ, start_response))
+    return response
+
+
+def cells_values(response):
+    document = etree.fromstring(b"".join(response["chunks"]))
+    return [
+        value.text
+        for value in document.iterfind(
+            ".//{urn:schemas-microsoft-com:xml-analysis:mddataset}Cell/"
+            "{urn:schemas-microsoft-com:xml-analysis:mddataset}Value"
+        )
+    ]
+
+
+def test_streamed_cell_data(executor):
+    application = get_wsgi_application(executor)
+    body = EXECUTE_REQUEST.format(query15).encode("utf-8")
+    response = call(application, body)
+    assert response["status"] == "200 OK"
+    assert "Content-Length" not in response["headers"]
+    # head, cells, tail
+    assert len(response["chunks"]) == 3
+
+    assert cells_values(response) == ["8", "144", "3", "4", "96"]
+
+    # the same response, without streaming
+    not_streamed = call(application.application, body)
+    assert "Content-Length" in not_streamed["headers"]
+    assert cells_values(not_streamed) == ["8", "144", "3", "4", "96"]
+
+
+def test_not_streamed_responses():
+    def application(environ, start_response):
+        start_response("200 OK", [("Content-Length", "2")])
+        return [b"ok"]
+
+    response = call(CellDataStreamingMiddleware(application), b"")
+    assert response["headers"] == {"Content-Length": "2"}
+    assert response["chunks"] == [b"ok"]